@@ -2,35 +2,36 @@ import sys
 import json
 import os
 import csv
-import pyperclip
 import shutil
-from datetime import datetime
+import time
+from datetime import date
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLineEdit, 
     QTableWidget, QTableWidgetItem, QHeaderView, QMenu, QMessageBox, QAction, 
     QFileDialog, QStatusBar, QToolBar, QLabel, QDialog, QFormLayout, 
     QComboBox, QAbstractItemView, QShortcut, QCheckBox, QSpinBox, QMainWindow, 
-    QProgressBar, QColorDialog, QGroupBox, QTabWidget, QFrame
+    QProgressBar, QColorDialog, QGroupBox, QTabWidget, QFrame,
+    QStyledItemDelegate, QStyleOptionViewItem, QStyle, QListWidget, QTabBar, QStackedWidget
 )
-from PyQt5.QtGui import QColor, QBrush, QIcon, QKeySequence, QPainter, QPixmap
-from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal
-from PyQt5.QtPrintSupport import QPrinter, QPrintDialog
-import qdarkstyle
-from plyer import notification
-import requests
-from settings import load_settings, save_settings, DEFAULT_SETTINGS
-from help import HelpWindow
-from about import AboutDialog
-
-class AuditLog:
-    def __init__(self, filename="audit_log.txt"):
-        self.filename = filename
-
-    def log(self, action, item):
-        with open(self.filename, "a") as f:
-            f.write(f"{datetime.now()}: {action} - {json.dumps(item)}\n")
-
-audit_log = AuditLog()
+from PyQt5.QtGui import QKeySequence, QPainter, QPixmap, QPalette, QFont
+from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal, QEvent, QRect
+from settings import load_settings, save_settings, settings_store, DEFAULT_SETTINGS
+from themes import COLOR_KEYS, PALETTES, theme_manager
+from catalogue import FAVOURITES, FILE_MAP, SEARCH_FIELDS, SORT_COLUMNS, CatalogueIndex, search_records, sort_records
+from favourites import Favourites
+from catalogue_watcher import CatalogueWatcher
+from notifications import CopyNotifier
+from console_script import build_script, write_script
+from audit import audit_log
+from assets import icon
+from workspace import WorkspaceTab
+from instrumentation import metrics
+from profiling import profiler
+
+# requests, plyer, QtPrintSupport and the help/about dialogs are only needed
+# for update checks, notifications, printing and dialogs, so they are
+# imported on first use instead of at startup.
+# See benchmarks/import_profile.py for the per-module import cost.
 
 class DownloadThread(QThread):
     progress = pyqtSignal(int)
@@ -38,62 +39,77 @@ class DownloadThread(QThread):
     status = pyqtSignal(str)
     finished = pyqtSignal(bool)
 
-    def __init__(self, url, output):
+    def __init__(self, url, output, checksum_url=None, chunk_size=256 * 1024):
         super().__init__()
         self.url = url
         self.output = output
+        self.checksum_url = checksum_url
+        self.chunk_size = chunk_size
+        self.downloader = None
+        # Set by cancel(), which may come before the Downloader exists.
+        self.cancelled = False
 
     def run(self):
-        response = requests.get(self.url, stream=True)
-        total_size = int(response.headers.get('content-length', 0))
-        downloaded_size = 0
-        start_time = datetime.now()
+        import requests
+        from downloader import Downloader, DownloadError, fetch_checksum
+        from update_service import get_session
 
-        if total_size == 0:
-            self.status.emit("Error: Total size is zero.")
+        session = get_session()
+        if self.cancelled:
+            self.download_cancelled()
+            return
+        sha256 = fetch_checksum(self.checksum_url, session) if self.checksum_url else None
+        if self.checksum_url and not sha256:
+            self.status.emit("No checksum published; the download will not be verified.")
+        self.downloader = Downloader(self.url, self.output, sha256=sha256, chunk_size=self.chunk_size, session=session)
+        # cancel() sets the flag before it looks for the Downloader, so one
+        # of the two always sees the other.
+        if self.cancelled:
+            self.download_cancelled()
+            return
+        try:
+            self.downloader.run(self.report_progress)
+        except (requests.RequestException, OSError, DownloadError) as e:
+            self.status.emit(f"Error: {e}")
             self.finished.emit(False)
             return
+        self.status.emit("Checksum verified." if sha256 else "Download complete.")
+        self.finished.emit(True)
 
-        with open(self.output, 'wb') as f:
-            for data in response.iter_content(1024):
-                f.write(data)
-                downloaded_size += len(data)
-                elapsed_time = (datetime.now() - start_time).total_seconds()
-                speed = downloaded_size / elapsed_time if elapsed_time > 0 else 0
-                eta = (total_size - downloaded_size) / speed if speed > 0 else 0
-                self.progress.emit(int(downloaded_size / total_size * 100))
-                self.eta.emit(f"ETA: {int(eta)} seconds")
-                self.status.emit(f"Downloaded {downloaded_size} of {total_size} bytes")
+    def report_progress(self, downloaded, total, eta):
+        # Called by Downloader at most a few times per second, not per chunk.
+        if total:
+            self.progress.emit(int(downloaded / total * 100))
+        self.eta.emit(f"ETA: {int(eta)} seconds")
+        self.status.emit(f"Downloaded {downloaded} of {total} bytes")
 
-        self.finished.emit(True)
+    def download_cancelled(self):
+        self.status.emit("Download cancelled.")
+        self.finished.emit(False)
+
+    def cancel(self):
+        self.cancelled = True
+        if self.downloader:
+            self.downloader.cancel()
 
 class UpdateCheckThread(QThread):
     update_available = pyqtSignal(bool, str, str)
 
+    def __init__(self, silent=False):
+        super().__init__()
+        # Scheduled background checks only speak up when there is an update.
+        self.silent = silent
+
     def run(self):
-        # Update the URL to fetch the raw version.txt content directly
-        version_url = "https://raw.githubusercontent.com/skillerious/Starfield-IDDB/main/version.txt"
+        import requests
+        from update_service import UpdateChecker
+
         try:
-            response = requests.get(version_url)
-            if response.status_code == 200:
-                latest_version = response.text.strip()  # Get and strip the content of version.txt
-                current_version = "1.0"  # Update this to reflect the current app version.
-
-                # Debugging statement to check fetched versions
-                print(f"Fetched version: {latest_version}, Current version: {current_version}")
-
-                if latest_version > current_version:
-                    # Assuming there's a corresponding executable for the new version
-                    exe_url = f"https://github.com/skillerious/Starfield-IDDB/releases/download/{latest_version}/StarfieldIDDB-{latest_version}.exe"
-                    self.update_available.emit(True, latest_version, exe_url)
-                else:
-                    self.update_available.emit(False, current_version, "")
-            else:
-                print(f"Failed to fetch version.txt, status code: {response.status_code}")
-                self.update_available.emit(False, "", "")
-        except requests.RequestException as e:
-            print(f"Request failed: {str(e)}")
+            update_available, latest_version, exe_url = UpdateChecker().check()
+        except (requests.RequestException, OSError) as e:
             self.update_available.emit(False, "", str(e))
+            return
+        self.update_available.emit(update_available, latest_version, exe_url)
 
             # In the main window class (or wherever this is used):
 def on_update_check_complete(self, update_available, latest_version, exe_url):
@@ -117,13 +133,30 @@ def on_update_check_complete(self, update_available, latest_version, exe_url):
 
     self.status_bar.showMessage("Ready")
 
+class CatalogueSyncThread(QThread):
+    synced = pyqtSignal(list, str)
+
+    def __init__(self, catalogue_sync):
+        super().__init__()
+        self.catalogue_sync = catalogue_sync
+
+    def run(self):
+        import requests
+        from catalogue_sync import SyncError
+
+        try:
+            updates = self.catalogue_sync.fetch()
+        except (requests.RequestException, SyncError, OSError) as e:
+            self.synced.emit([], str(e))
+            return
+        self.synced.emit(updates, "")
+
 class UpdateDialog(QDialog):
     def __init__(self, url, parent=None):
         super().__init__(parent)
         self.url = url
         self.setWindowTitle("Downloading Update")
         self.setGeometry(100, 100, 400, 200)
-        self.setStyleSheet(qdarkstyle.load_stylesheet_pyqt5())
 
         self.layout = QVBoxLayout(self)
         self.progress_bar = QProgressBar(self)
@@ -135,13 +168,21 @@ class UpdateDialog(QDialog):
         self.eta_label = QLabel("", self)
         self.layout.addWidget(self.eta_label)
 
-        self.download_thread = DownloadThread(self.url, "update.exe")
+        # An interrupted download is resumed from update.exe.part next time.
+        self.download_thread = DownloadThread(self.url, "update.exe", checksum_url=f"{self.url}.sha256")
         self.download_thread.progress.connect(self.progress_bar.setValue)
         self.download_thread.eta.connect(self.eta_label.setText)
         self.download_thread.status.connect(self.status_label.setText)
         self.download_thread.finished.connect(self.download_finished)
         self.download_thread.start()
 
+    def reject(self):
+        self.download_thread.cancel()
+        # The thread stops before it starts downloading or at its next
+        # chunk; it must not outlive the dialog.
+        self.download_thread.wait()
+        super().reject()
+
     def download_finished(self, success):
         if success:
             self.status_label.setText("Download completed.")
@@ -151,150 +192,234 @@ class UpdateDialog(QDialog):
             self.status_label.setText("Download failed.")
             self.eta_label.setText("")
 
+class CommandDelegate(QStyledItemDelegate):
+    # Paints the console command and its "Copy" button directly instead of
+    # creating a QWidget/QLabel/QPushButton per row. Colours and fonts come
+    # from the view's palette, which the application stylesheet resolves once
+    # per theme, so filling the table does no per-row style work.
+    copy_requested = pyqtSignal(str)
+
+    BUTTON_WIDTH = 50
+    SPACING = 10
+
+    def button_rect(self, rect):
+        return QRect(rect.right() - self.BUTTON_WIDTH, rect.top(), self.BUTTON_WIDTH, rect.height())
+
+    def paint(self, painter, option, index):
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        button_rect = self.button_rect(opt.rect)
+        text_width = opt.rect.width() - self.BUTTON_WIDTH - self.SPACING
+        opt.text = opt.fontMetrics.elidedText(opt.text, Qt.ElideRight, max(text_width, 0))
+        super().paint(painter, opt, index)
+
+        role = QPalette.HighlightedText if opt.state & QStyle.State_Selected else QPalette.Text
+        painter.save()
+        painter.setFont(opt.font)
+        painter.setPen(opt.palette.color(role))
+        painter.drawText(button_rect, Qt.AlignCenter, "Copy")
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            if self.button_rect(option.rect).contains(event.pos()):
+                self.copy_requested.emit(index.data() or "")
+                return True
+        return super().editorEvent(event, model, option, index)
+
 class JSONViewerApp(QMainWindow):
+    SHORTCUT_ACTIONS = {
+        "shortcut_new_file": "new_file",
+        "shortcut_add": "add_item",
+        "shortcut_edit": "edit_selected_item",
+        "shortcut_open": "open_file",
+        "shortcut_save": "save_file",
+        "shortcut_save_as": "save_file_as",
+        "shortcut_undo": "undo",
+        "shortcut_redo": "redo",
+        "shortcut_delete": "delete_selected_items",
+    }
+
+    # Each setting maps to the smallest update that applies it; settings not
+    # listed here are read where they are used.
+    SETTING_HANDLERS = {
+        "theme": "apply_theme",
+        **{key: "apply_theme" for key in COLOR_KEYS},
+        "font_size": "apply_font",
+        "row_height": "apply_row_height",
+        "show_grid": "apply_grid",
+        "alternate_row_colors": "apply_row_colors",
+        **{key: "apply_shortcuts" for key in SHORTCUT_ACTIONS},
+        "enable_api_server": "apply_api_server",
+        "api_server_port": "apply_api_server",
+        "debug_mode": "apply_debug_mode",
+    }
+
+    # Tab keys: the catalogue path, this for the favourites view, or None
+    # for an unsaved new file.
+    FAVOURITES_TAB = FAVOURITES
+
     def __init__(self, json_files):
         super().__init__()
         self.json_files = json_files
-        self.file_map = {
-            "Favourites": "Favourites.json",
-            "Popular Items": "PopularItems.json",
-            "Weapons": "weapons.json",
-            "Ammo": "ammo.json",
-            "Space Suits": "spacesuits.json",
-            "Helmets": "helmets.json",
-            "Boost Packs": "Boostpacks.json",
-            "Aid": "aid.json",
-            "Food": "food.json",
-            "Skill Books": "book.json",
-            "Skills": "skills.json",
-            "Traits": "traits.json",
-            "Materials/Resources": "materials.json",
-            "Clothing": "clothing.json"
-        }
+        self.file_map = dict(FILE_MAP)
+        self.index = CatalogueIndex(self.file_map)
+        self.favourites = Favourites(self.file_map[FAVOURITES])
+        self.viewing_favourites = False
         self.current_file = None
         self.data = []
+        self.listed_items = []
+        self.visible_items = []
+        self.sort_order = []
         self.undo_stack = []
         self.redo_stack = []
         self.settings = load_settings()
+        settings_store.subscribe(self.on_settings_changed)
         self.buttons = {}
         self.search_timer = QTimer()
         self.search_timer.setSingleShot(True)
         self.search_timer.timeout.connect(self.perform_search)
+        # Star toggles only touch the in-memory set; the file is written once
+        # the user has stopped toggling for a moment.
+        self.favourites_timer = QTimer()
+        self.favourites_timer.setSingleShot(True)
+        self.favourites_timer.timeout.connect(self.favourites.save)
+        # Row clicks only restart this; the history is looked up once the
+        # selection has settled.
+        self.history_timer = QTimer()
+        self.history_timer.setSingleShot(True)
+        self.history_timer.timeout.connect(self.update_history)
+        audit_log.start()
+        self.copy_notifier = CopyNotifier(self.settings, parent=self)
+        self.update_thread = None
+        self.sync_thread = None
+        self.api_server = None
+        self.debug_panel = None
+        self.preloader = None
+        self.help_window = None
+        self.active_tab = None
+        # Tables of tabs left alone for tab_idle_minutes are dropped and
+        # rebuilt from the tab's state when it is shown again.
+        self.eviction_timer = QTimer()
+        self.eviction_timer.setInterval(60 * 1000)
+        self.eviction_timer.timeout.connect(self.evict_idle_tabs)
+        self.catalogue_watcher = CatalogueWatcher(self.index, parent=self)
+        self.catalogue_watcher.changed.connect(self.on_catalogue_changed)
+        for name in self.index.builtin_names():
+            self.catalogue_watcher.watch(self.file_map[name])
+        # Re-checks whether a scheduled update check is due while the app
+        # stays open; the check itself runs on UpdateCheckThread.
+        self.update_timer = QTimer()
+        self.update_timer.setInterval(60 * 60 * 1000)
+        self.update_timer.timeout.connect(self.check_for_updates_if_due)
+        self.star_icon = icon('Star.png')
+        self.star_full_icon = icon('Starfull.png')
         self.initUI()
 
     def initUI(self):
         self.setWindowTitle('Starfield IDDB')
         self.setGeometry(100, 100, 1200, 600)
-        self.setWindowIcon(QIcon('images/starfield.png'))
+        self.setWindowIcon(icon('starfield.png'))
 
         main_widget = QWidget()
         main_layout = QVBoxLayout(main_widget)
 
         toolbar = QToolBar(self)
-        toolbar.setStyleSheet(f"""
-            QToolBar {{
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                                            stop:0 {self.settings.get('toolbar_bg_start', '#3a3a3a')}, stop:1 {self.settings.get('toolbar_bg_end', '#1e1e1e')});
-                border-bottom: 1px solid {self.settings.get('highlight_color', '#3a7ae0')};
-                spacing: 10px;
-                padding: 5px;
-            }}
-            QToolButton {{
-                color: {self.settings.get('font_color', 'white')};
-                font-size: 12pt;
-                padding: 5px;
-                background: transparent;
-                border: none;
-            }}
-            QToolButton:hover {{
-                background: {self.settings.get('button_hover_color', '#3a7ae0')};
-                border-radius: 5px;
-            }}
-            QToolButton:pressed {{
-                background: {self.settings.get('button_press_color', '#2a69bf')};
-                border-radius: 5px;
-            }}
-        """)
-
-        new_file_action = QAction(QIcon('images/new.png'), 'New File', self)
+        toolbar.setObjectName("mainToolbar")
+
+        new_file_action = QAction(icon('new.png'), 'New File', self)
         new_file_action.triggered.connect(self.new_file)
         toolbar.addAction(new_file_action)
 
-        add_action = QAction(QIcon('images/add.png'), 'Add', self)
+        add_action = QAction(icon('add.png'), 'Add', self)
         add_action.triggered.connect(self.add_item)
         toolbar.addAction(add_action)
 
-        edit_action = QAction(QIcon('images/edit.png'), 'Edit', self)
+        edit_action = QAction(icon('edit.png'), 'Edit', self)
         edit_action.triggered.connect(self.edit_selected_item)
         toolbar.addAction(edit_action)
 
-        open_action = QAction(QIcon('images/open.png'), 'Open', self)
+        open_action = QAction(icon('open.png'), 'Open', self)
         open_action.triggered.connect(self.open_file)
         toolbar.addAction(open_action)
 
         toolbar.addSeparator()
 
-        save_action = QAction(QIcon('images/save.png'), 'Save', self)
-        save_action.triggered.connect(self.save_file)
+        save_action = QAction(icon('save.png'), 'Save', self)
+        # save_file is wrapped by the profiler, which passes every signal
+        # argument through, so triggered's checked flag is dropped here.
+        save_action.triggered.connect(lambda checked: self.save_file())
         toolbar.addAction(save_action)
 
-        save_as_action = QAction(QIcon('images/save_as.png'), 'Save As', self)
+        save_as_action = QAction(icon('save_as.png'), 'Save As', self)
         save_as_action.triggered.connect(self.save_file_as)
         toolbar.addAction(save_as_action)
 
         toolbar.addSeparator()
 
-        print_action = QAction(QIcon('images/print.png'), 'Print', self)
+        print_action = QAction(icon('print.png'), 'Print', self)
         print_action.triggered.connect(self.print_file)
         toolbar.addAction(print_action)
 
         toolbar.addSeparator()
 
-        export_csv_action = QAction(QIcon('images/export_csv.png'), 'Export to CSV', self)
+        export_csv_action = QAction(icon('export_csv.png'), 'Export to CSV', self)
         export_csv_action.triggered.connect(self.export_to_csv)
         toolbar.addAction(export_csv_action)
 
-        export_pdf_action = QAction(QIcon('images/pdf.png'), 'Export to PDF', self)
+        export_pdf_action = QAction(icon('pdf.png'), 'Export to PDF', self)
         export_pdf_action.triggered.connect(self.export_to_pdf)
         toolbar.addAction(export_pdf_action)
 
-        export_json_action = QAction(QIcon('images/export_json.png'), 'Export to JSON', self)
+        export_json_action = QAction(icon('export_json.png'), 'Export to JSON', self)
         export_json_action.triggered.connect(self.export_to_json)
         toolbar.addAction(export_json_action)
 
+        export_script_action = QAction('Export Console Script', self)
+        export_script_action.triggered.connect(self.open_export_script_dialog)
+        toolbar.addAction(export_script_action)
+
         toolbar.addSeparator()
 
-        undo_action = QAction(QIcon('images/undo.png'), 'Undo', self)
+        undo_action = QAction(icon('undo.png'), 'Undo', self)
         undo_action.setShortcut('Ctrl+Shift+Z')
         undo_action.triggered.connect(self.undo)
         toolbar.addAction(undo_action)
 
-        redo_action = QAction(QIcon('images/redo.png'), 'Redo', self)
+        redo_action = QAction(icon('redo.png'), 'Redo', self)
         redo_action.setShortcut('Ctrl+Y')
         redo_action.triggered.connect(self.redo)
         toolbar.addAction(redo_action)
 
         toolbar.addSeparator()
 
-        refresh_action = QAction(QIcon('images/refresh.png'), 'Refresh', self)
+        refresh_action = QAction(icon('refresh.png'), 'Refresh', self)
         refresh_action.triggered.connect(self.refresh)
         toolbar.addAction(refresh_action)
 
-        delete_action = QAction(QIcon('images/delete.png'), 'Delete', self)
+        sync_action = QAction('Sync Catalogues', self)
+        sync_action.triggered.connect(self.sync_catalogues)
+        toolbar.addAction(sync_action)
+
+        compare_action = QAction('Compare Catalogues', self)
+        compare_action.triggered.connect(self.compare_catalogues)
+        toolbar.addAction(compare_action)
+
+        delete_action = QAction(icon('delete.png'), 'Delete', self)
         delete_action.triggered.connect(self.delete_selected_items)
         toolbar.addAction(delete_action)
 
         toolbar.addSeparator()
 
-        settings_action = QAction(QIcon('images/settings.png'), 'Settings', self)
+        settings_action = QAction(icon('settings.png'), 'Settings', self)
         settings_action.triggered.connect(self.open_settings_dialog)
         toolbar.addAction(settings_action)
 
-        help_action = QAction(QIcon('images/help.png'), 'Help', self)
+        help_action = QAction(icon('help.png'), 'Help', self)
         help_action.triggered.connect(self.show_help_dialog)
         toolbar.addAction(help_action)
 
-        about_action = QAction(QIcon('images/about.png'), 'About', self)
+        about_action = QAction(icon('about.png'), 'About', self)
         about_action.triggered.connect(self.show_about_dialog)
         toolbar.addAction(about_action)
 
@@ -320,18 +445,7 @@ class JSONViewerApp(QMainWindow):
         for display_name in self.file_map:
             button = QPushButton(display_name, self)
             button.setFixedHeight(40)
-            button.setStyleSheet(f"""
-                QPushButton {{
-                    padding: 10px;
-                    font-size: 12pt;
-                    border: 2px solid {self.settings.get('highlight_color', '#3a7ae0')};
-                    color: {self.settings.get('font_color', 'white')};
-                    background-color: transparent;
-                }}
-                QPushButton:checked {{
-                    background-color: {self.settings.get('highlight_color', '#3a7ae0')};
-                }}
-            """)
+            button.setObjectName("categoryButton")
             button.setCheckable(True)
             button.clicked.connect(lambda checked, f=display_name: self.load_json_with_indicator(f))
             self.buttons[display_name] = button
@@ -341,67 +455,249 @@ class JSONViewerApp(QMainWindow):
 
         stacked_layout = QVBoxLayout()
 
-        self.table = QTableWidget(self)
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels(['Item ID', 'Item Name', 'Console Command', 'Favourite'])
-        header = self.table.horizontalHeader()
-        for col in range(self.table.columnCount()):
-            header.setSectionResizeMode(col, QHeaderView.Stretch)
-        self.table.horizontalHeader().setStyleSheet(f"""
-            QHeaderView::section {{
-                background-color: {self.settings.get('highlight_color', '#3a7ae0')};
-                color: {self.settings.get('font_color', 'white')};
-                font-weight: bold;
-                font-size: {self.settings.get('font_size', 12)}pt;
-                padding: 5px;
-                border: 1px solid {self.settings.get('highlight_color', '#3a7ae0')};
-            }}
-        """)
-        self.table.setStyleSheet(f"""
-            QTableWidget {{
-                gridline-color: {self.settings.get('highlight_color', '#3a7ae0')};
-                font-size: {self.settings.get('font_size', 14)}pt;
-                alternate-background-color: {self.settings.get('alternate_background_color', '#2e2e2e')};
-                background-color: {self.settings.get('background_color', '#1e1e1e')};
-                color: {self.settings.get('font_color', 'white')};
-            }}
-            QTableWidget::item {{
-                border-bottom: 1px solid {self.settings.get('highlight_color', '#3a7ae0')};
-                padding: 10px;
-            }}
-            QTableWidget::item:selected {{
-                background-color: {self.settings.get('highlight_color', '#5a9ae0')};
-                color: white;
-            }}
-        """)
-        self.table.setAlternatingRowColors(self.settings["alternate_row_colors"])
-        self.table.setShowGrid(self.settings["show_grid"])
-        self.table.cellClicked.connect(self.handle_cell_click)
-        self.table.setContextMenuPolicy(Qt.CustomContextMenu)
-        self.table.customContextMenuRequested.connect(self.open_context_menu)
-        self.table.horizontalHeader().setSectionsMovable(True)
-        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self.table.doubleClicked.connect(self.show_item_details)
-
-        stacked_layout.addWidget(self.table)
+        self.tab_bar = QTabBar(self)
+        self.tab_bar.setObjectName("workspaceTabs")
+        self.tab_bar.setTabsClosable(True)
+        self.tab_bar.setMovable(True)
+        self.tab_bar.setExpanding(False)
+        self.tab_bar.setDocumentMode(True)
+        self.tab_bar.currentChanged.connect(self.on_tab_changed)
+        self.tab_bar.tabCloseRequested.connect(self.close_tab)
+        stacked_layout.addWidget(self.tab_bar)
+        self.table_stack = QStackedWidget(self)
+        stacked_layout.addWidget(self.table_stack)
+        self.table = self.create_table()
+        self.add_tab(WorkspaceTab(None, self.table))
 
         main_layout.addLayout(stacked_layout)
 
+        details_layout = QHBoxLayout()
         self.detail_view = QLabel("Select an item to view details", self)
-        self.detail_view.setStyleSheet(f"color: {self.settings.get('font_color', 'white')}; padding: 10px; font-size: {self.settings.get('font_size', 12)}pt;")
-        main_layout.addWidget(self.detail_view)
+        self.detail_view.setObjectName("detailView")
+        details_layout.addWidget(self.detail_view, stretch=1)
+
+        history_box = QGroupBox("History", self)
+        history_layout = QVBoxLayout(history_box)
+        self.history_scope_combo = QComboBox()
+        self.history_scope_combo.addItems(list(self.HISTORY_SCOPES))
+        self.history_scope_combo.currentTextChanged.connect(self.schedule_history)
+        history_layout.addWidget(self.history_scope_combo)
+        self.history_list = QListWidget()
+        self.history_list.setMaximumHeight(120)
+        history_layout.addWidget(self.history_list)
+        details_layout.addWidget(history_box, stretch=1)
+        main_layout.addLayout(details_layout)
 
         self.status_bar = QStatusBar(self)
         self.status_bar.showMessage("Ready")
         main_layout.addWidget(self.status_bar)
         
         self.setCentralWidget(main_widget)
+        if self.settings["debug_mode"]:
+            self.apply_debug_mode()
         self.apply_theme()
+        self.apply_table_settings()
         self.setup_shortcuts()
         self.load_startup_json()
         self.highlight_active_button()
 
         self.showMaximized()
+        if self.settings["enable_api_server"]:
+            self.apply_api_server()
+        if self.settings["preload_catalogues"]:
+            QTimer.singleShot(500, self.preload_catalogues)
+        # Give the first paint priority over the network.
+        QTimer.singleShot(3000, self.check_for_updates_if_due)
+        self.update_timer.start()
+        self.eviction_timer.start()
+
+    def preload_catalogues(self):
+        from catalogue_preloader import CataloguePreloader
+
+        self.preloader = CataloguePreloader(self.index, self.settings["preload_memory_mb"] * 1024 * 1024, parent=self)
+        self.preloader.loaded.connect(self.on_catalogue_preloaded)
+        self.preloader.finished.connect(self.on_preload_finished)
+        self.preloader.start()
+
+    def on_catalogue_preloaded(self, path, catalogue):
+        # Favourites are matched against the catalogues loaded so far, so one
+        # arriving with a favourite in it brings that row up to date.
+        if self.viewing_favourites and catalogue is not None and any(code in catalogue.by_code for code in self.favourites):
+            self.refresh_view()
+
+    def on_preload_finished(self, published, skipped):
+        if skipped:
+            self.status_bar.showMessage(f"Preloaded {published} catalogues; {skipped} left to load on demand")
+
+    def create_table(self):
+        # One table per open tab, so switching tabs doesn't re-render rows.
+        table = QTableWidget(self)
+        table.setColumnCount(4)
+        table.setHorizontalHeaderLabels(['Item ID', 'Item Name', 'Console Command', 'Favourite'])
+        table.setObjectName("catalogueTable")
+        header = table.horizontalHeader()
+        for col in range(table.columnCount()):
+            header.setSectionResizeMode(col, QHeaderView.Stretch)
+        header.setSortIndicatorShown(True)
+        header.setSortIndicator(-1, Qt.AscendingOrder)
+        header.sectionClicked.connect(self.sort_by_section)
+        header.setContextMenuPolicy(Qt.CustomContextMenu)
+        header.customContextMenuRequested.connect(self.open_sort_menu)
+        command_delegate = CommandDelegate(table)
+        command_delegate.copy_requested.connect(self.copy_command)
+        table.setItemDelegateForColumn(2, command_delegate)
+        table.cellClicked.connect(self.handle_cell_click)
+        table.setContextMenuPolicy(Qt.CustomContextMenu)
+        table.customContextMenuRequested.connect(self.open_context_menu)
+        table.horizontalHeader().setSectionsMovable(True)
+        table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        table.doubleClicked.connect(self.show_item_details)
+        QShortcut(QKeySequence.Copy, table, self.copy_selected_commands)
+
+        self.table_stack.addWidget(table)
+        self.apply_row_colors([table])
+        self.apply_grid([table])
+        self.apply_row_height([table])
+        self.apply_table_font([table])
+        return table
+
+    def workspace_tabs(self):
+        return [self.tab_bar.tabData(index) for index in range(self.tab_bar.count())]
+
+    def tab_title(self, key):
+        if key is None:
+            return "Untitled"
+        if key == self.FAVOURITES_TAB:
+            return FAVOURITES
+        return self.index.name_for(key)
+
+    def add_tab(self, tab):
+        index = self.tab_bar.addTab(self.tab_title(tab.key))
+        self.tab_bar.setTabData(index, tab)
+        self.tab_bar.setTabToolTip(index, tab.key or "")
+        if self.active_tab is None:
+            self.active_tab = tab
+        return index
+
+    def set_tab_key(self, tab, key):
+        tab.key = key
+        index = self.workspace_tabs().index(tab)
+        self.tab_bar.setTabText(index, self.tab_title(key))
+        self.tab_bar.setTabToolTip(index, key or "")
+
+    def activate_view(self, key):
+        # Makes the tab for key current. Returns True when an existing tab
+        # was brought back as it was left; False when the caller should load
+        # the view into the current tab (a new one if it wasn't open yet).
+        if key is not None and key != self.active_tab.key:
+            for index, tab in enumerate(self.workspace_tabs()):
+                if tab.key == key:
+                    self.tab_bar.setCurrentIndex(index)
+                    return True
+        if key != self.active_tab.key:
+            self.open_tab(key)
+        return False
+
+    def open_tab(self, key):
+        # The empty tab the app starts with is reused rather than kept.
+        if self.active_tab.is_blank():
+            self.set_tab_key(self.active_tab, key)
+            return
+        self.tab_bar.setCurrentIndex(self.add_tab(WorkspaceTab(key, self.create_table())))
+
+    def on_tab_changed(self, index):
+        tab = self.tab_bar.tabData(index)
+        if tab is None or tab is self.active_tab:
+            return
+        previous = self.active_tab
+        previous.store(self)
+        previous.search_text = self.search_entry.text()
+        previous.detail_text = self.detail_view.text()
+        previous.revision = self.view_revision()
+        self.active_tab = tab
+        tab.restore(self)
+        self.search_timer.stop()
+        self.search_entry.blockSignals(True)
+        self.search_entry.setText(tab.search_text)
+        self.search_entry.blockSignals(False)
+        if self.table is None:
+            self.table = self.create_table()
+            self.rebuild_table(tab)
+        elif tab.revision is not None:
+            # Only what changed while the tab was in the background is redone.
+            data_revision, favourites = self.view_revision()
+            if data_revision != tab.revision[0]:
+                self.refresh_view()
+            elif favourites != tab.revision[1]:
+                self.refresh_favourite_icons()
+        self.detail_view.setText(tab.detail_text)
+        self.table_stack.setCurrentWidget(self.table)
+        self.update_sort_indicator()
+        self.update_button_styles(self.tab_title(tab.key))
+
+    def close_tab(self, index):
+        if self.tab_bar.count() == 1:
+            return
+        tab = self.tab_bar.tabData(index)
+        self.tab_bar.removeTab(index)
+        if tab.table is not None and tab.table is not self.table:
+            self.table_stack.removeWidget(tab.table)
+            tab.table.deleteLater()
+            tab.table = None
+
+    def view_revision(self):
+        # (data revision, favourites) of the current view, compared when its
+        # tab is shown again.
+        favourites = tuple(self.favourites)
+        if self.viewing_favourites:
+            # Only the catalogues holding a favourite matter, not every
+            # catalogue loaded since.
+            sources = set()
+            for code in favourites:
+                entry = self.index.lookup(code)
+                if entry:
+                    catalogue = self.index.get(entry[0])
+                    sources.add((id(catalogue), catalogue.revision))
+            return (favourites, frozenset(sources)), favourites
+        catalogue = self.index.catalogues.get(self.current_file)
+        if catalogue is not None and catalogue.records is self.data:
+            return catalogue.revision, favourites
+        return None, favourites
+
+    def refresh_view(self):
+        if self.viewing_favourites:
+            self.show_favourites()
+        else:
+            self.perform_search()
+
+    def refresh_favourite_icons(self):
+        for row, item in enumerate(self.visible_items):
+            self.table.item(row, 3).setIcon(self.favourite_icon(item))
+
+    def rebuild_table(self, tab):
+        self.refresh_view()
+        codes = set(tab.selected_codes)
+        selection = self.table.selectionModel()
+        for row, item in enumerate(self.visible_items):
+            if item.get("Item Code", "") in codes:
+                selection.select(self.table.model().index(row, 0), selection.Select | selection.Rows)
+        # The scroll range is only known once the table has laid out.
+        table, scroll = self.table, tab.scroll
+        QTimer.singleShot(0, lambda: table.verticalScrollBar().setValue(scroll))
+
+    def evict_idle_tabs(self):
+        # Drops the tables (and their row items) of tabs left alone for
+        # tab_idle_minutes; the records themselves stay in the index.
+        limit = self.settings["tab_idle_minutes"] * 60
+        for tab in self.workspace_tabs():
+            if tab is self.active_tab or tab.table is None or tab.idle_seconds() < limit:
+                continue
+            rows = sorted({index.row() for index in tab.table.selectionModel().selectedRows()})
+            tab.selected_codes = [tab.visible_items[row].get("Item Code", "") for row in rows if row < len(tab.visible_items)]
+            tab.scroll = tab.table.verticalScrollBar().value()
+            self.table_stack.removeWidget(tab.table)
+            tab.table.deleteLater()
+            tab.table = None
 
     def load_json_with_indicator(self, display_name):
         self.load_json(self.file_map[display_name])
@@ -429,66 +725,218 @@ class JSONViewerApp(QMainWindow):
                         break
         self.update_button_styles(startup_json_name)
 
-    def load_json(self, filename):
+    @profiler.profiled("load_json")
+    @metrics.timed("load")
+    def load_json(self, filename, reload=False):
+        if filename == self.file_map[FAVOURITES]:
+            self.show_favourites()
+            return
+        if self.activate_view(filename) and not reload:
+            return
+        self.viewing_favourites = False
         self.current_file = filename
         self.status_bar.showMessage(f"Loading {filename}")
-        filepath = os.path.join(os.getcwd(), filename) if filename in self.file_map.values() else filename
-        if not os.path.exists(filepath):
-            with open(filepath, 'w') as f:
+        if not os.path.exists(filename):
+            with open(filename, 'w', encoding='utf-8') as f:
                 json.dump([], f)
-        with open(filepath, "r") as f:
-            try:
-                self.data = json.load(f)
-            except json.JSONDecodeError:
-                self.data = []
+        self.data = self.index.load(filename, reload).records
+        self.catalogue_watcher.watch(filename)
         self.populate_listbox(self.data)
         self.detail_view.setText("Select an item to view details")
         self.status_bar.showMessage(f"Loaded {filename} - {len(self.data)} items")
 
+    @profiler.profiled("show_favourites")
+    def show_favourites(self):
+        # Assembled from the catalogue index, so favourites always show the
+        # current catalogue entries rather than copies of them.
+        if self.activate_view(self.FAVOURITES_TAB):
+            return
+        self.viewing_favourites = True
+        self.current_file = None
+        found = []
+        for code in self.favourites:
+            entry = self.index.lookup(code)
+            if entry:
+                found.append(entry[1])
+        self.favourites.update_records(found)
+        self.data = self.favourites.records()
+        if self.favourites.dirty:
+            self.favourites_timer.start(2000)
+        self.populate_listbox(self.data)
+        self.detail_view.setText("Select an item to view details")
+        self.status_bar.showMessage(f"Favourites - {len(self.data)} items")
+
+    def favourite_icon(self, item):
+        return self.star_full_icon if item.get("Item Code", "") in self.favourites else self.star_icon
+
+    def toggle_favourite(self, row):
+        item = self.visible_items[row]
+        code = item.get("Item Code", "")
+        if not code:
+            return
+        added = self.favourites.toggle(code, item)
+        self.table.item(row, 3).setIcon(self.favourite_icon(item))
+        self.favourites_timer.start(2000)
+        self.status_bar.showMessage(f"{'Added' if added else 'Removed'} {code} {'to' if added else 'from'} favourites")
+
+    @metrics.timed("render")
     def populate_listbox(self, data):
+        self.listed_items = list(data)
+        self.visible_items = sort_records(self.listed_items, self.sort_order, self.category_of) if self.sort_order else self.listed_items
+        self.table.setUpdatesEnabled(False)
         self.table.setRowCount(0)
-        for index, item in enumerate(data):
-            self.table.insertRow(self.table.rowCount())
-            self.table.setItem(self.table.rowCount() - 1, 0, QTableWidgetItem(item.get("Item Code", "")))
-            self.table.setItem(self.table.rowCount() - 1, 1, QTableWidgetItem(item.get("Item Name", "")))
-
-            cell_widget = QWidget()
-            cell_layout = QHBoxLayout()
-            cell_layout.setContentsMargins(0, 0, 0, 0)
-            cell_layout.setSpacing(10)
-
-            console_command_label = QLabel(item.get("Console Command", ""))
-            console_command_label.setStyleSheet(f"color: {self.settings.get('font_color', 'white')}; background: transparent; font-size: {self.settings.get('font_size', 14)}pt;")
-            cell_layout.addWidget(console_command_label, stretch=1)
-
-            copy_button = QPushButton('Copy')
-            copy_button.setStyleSheet(f"background: transparent; color: {self.settings.get('font_color', 'white')}; font-size: {self.settings.get('font_size', 12)}pt; border: none;")
-            copy_button.setFixedSize(50, 28)
-            copy_button.clicked.connect(lambda ch, cmd=item.get("Console Command", ""): self.copy_command(cmd))
-            cell_layout.addWidget(copy_button, stretch=0)
-
-            cell_widget.setLayout(cell_layout)
-            cell_widget.setStyleSheet("background: transparent;")
-            self.table.setCellWidget(self.table.rowCount() - 1, 2, cell_widget)
+        self.table.setRowCount(len(self.visible_items))
+        for row, item in enumerate(self.visible_items):
+            self.table.setItem(row, 0, QTableWidgetItem(item.get("Item Code", "")))
+            self.table.setItem(row, 1, QTableWidgetItem(item.get("Item Name", "")))
+            self.table.setItem(row, 2, QTableWidgetItem(item.get("Console Command", "")))
 
             fav_item = QTableWidgetItem()
             fav_item.setFlags(Qt.ItemIsEnabled | Qt.ItemIsSelectable)
-            self.table.setItem(self.table.rowCount() - 1, 3, fav_item)
+            fav_item.setIcon(self.favourite_icon(item))
+            self.table.setItem(row, 3, fav_item)
+        self.table.setUpdatesEnabled(True)
+        metrics.count("rows_rendered", len(self.visible_items))
+
+    @metrics.timed("render.refresh")
+    def refresh_rows(self):
+        # Rewrites the existing rows in place for the current visible_items
+        # order; used when only the order changed, so no rows are rebuilt.
+        self.table.setUpdatesEnabled(False)
+        self.table.clearSelection()
+        for row, item in enumerate(self.visible_items):
+            self.refresh_row(row, item)
+        self.table.setUpdatesEnabled(True)
+        metrics.count("rows_refreshed", len(self.visible_items))
+
+    def refresh_row(self, row, item):
+        self.table.item(row, 0).setText(item.get("Item Code", ""))
+        self.table.item(row, 1).setText(item.get("Item Name", ""))
+        self.table.item(row, 2).setText(item.get("Console Command", ""))
+        self.table.item(row, 3).setIcon(self.favourite_icon(item))
+
+    def current_category(self):
+        for name, path in self.file_map.items():
+            if path == self.current_file:
+                return name
+        return os.path.splitext(os.path.basename(self.current_file or ""))[0]
+
+    def category_of(self, item):
+        if self.viewing_favourites:
+            entry = self.index.lookup(item.get("Item Code", ""))
+            return entry[0] if entry else ""
+        return self.current_category()
+
+    SORTABLE_SECTIONS = {0: "Item Code", 1: "Item Name"}
+
+    def sort_by_section(self, section):
+        column = self.SORTABLE_SECTIONS.get(section)
+        if column is None:
+            self.update_sort_indicator()
+            return
+        additive = bool(QApplication.keyboardModifiers() & Qt.ShiftModifier)
+        self.toggle_sort_column(column, additive)
+
+    def toggle_sort_column(self, column, additive=False):
+        directions = dict(self.sort_order)
+        if additive:
+            if column in directions:
+                self.sort_order = [(name, not descending if name == column else descending) for name, descending in self.sort_order]
+            else:
+                self.sort_order.append((column, False))
+        elif self.sort_order and self.sort_order[0][0] == column:
+            self.sort_order = [(column, not self.sort_order[0][1])]
+        else:
+            self.sort_order = [(column, False)]
+        self.apply_sort()
 
-            self.table.setRowHeight(self.table.rowCount() - 1, self.settings["row_height"])
+    def set_sort_order(self, sort_order):
+        self.sort_order = list(sort_order)
+        self.apply_sort()
 
-            background_color = QBrush(QColor(self.settings.get('alternate_background_color', '#2e2e2e'))) if index % 2 == 0 else QBrush(QColor(self.settings.get('background_color', '#1e1e1e')))
-            for col in range(3):
-                cell = self.table.item(index, col)
-                if cell:
-                    cell.setBackground(background_color)
+    @profiler.profiled("apply_sort")
+    def apply_sort(self):
+        if self.sort_order:
+            self.visible_items = sort_records(self.listed_items, self.sort_order, self.category_of)
+        else:
+            self.visible_items = self.listed_items
+        self.refresh_rows()
+        self.update_sort_indicator()
+        if self.sort_order:
+            description = ", ".join(f"{column} ({'descending' if descending else 'ascending'})" for column, descending in self.sort_order)
+            self.status_bar.showMessage(f"Sorted by {description}")
+        else:
+            self.status_bar.showMessage("Sort cleared")
+
+    def update_sort_indicator(self):
+        header = self.table.horizontalHeader()
+        sections = {column: section for section, column in self.SORTABLE_SECTIONS.items()}
+        if self.sort_order and self.sort_order[0][0] in sections:
+            column, descending = self.sort_order[0]
+            header.setSortIndicator(sections[column], Qt.DescendingOrder if descending else Qt.AscendingOrder)
+        else:
+            header.setSortIndicator(-1, Qt.AscendingOrder)
+
+    def open_sort_menu(self, position):
+        menu = QMenu(self)
+        for column in SORT_COLUMNS:
+            action = menu.addAction(f"Sort by {column}")
+            action.triggered.connect(lambda checked, c=column: self.set_sort_order([(c, False)]))
+        menu.addSeparator()
+        for column in SORT_COLUMNS:
+            action = menu.addAction(f"Then by {column}")
+            action.setEnabled(bool(self.sort_order) and column not in dict(self.sort_order))
+            action.triggered.connect(lambda checked, c=column: self.toggle_sort_column(c, additive=True))
+        menu.addSeparator()
+        clear_action = menu.addAction("Clear Sort")
+        clear_action.setEnabled(bool(self.sort_order))
+        clear_action.triggered.connect(lambda: self.set_sort_order([]))
+        menu.exec_(self.table.horizontalHeader().mapToGlobal(position))
+
+    def data_index(self, row):
+        item = self.visible_items[row]
+        return next(index for index, candidate in enumerate(self.data) if candidate is item)
+
+    def replace_item(self, row, new_item):
+        old_item = self.visible_items[row]
+        with self.index.lock:
+            self.data[self.data_index(row)] = new_item
+            self.index.invalidate(self.current_file)
+        audit_log.log("edit", new_item, self.current_file, previous=old_item)
+        # listed_items and visible_items may be the same list when unsorted.
+        for items in (self.listed_items, self.visible_items):
+            items[:] = [new_item if item is old_item else item for item in items]
+
+    def remove_items(self, rows, action="delete"):
+        # One pass over each list, whatever the number of rows removed.
+        old_items = [self.visible_items[row] for row in rows]
+        removed = {id(item) for item in old_items}
+        with self.index.lock:
+            for items in (self.data, self.listed_items, self.visible_items):
+                items[:] = [item for item in items if id(item) not in removed]
+            self.index.invalidate(self.current_file)
+        for old_item in old_items:
+            audit_log.log(action, old_item, self.current_file)
+        self.table.setUpdatesEnabled(False)
+        for row in sorted(rows, reverse=True):
+            self.table.removeRow(row)
+        self.table.setUpdatesEnabled(True)
 
     def schedule_search(self):
         self.search_timer.start(300)
 
+    @metrics.timed("search")
+    def search_data(self, term, fields=SEARCH_FIELDS):
+        # Catalogues shown straight from the index use its cached search
+        # text; favourites and new files are filtered directly.
+        catalogue = None if self.viewing_favourites else self.index.catalogues.get(self.current_file)
+        if catalogue is not None and catalogue.records is self.data:
+            return catalogue.search(term, fields)
+        return search_records(self.data, term, fields)
+
+    @profiler.profiled("perform_search")
     def perform_search(self):
-        search_term = self.search_entry.text().lower()
-        filtered_data = [item for item in self.data if search_term in item.get("Item Code", "").lower() or search_term in item.get("Item Name", "").lower() or search_term in item.get("Console Command", "").lower()]
+        filtered_data = self.search_data(self.search_entry.text())
         self.populate_listbox(filtered_data)
         self.detail_view.setText("Select an item to view details")
 
@@ -515,17 +963,11 @@ class JSONViewerApp(QMainWindow):
         dialog.setLayout(layout)
         dialog.exec_()
 
+    @profiler.profiled("perform_advanced_search")
     def perform_advanced_search(self, dialog, search_term):
-        search_term = search_term.lower()
-        filtered_data = []
-
-        for item in self.data:
-            if (
-                (self.search_in_item_code.isChecked() and search_term in item.get("Item Code", "").lower()) or
-                (self.search_in_item_name.isChecked() and search_term in item.get("Item Name", "").lower()) or
-                (self.search_in_console_command.isChecked() and search_term in item.get("Console Command", "").lower())
-            ):
-                filtered_data.append(item)
+        checkboxes = (self.search_in_item_code, self.search_in_item_name, self.search_in_console_command)
+        fields = tuple(field for field, checkbox in zip(SEARCH_FIELDS, checkboxes) if checkbox.isChecked())
+        filtered_data = self.search_data(search_term, fields) if fields else []
 
         self.populate_listbox(filtered_data)
         self.detail_view.setText("Select an item to view details")
@@ -537,14 +979,48 @@ class JSONViewerApp(QMainWindow):
         self.detail_view.setText("Select an item to view details")
 
     def handle_cell_click(self, row, column):
+        if column == 3:
+            self.toggle_favourite(row)
         self.update_detail_view(row)
 
     def update_detail_view(self, row):
         item_code = self.table.item(row, 0).text()
         item_name = self.table.item(row, 1).text()
-        console_command = self.table.cellWidget(row, 2).layout().itemAt(0).widget().text()
+        console_command = self.table.item(row, 2).text()
         details = f"Item Code: {item_code}\nItem Name: {item_name}\nConsole Command: {console_command}"
         self.detail_view.setText(details)
+        self.schedule_history()
+
+    HISTORY_SCOPES = {
+        "Selected item": {},
+        "Added in the last 7 days": {"action": "add", "days": 7},
+        "Edited in the last 7 days": {"action": "edit", "days": 7},
+        "Deleted in the last 7 days": {"action": "delete", "days": 7},
+        "All changes in the last 7 days": {"days": 7},
+    }
+
+    def schedule_history(self):
+        self.history_timer.start(150)
+
+    def update_history(self):
+        scope = self.HISTORY_SCOPES[self.history_scope_combo.currentText()]
+        self.history_list.clear()
+        if scope:
+            since = time.time() - scope["days"] * 86400
+            entries = audit_log.query(action=scope.get("action"), since=since)
+        else:
+            row = self.table.currentRow()
+            if row < 0 or row >= len(self.visible_items):
+                self.history_list.addItem("Select an item to see its history")
+                return
+            entries = audit_log.query(code=self.visible_items[row].get("Item Code", ""))
+        for entry in entries:
+            item = entry.get("item") or {}
+            timestamp = entry.get("ts", "")[:19].replace("T", " ")
+            catalogue = os.path.basename(entry.get("catalogue") or "")
+            self.history_list.addItem(f"{timestamp}  {entry.get('action', ''):<11} {entry.get('code') or ''}  {item.get('Item Name', '')}  {catalogue}".rstrip())
+        if not entries:
+            self.history_list.addItem("No changes recorded")
 
     def show_item_details(self):
         selected_row = self.table.currentRow()
@@ -554,14 +1030,23 @@ class JSONViewerApp(QMainWindow):
             self.detail_view.setText("Select an item to view details")
 
     def copy_command(self, command):
-        pyperclip.copy(command)
-        icon_path = os.path.join(os.getcwd(), 'images', 'starfield.png')
-        notification.notify(
-            title='Starfield IDDB',
-            message='Console command copied to clipboard',
-            app_name='Starfield IDDB',
-            app_icon=icon_path
-        )
+        # QClipboard is native and returns immediately, unlike pyperclip which
+        # shells out to xclip/xsel on Linux; the notification is coalesced and
+        # sent from a worker thread by CopyNotifier.
+        QApplication.clipboard().setText(command)
+        self.copy_notifier.copied()
+
+    def selected_rows(self):
+        return sorted(set(index.row() for index in self.table.selectedIndexes()))
+
+    def copy_selected_commands(self):
+        rows = self.selected_rows()
+        if not rows:
+            return
+        script = build_script(self.visible_items[row] for row in rows)
+        QApplication.clipboard().setText(script)
+        self.copy_notifier.copied(len(rows))
+        self.status_bar.showMessage(f"Copied {len(rows)} console commands")
 
     def open_context_menu(self, position):
         index = self.table.indexAt(position)
@@ -571,7 +1056,7 @@ class JSONViewerApp(QMainWindow):
         row = self.table.indexAt(position).row()
         item_code = self.table.item(row, 0).text()
         item_name = self.table.item(row, 1).text()
-        console_command = self.table.cellWidget(row, 2).layout().itemAt(0).widget().text()
+        console_command = self.table.item(row, 2).text()
         item = {
             "Item Code": item_code,
             "Item Name": item_name,
@@ -584,17 +1069,34 @@ class JSONViewerApp(QMainWindow):
         copy_action.triggered.connect(lambda: self.copy_command(item.get("Console Command", "")))
         context_menu.addAction(copy_action)
 
+        selected_count = len(self.selected_rows())
+        if selected_count > 1:
+            copy_selected_action = QAction(f"Copy {selected_count} Commands", self)
+            copy_selected_action.triggered.connect(self.copy_selected_commands)
+            context_menu.addAction(copy_selected_action)
+
+        favourite_action = QAction("Remove from Favourites" if item_code in self.favourites else "Add to Favourites", self)
+        favourite_action.triggered.connect(lambda: self.toggle_favourite(row))
+        context_menu.addAction(favourite_action)
+
         edit_action = QAction("Edit", self)
         edit_action.triggered.connect(lambda: self.edit_item_from_menu(position))
         context_menu.addAction(edit_action)
 
         context_menu.exec_(self.table.viewport().mapToGlobal(position))
 
+    def favourites_read_only(self):
+        if self.viewing_favourites:
+            self.status_bar.showMessage("Favourites can't be edited here; open the item's catalogue to edit it.")
+        return self.viewing_favourites
+
     def edit_item_from_menu(self, position):
+        if self.favourites_read_only():
+            return
         row = self.table.indexAt(position).row()
         item_code = self.table.item(row, 0).text()
         item_name = self.table.item(row, 1).text()
-        console_command = self.table.cellWidget(row, 2).layout().itemAt(0).widget().text()
+        console_command = self.table.item(row, 2).text()
 
         dialog = QDialog(self)
         dialog.setWindowTitle("Edit Item")
@@ -614,17 +1116,15 @@ class JSONViewerApp(QMainWindow):
     def save_edit(self, dialog, row, item_code_edit, item_name_edit, console_command_edit):
         self.table.setItem(row, 0, QTableWidgetItem(item_code_edit.text()))
         self.table.setItem(row, 1, QTableWidgetItem(item_name_edit.text()))
-        cell_widget = self.table.cellWidget(row, 2)
-        cell_widget.layout().itemAt(0).widget().setText(console_command_edit.text())
+        self.table.setItem(row, 2, QTableWidgetItem(console_command_edit.text()))
 
-        self.data[row] = {
+        self.replace_item(row, {
             "Item Code": item_code_edit.text(),
             "Item Name": item_name_edit.text(),
             "Console Command": console_command_edit.text()
-        }
+        })
 
-        with open(self.current_file, 'w') as jsonfile:
-            json.dump(self.data, jsonfile)
+        self.write_current_file()
 
         dialog.accept()
 
@@ -632,71 +1132,151 @@ class JSONViewerApp(QMainWindow):
         options = QFileDialog.Options()
         file_path, _ = QFileDialog.getSaveFileName(self, "Save CSV", self.settings.get("default_csv_path", ""), "CSV Files (*.csv);;All Files (*)", options=options)
         if file_path:
-            with open(file_path, 'w', newline='') as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerow(['Item ID', 'Item Name', 'Console Command', 'Favourite'])
-                for row in range(self.table.rowCount()):
-                    writer.writerow([
-                        self.table.item(row, 0).text(), 
-                        self.table.item(row, 1).text(), 
-                        self.table.cellWidget(row, 2).layout().itemAt(0).widget().text(), 
-                    ])
+            self.write_csv(file_path)
             self.status_bar.showMessage(f"Data exported to {file_path}")
 
+    @profiler.profiled("write_csv")
+    @metrics.timed("export.csv")
+    def write_csv(self, file_path):
+        with open(file_path, 'w', newline='') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(['Item ID', 'Item Name', 'Console Command', 'Favourite'])
+            for row in range(self.table.rowCount()):
+                writer.writerow([
+                    self.table.item(row, 0).text(), 
+                    self.table.item(row, 1).text(), 
+                    self.table.item(row, 2).text(), 
+                ])
+
     def export_to_json(self):
         options = QFileDialog.Options()
         file_path, _ = QFileDialog.getSaveFileName(self, "Save JSON", self.settings.get("default_json_path", ""), "JSON Files (*.json);;All Files (*)", options=options)
         if file_path:
-            data_to_export = []
-            for row in range(self.table.rowCount()):
-                item = {
-                    "Item Code": self.table.item(row, 0).text(),
-                    "Item Name": self.table.item(row, 1).text(),
-                    "Console Command": self.table.cellWidget(row, 2).layout().itemAt(0).widget().text()
-                }
-                data_to_export.append(item)
-            with open(file_path, 'w') as jsonfile:
-                json.dump(data_to_export, jsonfile)
+            with metrics.timer("export.json"):
+                self.write_json_export(file_path)
             self.status_bar.showMessage(f"Data exported to {file_path}")
 
+    def write_json_export(self, file_path):
+        data_to_export = []
+        for row in range(self.table.rowCount()):
+            item = {
+                "Item Code": self.table.item(row, 0).text(),
+                "Item Name": self.table.item(row, 1).text(),
+                "Console Command": self.table.item(row, 2).text()
+            }
+            data_to_export.append(item)
+        with open(file_path, 'w') as jsonfile:
+            json.dump(data_to_export, jsonfile)
+
     def export_to_pdf(self):
         options = QFileDialog.Options()
         file_path, _ = QFileDialog.getSaveFileName(self, "Save PDF", self.settings.get("default_json_path", ""), "PDF Files (*.pdf);;All Files (*)", options=options)
         if file_path:
-            printer = QPrinter(QPrinter.HighResolution)
-            printer.setOutputFormat(QPrinter.PdfFormat)
-            printer.setOutputFileName(file_path)
-            painter = QPainter(printer)
-            screen = self.grab()
-            screen_scaled = screen.scaled(printer.pageRect().size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            x = (printer.pageRect().width() - screen_scaled.width()) / 2
-            y = (printer.pageRect().height() - screen_scaled.height()) / 2
-            painter.drawPixmap(int(x), int(y), screen_scaled)
-            painter.end()
+            from PyQt5.QtPrintSupport import QPrinter
+
+            with metrics.timer("export.pdf"):
+                printer = QPrinter(QPrinter.HighResolution)
+                printer.setOutputFormat(QPrinter.PdfFormat)
+                printer.setOutputFileName(file_path)
+                painter = QPainter(printer)
+                screen = self.grab()
+                screen_scaled = screen.scaled(printer.pageRect().size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                x = (printer.pageRect().width() - screen_scaled.width()) / 2
+                y = (printer.pageRect().height() - screen_scaled.height()) / 2
+                painter.drawPixmap(int(x), int(y), screen_scaled)
+                painter.end()
             self.status_bar.showMessage(f"Data exported to {file_path}")
 
+    def open_export_script_dialog(self):
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Export Console Script")
+        layout = QFormLayout()
+
+        selected = [self.visible_items[row] for row in self.selected_rows()]
+        scopes = [
+            (f"Selected items ({len(selected)})", selected),
+            (f"Current results ({len(self.visible_items)})", self.visible_items),
+            (f"Whole catalogue ({len(self.data)})", self.data),
+        ]
+        scope_combo = QComboBox()
+        for label, records in scopes:
+            scope_combo.addItem(label)
+        scope_combo.setCurrentIndex(0 if selected else 1)
+        layout.addRow("Items:", scope_combo)
+
+        quantity_spinbox = QSpinBox()
+        quantity_spinbox.setRange(1, 1000000)
+        quantity_spinbox.setValue(1)
+        layout.addRow("Quantity:", quantity_spinbox)
+
+        export_button = QPushButton("Export")
+        export_button.clicked.connect(lambda: self.export_console_script(dialog, scopes[scope_combo.currentIndex()][1], quantity_spinbox.value()))
+        layout.addWidget(export_button)
+        dialog.setLayout(layout)
+        dialog.exec_()
+
+    def export_console_script(self, dialog, records, quantity):
+        options = QFileDialog.Options()
+        file_path, _ = QFileDialog.getSaveFileName(self, "Save Console Script", self.settings.get("default_json_path", ""), "Text Files (*.txt);;All Files (*)", options=options)
+        if file_path:
+            with metrics.timer("export.script"):
+                count = write_script(file_path, records, quantity)
+            name = os.path.splitext(os.path.basename(file_path))[0]
+            self.status_bar.showMessage(f"Exported {count} commands to {file_path} - run it in game with: bat {name}")
+            dialog.accept()
+
     def open_file(self):
         options = QFileDialog.Options()
         file_path, _ = QFileDialog.getOpenFileName(self, "Open JSON File", self.settings.get("default_json_path", ""), "JSON Files (*.json);;All Files (*)", options=options)
         if file_path:
-            self.load_json(file_path)
+            self.load_json(file_path, reload=True)
+            audit_log.log("import", {}, file_path, items=len(self.data))
 
+    @profiler.profiled("save_file")
     def save_file(self):
+        if self.viewing_favourites:
+            self.favourites_timer.stop()
+            self.favourites.save()
+            self.status_bar.showMessage(f"Favourites saved to {self.favourites.path}")
+            return
         if not self.current_file:
             self.save_file_as()
             return
-        with open(self.current_file, 'w') as jsonfile:
-            json.dump(self.data, jsonfile)
+        self.write_current_file()
         self.status_bar.showMessage(f"Data saved to {self.current_file}")
 
+    @metrics.timed("save")
+    def write_current_file(self):
+        with open(self.current_file, 'w', encoding='utf-8') as jsonfile:
+            json.dump(self.data, jsonfile)
+        self.index.invalidate(self.current_file)
+        self.catalogue_watcher.remember(self.current_file)
+
     def save_file_as(self):
         options = QFileDialog.Options()
         file_path, _ = QFileDialog.getSaveFileName(self, "Save JSON", self.settings.get("default_json_path", ""), "JSON Files (*.json);;All Files (*)", options=options)
         if file_path:
+            # A tab already showing that file would be left with stale
+            # contents; this tab takes its place.
+            for index, tab in enumerate(self.workspace_tabs()):
+                if tab is not self.active_tab and tab.key not in (None, self.FAVOURITES_TAB) and os.path.abspath(tab.key) == os.path.abspath(file_path):
+                    self.close_tab(index)
+                    break
+            # The view shares its list and records with the catalogue (or
+            # favourites) it was opened from; the new file gets copies, so
+            # later edits to it never reach the original.
+            copies = {}
+            self.data = [copies.setdefault(id(record), dict(record)) for record in self.data]
+            self.listed_items = [copies.get(id(item), item) for item in self.listed_items]
+            self.visible_items = [copies.get(id(item), item) for item in self.visible_items]
+            self.viewing_favourites = False
             self.current_file = file_path
+            self.set_tab_key(self.active_tab, file_path)
             self.save_file()
 
     def new_file(self):
+        self.open_tab(None)
+        self.viewing_favourites = False
         self.current_file = None
         self.data = []
         self.populate_listbox(self.data)
@@ -704,19 +1284,157 @@ class JSONViewerApp(QMainWindow):
         self.status_bar.showMessage("New file created")
 
     def refresh(self):
-        if self.current_file:
-            self.load_json(self.current_file)
+        if self.viewing_favourites:
+            self.show_favourites()
+        elif self.current_file:
+            self.load_json(self.current_file, reload=True)
         self.status_bar.showMessage("Refreshed")
 
+    def sync_catalogues(self):
+        from catalogue_sync import CATALOGUE_BASE_URL, CatalogueSync
+
+        if self.sync_thread is not None and self.sync_thread.isRunning():
+            return
+        # Loaded up front so the worker thread only reads the index.
+        self.index.load_all()
+        catalogue_sync = CatalogueSync(self.index, self.settings.get("catalogue_update_url") or CATALOGUE_BASE_URL)
+        self.sync_thread = CatalogueSyncThread(catalogue_sync)
+        self.sync_thread.synced.connect(self.on_catalogues_synced)
+        self.status_bar.showMessage("Checking for catalogue updates...")
+        self.sync_thread.start()
+
+    def on_catalogues_synced(self, updates, error):
+        if error:
+            QMessageBox.warning(self, "Catalogue Sync Failed", f"Failed to check for catalogue updates: {error}")
+            self.status_bar.showMessage("Ready")
+            return
+        if not updates:
+            self.status_bar.showMessage("All catalogues are up to date.")
+            return
+        names = "\n".join(f"{update.name} ({len(update.records)} items)" for update in updates)
+        reply = QMessageBox.question(
+            self,
+            'Catalogue Updates',
+            f"Updated catalogues are available:\n\n{names}\n\nLocal changes to these catalogues will be replaced. Apply them?",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if reply != QMessageBox.Yes:
+            self.status_bar.showMessage("Catalogue update postponed.")
+            return
+        try:
+            self.sync_thread.catalogue_sync.apply(updates)
+        except OSError as e:
+            QMessageBox.warning(self, "Catalogue Sync Failed", f"Failed to write the updated catalogues: {e}")
+            return
+        changed = {update.path for update in updates}
+        for path in changed:
+            self.catalogue_watcher.remember(path)
+        if self.viewing_favourites:
+            self.show_favourites()
+        elif self.current_file in changed:
+            self.populate_listbox(self.data)
+        self.status_bar.showMessage(f"Updated {len(updates)} catalogue(s).")
+
+    def compare_catalogues(self):
+        from diff_dialog import CatalogueDiffDialog
+
+        if self.viewing_favourites or not self.current_file:
+            QMessageBox.information(self, "Compare Catalogues", "Open a catalogue to compare it with another version.")
+            return
+        backup_dir = os.path.join(os.path.dirname(os.path.abspath(self.current_file)), "json backup")
+        start = os.path.join(backup_dir, os.path.basename(self.current_file)) if os.path.isdir(backup_dir) else ""
+        other_path, _ = QFileDialog.getOpenFileName(self, "Compare With", start, "JSON Files (*.json);;All Files (*)")
+        if not other_path:
+            return
+        base_path = self.current_file
+        # The view's records are compared, and the merge is applied to the
+        # same records, provided nothing changed them in the meantime.
+        base_records = list(self.data)
+        revision = self.view_revision()[0]
+        dialog = CatalogueDiffDialog(base_path, other_path, base_records, self)
+        if dialog.exec_() != QDialog.Accepted:
+            return
+        unchanged = (
+            self.current_file == base_path and not self.viewing_favourites and self.view_revision()[0] == revision
+            and len(self.data) == len(base_records) and all(new is old for new, old in zip(self.data, base_records))
+        )
+        if not unchanged:
+            QMessageBox.warning(self, "Merge Failed", f"{base_path} changed while it was being compared. Compare it again to merge.")
+            return
+        self.apply_catalogue_merge(base_path, other_path, dialog.accepted_entries())
+
+    def apply_catalogue_merge(self, path, other_path, entries):
+        # The merge is applied to the view's records and written in one go.
+        # Catalogues shared with the index are then updated in place by Item
+        # Code, as for a change made by another program.
+        from catalogue_diff import KINDS, merge_records, write_catalogue
+
+        if not entries:
+            return
+        merged = merge_records(self.data, entries)
+        try:
+            write_catalogue(path, merged)
+        except OSError as e:
+            QMessageBox.warning(self, "Merge Failed", f"Failed to write {path}: {e}")
+            return
+        self.catalogue_watcher.remember(path)
+        catalogue = self.index.catalogues.get(path)
+        if catalogue is not None and catalogue.records is self.data:
+            self.on_catalogue_changed(path, *self.index.merge(path, merged))
+        else:
+            # Not the index's list (e.g. a file made with Save As): the view
+            # takes the merged list as its own.
+            self.data = merged
+            self.index.invalidate(path)
+            self.perform_search()
+        counts = {kind: sum(entry.kind == kind for entry in entries) for kind in KINDS}
+        audit_log.log("merge", {}, path, source=other_path, **counts)
+        self.status_bar.showMessage(f"Merged {other_path} into {path}: {counts['added']} added, {counts['changed']} changed, {counts['removed']} removed")
+
+    @profiler.profiled("on_catalogue_changed")
+    def on_catalogue_changed(self, path, inserted, updated, deleted):
+        # Another program changed a catalogue; the index already holds the
+        # merged records, so only the affected rows are touched here.
+        if self.viewing_favourites:
+            codes = {item.get("Item Code", "") for item in inserted + updated + deleted}
+            if any(code in self.favourites for code in codes):
+                self.show_favourites()
+        elif path == self.current_file:
+            if inserted or (updated and self.sort_order):
+                # New rows (or rows that may move) need the current filter
+                # and sort applied.
+                self.perform_search()
+            else:
+                removed = {id(item) for item in deleted}
+                changed = {id(item) for item in updated}
+                self.table.setUpdatesEnabled(False)
+                for row in range(len(self.visible_items) - 1, -1, -1):
+                    item = self.visible_items[row]
+                    if id(item) in removed:
+                        self.table.removeRow(row)
+                    elif id(item) in changed:
+                        self.refresh_row(row, item)
+                self.visible_items = [item for item in self.visible_items if id(item) not in removed]
+                self.listed_items = [item for item in self.listed_items if id(item) not in removed]
+                self.table.setUpdatesEnabled(True)
+        self.status_bar.showMessage(f"{self.index.name_for(path)} changed on disk: {len(inserted)} added, {len(updated)} updated, {len(deleted)} removed")
+
     def delete_selected_items(self):
-        selected_rows = sorted(set(index.row() for index in self.table.selectedIndexes()), reverse=True)
-        for row in selected_rows:
-            self.table.removeRow(row)
-            del self.data[row]
+        selected_rows = self.selected_rows()
+        if self.viewing_favourites:
+            for row in selected_rows:
+                self.favourites.remove(self.visible_items[row].get("Item Code", ""))
+            self.remove_items(selected_rows, "unfavourite")
+            self.favourites_timer.start(2000)
+            self.status_bar.showMessage("Selected items removed from favourites")
+            return
+        self.remove_items(selected_rows)
         self.save_file()
         self.status_bar.showMessage("Selected items deleted")
 
     def print_file(self):
+        from PyQt5.QtPrintSupport import QPrinter, QPrintDialog
+
         printer = QPrinter(QPrinter.HighResolution)
         print_dialog = QPrintDialog(printer, self)
         if print_dialog.exec_() == QPrintDialog.Accepted:
@@ -749,7 +1467,7 @@ class JSONViewerApp(QMainWindow):
         self.highlight_color_canvas.setFixedSize(20, 20)
         self.highlight_color_canvas.setStyleSheet(f"background-color: {self.settings.get('highlight_color', '#3a7ae0')};")
         self.highlight_color_button = QPushButton()
-        self.highlight_color_button.setIcon(QIcon("images/colorpicker.png"))
+        self.highlight_color_button.setIcon(icon("colorpicker.png"))
         self.highlight_color_button.setFixedSize(25, 25)
         self.highlight_color_button.clicked.connect(lambda: self.select_color("highlight_color", self.highlight_color_edit, self.highlight_color_canvas))
         highlight_color_layout = QHBoxLayout()
@@ -763,7 +1481,7 @@ class JSONViewerApp(QMainWindow):
         self.font_color_canvas.setFixedSize(20, 20)
         self.font_color_canvas.setStyleSheet(f"background-color: {self.settings.get('font_color', 'white')};")
         self.font_color_button = QPushButton()
-        self.font_color_button.setIcon(QIcon("images/colorpicker.png"))
+        self.font_color_button.setIcon(icon("colorpicker.png"))
         self.font_color_button.setFixedSize(25, 25)
         self.font_color_button.clicked.connect(lambda: self.select_color("font_color", self.font_color_edit, self.font_color_canvas))
         font_color_layout = QHBoxLayout()
@@ -777,7 +1495,7 @@ class JSONViewerApp(QMainWindow):
         self.background_color_canvas.setFixedSize(20, 20)
         self.background_color_canvas.setStyleSheet(f"background-color: {self.settings.get('background_color', '#1e1e1e')};")
         self.background_color_button = QPushButton()
-        self.background_color_button.setIcon(QIcon("images/colorpicker.png"))
+        self.background_color_button.setIcon(icon("colorpicker.png"))
         self.background_color_button.setFixedSize(25, 25)
         self.background_color_button.clicked.connect(lambda: self.select_color("background_color", self.background_color_edit, self.background_color_canvas))
         background_color_layout = QHBoxLayout()
@@ -791,7 +1509,7 @@ class JSONViewerApp(QMainWindow):
         self.alternate_background_color_canvas.setFixedSize(20, 20)
         self.alternate_background_color_canvas.setStyleSheet(f"background-color: {self.settings.get('alternate_background_color', '#2e2e2e')};")
         self.alternate_background_color_button = QPushButton()
-        self.alternate_background_color_button.setIcon(QIcon("images/colorpicker.png"))
+        self.alternate_background_color_button.setIcon(icon("colorpicker.png"))
         self.alternate_background_color_button.setFixedSize(25, 25)
         self.alternate_background_color_button.clicked.connect(lambda: self.select_color("alternate_background_color", self.alternate_background_color_edit, self.alternate_background_color_canvas))
         alternate_background_color_layout = QHBoxLayout()
@@ -805,7 +1523,7 @@ class JSONViewerApp(QMainWindow):
         self.border_color_canvas.setFixedSize(20, 20)
         self.border_color_canvas.setStyleSheet(f"background-color: {self.settings.get('border_color', '#3a7ae0')};")
         self.border_color_button = QPushButton()
-        self.border_color_button.setIcon(QIcon("images/colorpicker.png"))
+        self.border_color_button.setIcon(icon("colorpicker.png"))
         self.border_color_button.setFixedSize(25, 25)
         self.border_color_button.clicked.connect(lambda: self.select_color("border_color", self.border_color_edit, self.border_color_canvas))
         border_color_layout = QHBoxLayout()
@@ -819,7 +1537,7 @@ class JSONViewerApp(QMainWindow):
         self.button_hover_color_canvas.setFixedSize(20, 20)
         self.button_hover_color_canvas.setStyleSheet(f"background-color: {self.settings.get('button_hover_color', '#3a7ae0')};")
         self.button_hover_color_button = QPushButton()
-        self.button_hover_color_button.setIcon(QIcon("images/colorpicker.png"))
+        self.button_hover_color_button.setIcon(icon("colorpicker.png"))
         self.button_hover_color_button.setFixedSize(25, 25)
         self.button_hover_color_button.clicked.connect(lambda: self.select_color("button_hover_color", self.button_hover_color_edit, self.button_hover_color_canvas))
         button_hover_color_layout = QHBoxLayout()
@@ -833,7 +1551,7 @@ class JSONViewerApp(QMainWindow):
         self.button_press_color_canvas.setFixedSize(20, 20)
         self.button_press_color_canvas.setStyleSheet(f"background-color: {self.settings.get('button_press_color', '#2a69bf')};")
         self.button_press_color_button = QPushButton()
-        self.button_press_color_button.setIcon(QIcon("images/colorpicker.png"))
+        self.button_press_color_button.setIcon(icon("colorpicker.png"))
         self.button_press_color_button.setFixedSize(25, 25)
         self.button_press_color_button.clicked.connect(lambda: self.select_color("button_press_color", self.button_press_color_edit, self.button_press_color_canvas))
         button_press_color_layout = QHBoxLayout()
@@ -847,7 +1565,7 @@ class JSONViewerApp(QMainWindow):
         self.toolbar_bg_start_canvas.setFixedSize(20, 20)
         self.toolbar_bg_start_canvas.setStyleSheet(f"background-color: {self.settings.get('toolbar_bg_start', '#3a3a3a')};")
         self.toolbar_bg_start_button = QPushButton()
-        self.toolbar_bg_start_button.setIcon(QIcon("images/colorpicker.png"))
+        self.toolbar_bg_start_button.setIcon(icon("colorpicker.png"))
         self.toolbar_bg_start_button.setFixedSize(25, 25)
         self.toolbar_bg_start_button.clicked.connect(lambda: self.select_color("toolbar_bg_start", self.toolbar_bg_start_edit, self.toolbar_bg_start_canvas))
         toolbar_bg_start_layout = QHBoxLayout()
@@ -861,7 +1579,7 @@ class JSONViewerApp(QMainWindow):
         self.toolbar_bg_end_canvas.setFixedSize(20, 20)
         self.toolbar_bg_end_canvas.setStyleSheet(f"background-color: {self.settings.get('toolbar_bg_end', '#1e1e1e')};")
         self.toolbar_bg_end_button = QPushButton()
-        self.toolbar_bg_end_button.setIcon(QIcon("images/colorpicker.png"))
+        self.toolbar_bg_end_button.setIcon(icon("colorpicker.png"))
         self.toolbar_bg_end_button.setFixedSize(25, 25)
         self.toolbar_bg_end_button.clicked.connect(lambda: self.select_color("toolbar_bg_end", self.toolbar_bg_end_edit, self.toolbar_bg_end_canvas))
         toolbar_bg_end_layout = QHBoxLayout()
@@ -875,7 +1593,7 @@ class JSONViewerApp(QMainWindow):
         self.dialog_bg_color_canvas.setFixedSize(20, 20)
         self.dialog_bg_color_canvas.setStyleSheet(f"background-color: {self.settings.get('dialog_bg_color', '#1e1e1e')};")
         self.dialog_bg_color_button = QPushButton()
-        self.dialog_bg_color_button.setIcon(QIcon("images/colorpicker.png"))
+        self.dialog_bg_color_button.setIcon(icon("colorpicker.png"))
         self.dialog_bg_color_button.setFixedSize(25, 25)
         self.dialog_bg_color_button.clicked.connect(lambda: self.select_color("dialog_bg_color", self.dialog_bg_color_edit, self.dialog_bg_color_canvas))
         dialog_bg_color_layout = QHBoxLayout()
@@ -889,7 +1607,7 @@ class JSONViewerApp(QMainWindow):
         self.label_color_canvas.setFixedSize(20, 20)
         self.label_color_canvas.setStyleSheet(f"background-color: {self.settings.get('label_color', 'white')};")
         self.label_color_button = QPushButton()
-        self.label_color_button.setIcon(QIcon("images/colorpicker.png"))
+        self.label_color_button.setIcon(icon("colorpicker.png"))
         self.label_color_button.setFixedSize(25, 25)
         self.label_color_button.clicked.connect(lambda: self.select_color("label_color", self.label_color_edit, self.label_color_canvas))
         label_color_layout = QHBoxLayout()
@@ -1077,6 +1795,29 @@ class JSONViewerApp(QMainWindow):
         self.cache_timeout_spinbox.setValue(self.settings.get("cache_timeout", 60))
         advanced_layout.addRow("Cache Timeout (seconds):", self.cache_timeout_spinbox)
 
+        self.enable_api_server_checkbox = QCheckBox("Enable Local API Server")
+        self.enable_api_server_checkbox.setChecked(self.settings.get("enable_api_server", False))
+        advanced_layout.addRow(self.enable_api_server_checkbox)
+
+        self.api_server_port_spinbox = QSpinBox()
+        self.api_server_port_spinbox.setRange(1024, 65535)
+        self.api_server_port_spinbox.setValue(self.settings.get("api_server_port", 8765))
+        advanced_layout.addRow("API Server Port:", self.api_server_port_spinbox)
+
+        self.preload_catalogues_checkbox = QCheckBox("Preload Catalogues at Startup")
+        self.preload_catalogues_checkbox.setChecked(self.settings.get("preload_catalogues", True))
+        advanced_layout.addRow(self.preload_catalogues_checkbox)
+
+        self.preload_memory_spinbox = QSpinBox()
+        self.preload_memory_spinbox.setRange(16, 4096)
+        self.preload_memory_spinbox.setValue(self.settings.get("preload_memory_mb", 256))
+        advanced_layout.addRow("Preload Memory Budget (MB):", self.preload_memory_spinbox)
+
+        self.tab_idle_spinbox = QSpinBox()
+        self.tab_idle_spinbox.setRange(1, 240)
+        self.tab_idle_spinbox.setValue(self.settings.get("tab_idle_minutes", 10))
+        advanced_layout.addRow("Unload Idle Tabs After (minutes):", self.tab_idle_spinbox)
+
         advanced_widget.setLayout(advanced_layout)
         tabs.addTab(advanced_widget, "Advanced")
 
@@ -1151,10 +1892,14 @@ class JSONViewerApp(QMainWindow):
         self.settings["enable_error_logging"] = self.enable_error_logging_checkbox.isChecked()
         self.settings["debug_mode"] = self.debug_mode_checkbox.isChecked()
         self.settings["cache_timeout"] = self.cache_timeout_spinbox.value()
+        self.settings["enable_api_server"] = self.enable_api_server_checkbox.isChecked()
+        self.settings["api_server_port"] = self.api_server_port_spinbox.value()
+        self.settings["preload_catalogues"] = self.preload_catalogues_checkbox.isChecked()
+        self.settings["preload_memory_mb"] = self.preload_memory_spinbox.value()
+        self.settings["tab_idle_minutes"] = self.tab_idle_spinbox.value()
 
+        # Only the settings that changed are applied, by on_settings_changed.
         save_settings(self.settings)
-        self.apply_theme()
-        self.apply_table_settings()
         dialog.accept()
 
     def select_color(self, setting, line_edit, canvas):
@@ -1180,62 +1925,7 @@ class JSONViewerApp(QMainWindow):
         self.apply_theme()
 
     def apply_color_palette(self, palette_name):
-        palettes = {
-            "Default": DEFAULT_SETTINGS,
-            "Cool Blues": {
-                "highlight_color": "#3399ff",
-                "font_color": "#e6f2ff",
-                "background_color": "#00264d",
-                "alternate_background_color": "#001a33",
-                "border_color": "#3399ff",
-                "button_hover_color": "#3399ff",
-                "button_press_color": "#2673cc",
-                "toolbar_bg_start": "#003366",
-                "toolbar_bg_end": "#00264d",
-                "dialog_bg_color": "#00264d",
-                "label_color": "#e6f2ff"
-            },
-            "Warm Sunset": {
-                "highlight_color": "#ff9966",
-                "font_color": "#fff2e6",
-                "background_color": "#4d2600",
-                "alternate_background_color": "#331a00",
-                "border_color": "#ff9966",
-                "button_hover_color": "#ff9966",
-                "button_press_color": "#cc8052",
-                "toolbar_bg_start": "#663300",
-                "toolbar_bg_end": "#4d2600",
-                "dialog_bg_color": "#4d2600",
-                "label_color": "#fff2e6"
-            },
-            "Forest Greens": {
-                "highlight_color": "#66cc66",
-                "font_color": "#e6ffe6",
-                "background_color": "#003300",
-                "alternate_background_color": "#002600",
-                "border_color": "#66cc66",
-                "button_hover_color": "#66cc66",
-                "button_press_color": "#52a652",
-                "toolbar_bg_start": "#004d00",
-                "toolbar_bg_end": "#003300",
-                "dialog_bg_color": "#003300",
-                "label_color": "#e6ffe6"
-            },
-            "Desert Sands": {
-                "highlight_color": "#cc9933",
-                "font_color": "#fffbf2",
-                "background_color": "#4d3b00",
-                "alternate_background_color": "#332800",
-                "border_color": "#cc9933",
-                "button_hover_color": "#cc9933",
-                "button_press_color": "#a67c29",
-                "toolbar_bg_start": "#665000",
-                "toolbar_bg_end": "#4d3b00",
-                "dialog_bg_color": "#4d3b00",
-                "label_color": "#fffbf2"
-            }
-        }
-        selected_palette = palettes.get(palette_name, DEFAULT_SETTINGS)
+        selected_palette = PALETTES.get(palette_name, PALETTES["Default"])
         self.highlight_color_edit.setText(selected_palette["highlight_color"])
         self.font_color_edit.setText(selected_palette["font_color"])
         self.background_color_edit.setText(selected_palette["background_color"])
@@ -1250,61 +1940,113 @@ class JSONViewerApp(QMainWindow):
 
         self.apply_theme()
 
+    @profiler.profiled("apply_theme")
     def apply_theme(self):
-        if self.settings["theme"] == "dark":
-            self.setStyleSheet(qdarkstyle.load_stylesheet_pyqt5())
-        else:
-            self.setStyleSheet("")
+        # Re-polishing for a new stylesheet can reset widget fonts, so the
+        # font setting is re-applied whenever the stylesheet changed.
+        if theme_manager.apply(self.settings):
+            self.apply_font()
 
     def apply_table_settings(self):
-        self.table.setAlternatingRowColors(self.settings["alternate_row_colors"])
-        self.table.setShowGrid(self.settings["show_grid"])
-        self.table.setStyleSheet(f"""
-            QTableWidget {{
-                gridline-color: {self.settings.get('highlight_color', '#3a7ae0')};
-                font-size: {self.settings.get('font_size', 14)}pt;
-                alternate-background-color: {self.settings.get('alternate_background_color', '#2e2e2e')};
-                background-color: {self.settings.get('background_color', '#1e1e1e')};
-                color: {self.settings.get('font_color', 'white')};
-            }}
-            QTableWidget::item {{
-                border-bottom: 1px solid {self.settings.get('highlight_color', '#3a7ae0')};
-                padding: 10px;
-            }}
-            QTableWidget::item:selected {{
-                background-color: {self.settings.get('highlight_color', '#5a9ae0')};
-                color: white;
-            }}
-        """)
-        self.table.horizontalHeader().setStyleSheet(f"""
-            QHeaderView::section {{
-                background-color: {self.settings.get('highlight_color', '#3a7ae0')};
-                color: {self.settings.get('font_color', 'white')};
-                font-weight: bold;
-                font-size: {self.settings.get('font_size', 12)}pt;
-                padding: 5px;
-                border: 1px solid {self.settings.get('highlight_color', '#3a7ae0')};
-            }}
-        """)
+        self.apply_row_colors()
+        self.apply_grid()
+        self.apply_row_height()
+        self.apply_font()
+
+    def tables(self):
+        # The live table of every tab; evicted tabs have none.
+        tables = [self.table]
+        for tab in self.workspace_tabs():
+            if tab is not self.active_tab and tab.table is not None:
+                tables.append(tab.table)
+        return tables
+
+    def apply_row_colors(self, tables=None):
+        for table in tables or self.tables():
+            table.setAlternatingRowColors(self.settings["alternate_row_colors"])
+
+    def apply_grid(self, tables=None):
+        for table in tables or self.tables():
+            table.setShowGrid(self.settings["show_grid"])
+
+    def apply_row_height(self, tables=None):
+        # Rows never get individual sizes, so the default section size alone
+        # resizes every row without touching the items.
+        for table in tables or self.tables():
+            table.verticalHeader().setDefaultSectionSize(self.settings["row_height"])
+
+    def apply_font(self):
+        self.apply_table_font()
+        font = QFont(self.detail_view.font())
+        font.setPointSize(self.settings["font_size"])
+        self.detail_view.setFont(font)
+
+    def apply_table_font(self, tables=None):
+        # One font on the table is inherited by the items and used by
+        # CommandDelegate; the header sections are styled by qdarkstyle, so
+        # they get a one-rule stylesheet of their own.
+        for table in tables or self.tables():
+            font = QFont(table.font())
+            font.setPointSize(self.settings["font_size"])
+            table.setFont(font)
+            table.horizontalHeader().setStyleSheet(f"QHeaderView::section {{ font-size: {self.settings['font_size']}pt; }}")
 
     def setup_shortcuts(self):
-        QShortcut(QKeySequence(self.settings["shortcut_new_file"]), self, self.new_file)
-        QShortcut(QKeySequence(self.settings["shortcut_add"]), self, self.add_item)
-        QShortcut(QKeySequence(self.settings["shortcut_edit"]), self, self.edit_selected_item)
-        QShortcut(QKeySequence(self.settings["shortcut_open"]), self, self.open_file)
-        QShortcut(QKeySequence(self.settings["shortcut_save"]), self, self.save_file)
-        QShortcut(QKeySequence(self.settings["shortcut_save_as"]), self, self.save_file_as)
-        QShortcut(QKeySequence(self.settings["shortcut_undo"]), self, self.undo)
-        QShortcut(QKeySequence(self.settings["shortcut_redo"]), self, self.redo)
-        QShortcut(QKeySequence(self.settings["shortcut_delete"]), self, self.delete_selected_items)
+        # Created once; apply_shortcuts rebinds them in place.
+        self.shortcuts = {}
+        for key, handler in self.SHORTCUT_ACTIONS.items():
+            self.shortcuts[key] = QShortcut(QKeySequence(self.settings[key]), self, getattr(self, handler))
+
+    def apply_shortcuts(self):
+        for key, shortcut in self.shortcuts.items():
+            shortcut.setKey(QKeySequence(self.settings[key]))
+
+    def apply_api_server(self):
+        # The server thread reads the same CatalogueIndex as the window and
+        # drops its response cache whenever the index generation changes.
+        from api_server import ApiServer
+
+        if self.api_server is not None:
+            self.api_server.stop()
+            self.api_server = None
+        if not self.settings["enable_api_server"]:
+            return
+        server = ApiServer(self.index, port=self.settings["api_server_port"])
+        try:
+            server.start()
+        except OSError as e:
+            self.status_bar.showMessage(f"Local API server could not start: {e}")
+            return
+        self.api_server = server
+        self.status_bar.showMessage(f"Local API server listening on http://127.0.0.1:{server.port}/")
+
+    def apply_debug_mode(self):
+        # Instrumentation only records while debug mode is on; the panel is
+        # built the first time it is needed.
+        metrics.enabled = self.settings["debug_mode"]
+        if metrics.enabled and self.debug_panel is None:
+            from debug_panel import DebugPanel
+
+            self.debug_panel = DebugPanel(self)
+            self.addDockWidget(Qt.RightDockWidgetArea, self.debug_panel)
+        if self.debug_panel is not None:
+            self.debug_panel.setVisible(metrics.enabled)
+
+    @profiler.profiled("on_settings_changed")
+    def on_settings_changed(self, changes):
+        handlers = dict.fromkeys(self.SETTING_HANDLERS[key] for key in changes if key in self.SETTING_HANDLERS)
+        for handler in handlers:
+            getattr(self, handler)()
 
     def undo(self):
         if self.undo_stack:
             action, item = self.undo_stack.pop()
-            if action == "remove":
-                self.data.append(item)
-            elif action == "add":
-                self.data = [i for i in self.data if i != item]
+            with self.index.lock:
+                if action == "remove":
+                    self.data.append(item)
+                elif action == "add":
+                    self.data[:] = [i for i in self.data if i != item]
+                self.index.invalidate(self.current_file)
             self.redo_stack.append((action, item))
             self.populate_listbox(self.data)
             self.save_file()
@@ -1312,29 +2054,53 @@ class JSONViewerApp(QMainWindow):
     def redo(self):
         if self.redo_stack:
             action, item = self.redo_stack.pop()
-            if action == "remove":
-                self.data = [i for i in self.data if i != item]
-            elif action == "add":
-                self.data.append(item)
+            with self.index.lock:
+                if action == "remove":
+                    self.data[:] = [i for i in self.data if i != item]
+                elif action == "add":
+                    self.data.append(item)
+                self.index.invalidate(self.current_file)
             self.undo_stack.append((action, item))
             self.populate_listbox(self.data)
             self.save_file()
 
     def show_help_dialog(self):
-        help_window = HelpWindow(self)  # Pass 'self' as the parent
-        help_window.show()
+        # Built once; closing the dialog only hides it.
+        if self.help_window is None:
+            from help import HelpWindow
+
+            self.help_window = HelpWindow(self)
+        self.help_window.show()
+        self.help_window.raise_()
+        self.help_window.activateWindow()
 
     def show_about_dialog(self):
+        from about import AboutDialog
+
         about_dialog = AboutDialog(self)
         about_dialog.exec_()
 
-    def check_for_updates(self):
-        self.status_bar.showMessage("Checking for updates...")
-        self.update_thread = UpdateCheckThread()
+    def check_for_updates(self, silent=False):
+        if self.update_thread is not None and self.update_thread.isRunning():
+            return
+        if not silent:
+            self.status_bar.showMessage("Checking for updates...")
+        self.update_thread = UpdateCheckThread(silent)
         self.update_thread.update_available.connect(self.on_update_check_complete)
         self.update_thread.start()
 
+    def check_for_updates_if_due(self):
+        from update_service import is_check_due
+
+        if is_check_due(self.settings):
+            self.check_for_updates(silent=True)
+
     def on_update_check_complete(self, update_available, latest_version, exe_url):
+        if latest_version:
+            self.settings["last_update_check"] = date.today().isoformat()
+            save_settings(self.settings)
+        if not update_available and self.update_thread.silent:
+            return
         if update_available:
             reply = QMessageBox.question(
                 self,
@@ -1391,6 +2157,8 @@ class JSONViewerApp(QMainWindow):
             self.backup_location_edit.setText(file_path)
 
     def add_item(self):
+        if self.favourites_read_only():
+            return
         dialog = QDialog(self)
         dialog.setWindowTitle("Add Item")
         layout = QFormLayout()
@@ -1412,17 +2180,22 @@ class JSONViewerApp(QMainWindow):
             "Item Name": item_name_edit.text(),
             "Console Command": console_command_edit.text()
         }
-        self.data.append(new_item)
+        with self.index.lock:
+            self.data.append(new_item)
+            self.index.invalidate(self.current_file)
+        audit_log.log("add", new_item, self.current_file)
         self.populate_listbox(self.data)
         self.save_file()
         dialog.accept()
 
     def edit_selected_item(self):
+        if self.favourites_read_only():
+            return
         selected_row = self.table.currentRow()
         if selected_row >= 0:
             item_code = self.table.item(selected_row, 0).text()
             item_name = self.table.item(selected_row, 1).text()
-            console_command = self.table.cellWidget(selected_row, 2).layout().itemAt(0).widget().text()
+            console_command = self.table.item(selected_row, 2).text()
 
             dialog = QDialog(self)
             dialog.setWindowTitle("Edit Item")
@@ -1442,21 +2215,41 @@ class JSONViewerApp(QMainWindow):
     def save_edit(self, dialog, row, item_code_edit, item_name_edit, console_command_edit):
         self.table.setItem(row, 0, QTableWidgetItem(item_code_edit.text()))
         self.table.setItem(row, 1, QTableWidgetItem(item_name_edit.text()))
-        cell_widget = self.table.cellWidget(row, 2)
-        cell_widget.layout().itemAt(0).widget().setText(console_command_edit.text())
+        self.table.setItem(row, 2, QTableWidgetItem(console_command_edit.text()))
 
-        self.data[row] = {
+        self.replace_item(row, {
             "Item Code": item_code_edit.text(),
             "Item Name": item_name_edit.text(),
             "Console Command": console_command_edit.text()
-        }
+        })
 
-        with open(self.current_file, 'w') as jsonfile:
-            json.dump(self.data, jsonfile)
+        self.write_current_file()
 
         dialog.accept()
 
+    def closeEvent(self, event):
+        self.favourites_timer.stop()
+        self.update_timer.stop()
+        self.eviction_timer.stop()
+        if self.update_thread is not None:
+            self.update_thread.wait(15000)
+        if self.sync_thread is not None:
+            self.sync_thread.wait(15000)
+        if self.api_server is not None:
+            self.api_server.stop()
+        if self.preloader is not None:
+            self.preloader.stop()
+        self.favourites.save()
+        settings_store.unsubscribe(self.on_settings_changed)
+        settings_store.flush()
+        audit_log.close()
+        super().closeEvent(event)
+
 if __name__ == '__main__':
+    # The preloader's process pool re-imports this module in frozen builds.
+    from multiprocessing import freeze_support
+
+    freeze_support()
     app = QApplication(sys.argv)  # Ensure this is the first PyQt5 object created
     viewer = JSONViewerApp([])     # Now you can create widgets
     sys.exit(app.exec_())
@@ -1,23 +1,20 @@
 # about.py
 from PyQt5.QtWidgets import QDialog, QVBoxLayout, QLabel, QPushButton, QHBoxLayout
-from PyQt5.QtGui import QPixmap
-from PyQt5.QtCore import Qt
-import qdarkstyle
+from PyQt5.QtCore import Qt, QSize
+from assets import pixmap
 
 class AboutDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("About Starfield IDDB")
         self.setFixedSize(400, 400)
-        self.setStyleSheet(qdarkstyle.load_stylesheet_pyqt5())
 
         layout = QVBoxLayout()
 
         # Add an image
         image_label = QLabel()
-        pixmap = QPixmap('images/starfield.png')  # Path to your image
-        scaled_pixmap = pixmap.scaled(100, 100, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        image_label.setPixmap(scaled_pixmap)
+        # A 100x100 variant, cached on disk after the first time
+        image_label.setPixmap(pixmap('starfield.png', QSize(100, 100)))
         image_label.setAlignment(Qt.AlignCenter)
         layout.addWidget(image_label)
 
@@ -0,0 +1,261 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from urllib.parse import parse_qs, unquote, urlsplit
+from catalogue import FAVOURITES, SEARCH_FIELDS
+
+# Local HTTP/JSON API over a CatalogueIndex, for overlays and bots that
+# need item lookups while the game runs:
+#
+#   GET  /search?q=pistol[&catalogue=Weapons][&field=Item Name][&limit=50]
+#   GET  /items/002BF65B
+#   GET  /items?codes=002BF65B,0000000F
+#   POST /items                        {"codes": ["002BF65B", ...]}
+#   GET  /catalogues
+#   GET  /catalogues/Weapons[?offset=0&limit=100]
+#   GET  /health
+#
+# Connections are kept alive (HTTP/1.1). GET responses are cached as
+# encoded bytes until the index generation changes.
+
+DEFAULT_PORT = 8765
+
+log = logging.getLogger(__name__)
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ApiServer:
+    def __init__(self, index, host="127.0.0.1", port=DEFAULT_PORT, cache_size=2048, max_body=1024 * 1024):
+        self.index = index
+        self.host = host
+        self.port = port
+        self.cache_size = cache_size
+        self.max_body = max_body
+        self.cache = OrderedDict()
+        self.cache_generation = None
+        self.loop = None
+        self.server = None
+        self.thread = None
+        self.error = None
+        self._started = threading.Event()
+
+    # Embedding: start() runs the server on its own event loop in a daemon
+    # thread; stop() shuts it down from any thread.
+    def start(self):
+        # Loaded here, on the caller's thread, so request handling only reads.
+        self.index.load_all()
+        self.index.lookup("")
+        self.thread = threading.Thread(target=self._run, name="ApiServer", daemon=True)
+        self.thread.start()
+        self._started.wait(5.0)
+        if self.error is not None:
+            raise self.error
+        return self.port
+
+    def stop(self):
+        if self.loop is not None and self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+        if self.thread is not None:
+            self.thread.join(5.0)
+            self.thread = None
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.server = self.loop.run_until_complete(asyncio.start_server(self.handle, self.host, self.port))
+            self.port = self.server.sockets[0].getsockname()[1]
+        except OSError as e:
+            # Typically the port is taken; start() re-raises this.
+            self.error = e
+            self.loop.close()
+            self.loop = None
+            self._started.set()
+            return
+        self._started.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            self.server.close()
+            self.loop.run_until_complete(self.server.wait_closed())
+            self.loop.close()
+
+    async def serve_forever(self):
+        self.server = await asyncio.start_server(self.handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, version = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length") or 0)
+                if length > self.max_body:
+                    writer.write(self.encode_response(413, {"error": "request body too large"}, False))
+                    break
+                body = await reader.readexactly(length) if length else b""
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+                writer.write(self.respond(method, target, body, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        except Exception:
+            # A bug hit by one request is answered and logged rather than
+            # dropping the connection without a response.
+            log.exception("Error handling API request")
+            writer.write(self.encode_response(500, {"error": "internal server error"}, False))
+        finally:
+            writer.close()
+
+    def respond(self, method, target, body, keep_alive):
+        # The GUI thread changes the index while requests are served; holding
+        # its lock until the response is encoded means a response never mixes
+        # two versions of a record, and is cached under the generation it was
+        # built from.
+        with self.index.lock:
+            if method == "GET":
+                if self.cache_generation != self.index.generation:
+                    self.cache.clear()
+                    self.cache_generation = self.index.generation
+                key = (target, keep_alive)
+                response = self.cache.get(key)
+                if response is not None:
+                    self.cache.move_to_end(key)
+                    return response
+            try:
+                status, payload = 200, self.route(method, target, body)
+            except ApiError as e:
+                status, payload = e.status, {"error": str(e)}
+            response = self.encode_response(status, payload, keep_alive)
+            if method == "GET" and status == 200:
+                self.cache[key] = response
+                if len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+            return response
+
+    @staticmethod
+    def encode_response(status, payload, keep_alive):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            "Access-Control-Allow-Origin: *\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        return head.encode("latin-1") + body
+
+    def route(self, method, target, body):
+        url = urlsplit(target)
+        parts = [unquote(part) for part in url.path.strip("/").split("/", 1) if part]
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        fields = parse_qs(url.query).get("field")
+        resource = parts[0] if parts else ""
+        if method == "POST" and parts == ["items"]:
+            try:
+                codes = json.loads(body or b"{}")["codes"]
+            except (ValueError, KeyError, TypeError):
+                raise ApiError(400, 'expected {"codes": [...]}')
+            return self.batch_lookup(codes)
+        if method != "GET":
+            raise ApiError(405, f"{method} not supported")
+        if resource == "search" and len(parts) == 1:
+            return self.search(query.get("q", ""), query.get("catalogue"), fields, self.int_param(query, "limit", 0))
+        if resource == "items" and len(parts) == 2:
+            entry = self.index.lookup(parts[1]) or self.index.lookup(parts[1].upper())
+            if entry is None:
+                raise ApiError(404, f"no item with code {parts[1]}")
+            return dict(entry[1], Catalogue=entry[0])
+        if resource == "items" and len(parts) == 1:
+            return self.batch_lookup([code for code in query.get("codes", "").split(",") if code])
+        if resource == "catalogues" and len(parts) == 1:
+            return {"catalogues": [{"name": catalogue.name, "count": len(catalogue.records)} for catalogue in self.index.load_all()]}
+        if resource == "catalogues" and len(parts) == 2:
+            catalogue = self.catalogue(parts[1])
+            offset = self.int_param(query, "offset", 0)
+            limit = self.int_param(query, "limit", 0)
+            records = catalogue.records[offset:offset + limit] if limit else catalogue.records[offset:]
+            return {"name": catalogue.name, "count": len(catalogue.records), "offset": offset, "items": records}
+        if resource == "health" and len(parts) == 1:
+            return {"status": "ok", "generation": self.index.generation}
+        raise ApiError(404, f"unknown endpoint {url.path}")
+
+    def catalogue(self, name):
+        if name not in self.index.file_map or name == FAVOURITES:
+            raise ApiError(404, f"unknown catalogue {name}")
+        return self.index.get(name)
+
+    def search(self, term, catalogue_name, fields, limit):
+        if fields and not set(fields) <= set(SEARCH_FIELDS):
+            raise ApiError(400, f"field must be one of {', '.join(SEARCH_FIELDS)}")
+        catalogues = [self.catalogue(catalogue_name)] if catalogue_name else self.index.load_all()
+        results = []
+        for catalogue in catalogues:
+            results.extend(dict(record, Catalogue=catalogue.name) for record in catalogue.search(term, tuple(fields or SEARCH_FIELDS)))
+            if limit and len(results) >= limit:
+                del results[limit:]
+                break
+        return {"count": len(results), "results": results}
+
+    def batch_lookup(self, codes):
+        if not isinstance(codes, list) or not all(isinstance(code, str) for code in codes):
+            raise ApiError(400, "codes must be a list of strings")
+        items = {}
+        for code in codes:
+            entry = self.index.lookup(code) or self.index.lookup(code.upper())
+            items[code] = dict(entry[1], Catalogue=entry[0]) if entry else None
+        return {"items": items}
+
+    @staticmethod
+    def int_param(query, name, default):
+        try:
+            return max(int(query.get(name, default)), 0)
+        except ValueError:
+            raise ApiError(400, f"{name} must be an integer")
+
+
+def main(argv=None):
+    from iddb_cli import catalogue_index
+
+    parser = argparse.ArgumentParser(description="Serve the Starfield IDDB catalogues as a local JSON API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--dir", default=os.path.dirname(os.path.abspath(__file__)))
+    args = parser.parse_args(argv)
+    server = ApiServer(catalogue_index(args.dir), args.host, args.port)
+    server.index.load_all()
+    print(f"Serving on http://{args.host}:{args.port}/")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,116 @@
+import os
+import time
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QIcon, QImage, QImageReader, QPixmap
+from instrumentation import metrics
+
+# Icons and pixmaps from images/, decoded once per process and shared.
+# Names are matched case-insensitively ("starfield.png" finds
+# Starfield.png), as they are on Windows. Scaled variants of large images
+# are cached on disk in images/.thumbnails, so those are only decoded at
+# full size when the thumbnail is missing or older than the image; small
+# images decode faster than a thumbnail can be read back.
+
+ASSET_DIR = "images"
+THUMBNAIL_DIR = os.path.join(ASSET_DIR, ".thumbnails")
+THUMBNAIL_MIN_BYTES = 256 * 1024
+
+
+class AssetCache:
+    def __init__(self, directory=ASSET_DIR, thumbnail_dir=THUMBNAIL_DIR):
+        self.directory = directory
+        self.thumbnail_dir = thumbnail_dir
+        self.icons = {}
+        self.pixmaps = {}
+        self.stats = {"hits": 0, "misses": 0, "decode_seconds": 0.0, "thumbnails_written": 0}
+        self._names = None
+
+    def path(self, name):
+        exact = os.path.join(self.directory, name)
+        if os.path.exists(exact):
+            return exact
+        if self._names is None:
+            try:
+                self._names = {entry.lower(): entry for entry in os.listdir(self.directory)}
+            except OSError:
+                self._names = {}
+        return os.path.join(self.directory, self._names.get(name.lower(), name))
+
+    def icon(self, name):
+        # QIcon only decodes a file when it is first painted, and then at
+        # the size it is painted at, so one shared instance per name is all
+        # that is needed.
+        icon = self.icons.get(name)
+        if icon is None:
+            self.stats["misses"] += 1
+            icon = self.icons[name] = QIcon(self.path(name))
+        else:
+            self.stats["hits"] += 1
+        return icon
+
+    def pixmap(self, name, size=None):
+        # size (a QSize) gives a variant scaled to fit it, keeping the
+        # aspect ratio; None gives the image at full size.
+        key = (name, None if size is None else (size.width(), size.height()))
+        pixmap = self.pixmaps.get(key)
+        if pixmap is not None:
+            self.stats["hits"] += 1
+            return pixmap
+        self.stats["misses"] += 1
+        start = time.perf_counter()
+        with metrics.timer("assets.decode"):
+            image = self.load_image(self.path(name), size)
+        self.stats["decode_seconds"] += time.perf_counter() - start
+        pixmap = self.pixmaps[key] = QPixmap.fromImage(image)
+        return pixmap
+
+    def load_image(self, path, size):
+        if size is None:
+            return QImage(path)
+        thumbnail = os.path.join(self.thumbnail_dir, f"{os.path.basename(path)}-{size.width()}x{size.height()}.png")
+        try:
+            large = os.path.getsize(path) >= THUMBNAIL_MIN_BYTES
+        except OSError:
+            large = False
+        try:
+            fresh = large and os.path.getmtime(thumbnail) >= os.path.getmtime(path)
+        except OSError:
+            fresh = False
+        if fresh:
+            image = QImage(thumbnail)
+            if not image.isNull():
+                return image
+        reader = QImageReader(path)
+        scaled_size = reader.size()
+        if scaled_size.isValid() and (scaled_size.width() > size.width() or scaled_size.height() > size.height()):
+            # Decoders that support it (JPEG) decode straight at this size;
+            # QImageReader scales the others smoothly after decoding.
+            scaled_size.scale(size, Qt.KeepAspectRatio)
+            reader.setScaledSize(scaled_size)
+        image = reader.read()
+        if image.isNull() or not large:
+            return image
+        try:
+            os.makedirs(self.thumbnail_dir, exist_ok=True)
+            if image.save(thumbnail):
+                self.stats["thumbnails_written"] += 1
+        except OSError:
+            # Read-only install: the variant just isn't kept between runs.
+            pass
+        return image
+
+    def report(self):
+        return (f"{len(self.icons)} icons, {len(self.pixmaps)} pixmaps, {self.stats['hits']} cache hits, "
+                f"{self.stats['misses']} misses, {self.stats['decode_seconds'] * 1000:.1f} ms decoding")
+
+
+assets = AssetCache()
+metrics.gauge("assets_cached", lambda: len(assets.icons) + len(assets.pixmaps))
+
+
+def icon(name):
+    return assets.icon(name)
+
+
+def pixmap(name, size=None):
+    return assets.pixmap(name, size)
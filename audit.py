@@ -0,0 +1,279 @@
+import atexit
+import gzip
+import json
+import os
+import queue
+import re
+import shutil
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+
+_STOP = object()
+
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    action TEXT NOT NULL,
+    code TEXT,
+    catalogue TEXT,
+    entry TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_code_ts ON entries (code, ts);
+CREATE INDEX IF NOT EXISTS entries_action_ts ON entries (action, ts);
+CREATE INDEX IF NOT EXISTS entries_ts ON entries (ts);
+"""
+
+# "2024-08-08 12:00:00.123456: edit - {...}" lines written by the old logger.
+LEGACY_LINE = re.compile(r"^(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d(?:\.\d+)?): (\w+) - (\{.*\})$")
+
+
+class AuditIndex:
+    # SQLite sidecar next to the JSON Lines log, indexed by Item Code, action
+    # and time, so history lookups don't scan the log. It is only written by
+    # the AuditLog writer thread; each thread gets its own connection.
+    def __init__(self, filename="audit_log.sqlite"):
+        self.filename = filename
+        self._local = threading.local()
+
+    def connect(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.filename)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(INDEX_SCHEMA)
+            self._local.connection = connection
+        return connection
+
+    def close(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def add(self, rows):
+        # rows are (ts, action, code, catalogue, entry_json) tuples.
+        connection = self.connect()
+        with connection:
+            connection.executemany("INSERT INTO entries (ts, action, code, catalogue, entry) VALUES (?, ?, ?, ?, ?)", rows)
+
+    def is_empty(self):
+        return self.connect().execute("SELECT 1 FROM entries LIMIT 1").fetchone() is None
+
+    def query(self, code=None, action=None, since=None, until=None, limit=200):
+        # since/until are datetimes or epoch seconds; newest entries first.
+        clauses, params = [], []
+        if code is not None:
+            clauses.append("code = ?")
+            params.append(code)
+        if action is not None:
+            clauses.append("action = ?")
+            params.append(action)
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(since.timestamp() if isinstance(since, datetime) else since)
+        if until is not None:
+            clauses.append("ts < ?")
+            params.append(until.timestamp() if isinstance(until, datetime) else until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(limit)
+        rows = self.connect().execute(f"SELECT entry FROM entries {where} ORDER BY ts DESC, id DESC LIMIT ?", params)
+        return [json.loads(row[0]) for row in rows]
+
+    def rebuild(self, log_filename, backup_count=5, legacy_filename="audit_log.txt"):
+        # Backfills the index from the rotated, current and pre-JSON logs.
+        sources = [f"{log_filename}.{index}.gz" for index in range(backup_count, 0, -1)]
+        sources += [log_filename, legacy_filename]
+        rows = []
+        for source in sources:
+            if not os.path.exists(source):
+                continue
+            opener = gzip.open if source.endswith(".gz") else open
+            with opener(source, "rt") as f:
+                for line in f:
+                    row = self.parse_line(line.rstrip("\n"))
+                    if row:
+                        rows.append(row)
+                    if len(rows) >= 10000:
+                        self.add(rows)
+                        rows = []
+        if rows:
+            self.add(rows)
+
+    @staticmethod
+    def parse_line(line):
+        try:
+            if line.startswith("{"):
+                entry = json.loads(line)
+                timestamp = datetime.fromisoformat(entry["ts"]).timestamp()
+                return timestamp, entry["action"], entry.get("code"), entry.get("catalogue"), line
+            match = LEGACY_LINE.match(line)
+            if match:
+                item = json.loads(match.group(3))
+                timestamp = datetime.fromisoformat(match.group(1))
+                entry = {
+                    "ts": timestamp.isoformat(timespec="milliseconds"),
+                    "action": match.group(2),
+                    "code": item.get("Item Code"),
+                    "catalogue": None,
+                    "item": item,
+                }
+                return timestamp.timestamp(), entry["action"], entry["code"], None, json.dumps(entry)
+        except (ValueError, KeyError, AttributeError):
+            pass
+        return None
+
+
+class AuditLog:
+    # Audit entries are queued by the caller and written by a background
+    # thread in batches, as JSON Lines:
+    #   {"ts": "...", "action": "edit", "code": "002BF65B", "catalogue": "weapons.json", "item": {...}}
+    # The GUI thread only pays for a queue put. The log is rotated once it
+    # grows past max_bytes, keeping backup_count gzip-compressed generations
+    # (audit_log.jsonl.1.gz is the newest). Every batch is also added to the
+    # AuditIndex sidecar used for history lookups.
+    def __init__(self, filename="audit_log.jsonl", index_filename="audit_log.sqlite", max_bytes=5 * 1024 * 1024, backup_count=5, flush_interval=0.5, batch_size=1000):
+        self.filename = filename
+        self.index = AuditIndex(index_filename)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.queue = queue.SimpleQueue()
+        self._thread = None
+        self._file = None
+        self._lock = threading.Lock()
+        # Failed batch writes; the writer reports them and carries on.
+        self.write_errors = 0
+        self.last_error = None
+
+    def log(self, action, item, catalogue=None, **extra):
+        self.start()
+        self.queue.put((time.time(), action, dict(item), catalogue, extra))
+
+    def flush(self, timeout=5.0):
+        # Blocks until everything queued so far has been written.
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self.queue.put(done)
+        done.wait(timeout)
+
+    def close(self):
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self.queue.put(_STOP)
+            thread.join(5.0)
+
+    def start(self):
+        # Called at application start-up, so the first-run index rebuild
+        # happens on the writer thread before anyone asks for history.
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="AuditLogWriter", daemon=True)
+                    self._thread.start()
+                    atexit.register(self.close)
+
+    def query(self, code=None, action=None, since=None, until=None, limit=200):
+        # Reads the index as it stands: entries still queued (at most
+        # flush_interval old) or a rebuild still running are not waited for.
+        try:
+            return self.index.query(code, action, since, until, limit)
+        except sqlite3.Error:
+            return []
+
+    def _run(self):
+        try:
+            if self.index.is_empty():
+                self.index.rebuild(self.filename, self.backup_count)
+        except (OSError, sqlite3.Error):
+            pass
+        stopping = False
+        while not stopping:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            # Keep collecting entries until the batch is full or the flush
+            # interval is up; a flush()/close() marker ends the batch early.
+            while len(batch) < self.batch_size and isinstance(batch[-1], tuple):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            entries = [entry for entry in batch if isinstance(entry, tuple)]
+            if entries:
+                try:
+                    self._write(entries)
+                except (OSError, ValueError) as e:
+                    # Disk full, permissions, ...: this batch is lost, but the
+                    # thread must keep serving the queue and flush markers.
+                    self._write_failed(e, len(entries))
+            for entry in batch:
+                if entry is _STOP:
+                    stopping = True
+                elif isinstance(entry, threading.Event):
+                    entry.set()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self.index.close()
+
+    def format_entry(self, entry):
+        timestamp, action, item, catalogue, extra = entry
+        record = {
+            "ts": datetime.fromtimestamp(timestamp).isoformat(timespec="milliseconds"),
+            "action": action,
+            "code": item.get("Item Code"),
+            "catalogue": catalogue,
+            "item": item,
+        }
+        record.update(extra)
+        return json.dumps(record)
+
+    def _write(self, entries):
+        lines = [self.format_entry(entry) for entry in entries]
+        data = "".join(line + "\n" for line in lines)
+        if self._file is None:
+            self._file = open(self.filename, "a")
+        if self._file.tell() and self._file.tell() + len(data) > self.max_bytes:
+            self._rotate()
+        self._file.write(data)
+        self._file.flush()
+        try:
+            self.index.add([(entry[0], entry[1], entry[2].get("Item Code"), entry[3], line) for entry, line in zip(entries, lines)])
+        except sqlite3.Error:
+            pass
+
+    def _write_failed(self, error, count):
+        self.write_errors += 1
+        self.last_error = str(error)
+        sys.stderr.write(f"Audit log: failed to write {count} entries to {self.filename}: {error}\n")
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            # Reopened by the next batch.
+            self._file = None
+
+    def _rotate(self):
+        self._file.close()
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.filename}.{index}.gz"
+            if os.path.exists(source):
+                os.replace(source, f"{self.filename}.{index + 1}.gz")
+        if self.backup_count > 0:
+            with open(self.filename, "rb") as source, gzip.open(f"{self.filename}.1.gz", "wb") as target:
+                shutil.copyfileobj(source, target)
+        self._file = open(self.filename, "w")
+
+
+audit_log = AuditLog()
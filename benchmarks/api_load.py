@@ -0,0 +1,108 @@
+"""Load test for the local JSON API (api_server.py).
+
+Opens --connections keep-alive connections and sends --requests requests
+in total over them, cycling through a mix of lookups, searches and batch
+lookups. Reports requests per second and latency percentiles. Without
+--url an in-process server is started on a free port.
+
+    python benchmarks/api_load.py --requests 20000 --connections 16
+    python benchmarks/api_load.py --url http://127.0.0.1:8765
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from urllib.parse import quote, urlsplit
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+
+def request_mix(index):
+    records = [record for catalogue in index.load_all() for record in catalogue.records]
+    codes = [record["Item Code"] for record in records[::7] if record.get("Item Code")]
+    terms = ["pistol", "rifle", "suit", "a", "helmet", "aid", "food", "zz-no-match"]
+    paths = [f"/items/{quote(code)}" for code in codes[:200]]
+    paths += [f"/search?q={quote(term)}&limit=20" for term in terms]
+    paths += [f"/items?codes={','.join(quote(code) for code in codes[i:i + 10])}" for i in range(0, 100, 10)]
+    paths += ["/catalogues", "/catalogues/Weapons?limit=50"]
+    return paths
+
+
+async def client(host, port, paths, count, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for i in range(count):
+            path = paths[i % len(paths)]
+            started = time.perf_counter()
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode("latin-1"))
+            status_line = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            body = await reader.readexactly(length)
+            latencies.append(time.perf_counter() - started)
+            if b" 200 " not in status_line and b" 404 " not in status_line:
+                errors.append((path, status_line, body[:200]))
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, paths, total, connections):
+    latencies, errors = [], []
+    per_client = [total // connections + (1 if i < total % connections else 0) for i in range(connections)]
+    started = time.perf_counter()
+    await asyncio.gather(*(client(host, port, paths[i:] + paths[:i], count, latencies, errors) for i, count in enumerate(per_client)))
+    return time.perf_counter() - started, latencies, errors
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)] if values else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="server to test (default: start one in-process)")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--connections", type=int, default=16)
+    args = parser.parse_args()
+
+    from api_server import ApiServer
+    from iddb_cli import catalogue_index
+
+    index = catalogue_index(REPO_ROOT)
+    paths = request_mix(index)
+    server = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port
+    else:
+        server = ApiServer(index, port=0)
+        host, port = "127.0.0.1", server.start()
+
+    try:
+        elapsed, latencies, errors = asyncio.run(run_load(host, port, paths, args.requests, args.connections))
+    finally:
+        if server is not None:
+            server.stop()
+
+    print(f"{len(latencies)} requests over {args.connections} keep-alive connections in {elapsed:.2f} s")
+    print(f"  throughput   {len(latencies) / elapsed:10.0f} req/s")
+    for label, fraction in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99)):
+        print(f"  latency {label}  {percentile(latencies, fraction) * 1000:10.2f} ms")
+    if errors:
+        print(f"  {len(errors)} unexpected responses, e.g. {json.dumps(str(errors[0]))}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""Start-up and dialog image costs, before and after the asset cache.
+
+"direct" repeats what the code did before assets.py: a new QIcon per
+reference, each decoded when painted, and the full-size image decoded and
+smooth-scaled every time the About dialog opens. Both sides load the same
+files (names resolved case-insensitively), so only the caching differs,
+and Qt's own QPixmapCache is cleared before each run, as in a new process.
+The large image rows show pbenterprisenew.png.png (1.4 MB) at the About
+dialog's 100x100: cold (thumbnail written), warm (thumbnail read back by a
+new process) and from the in-process cache.
+
+    python benchmarks/asset_cache.py
+"""
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+# Every icon reference made while the main window and settings dialog are
+# built, in order; colorpicker.png is used once per colour setting.
+ICON_REFERENCES = [
+    "starfield.png", "Star.png", "Starfull.png", "new.png", "add.png", "edit.png", "open.png", "save.png",
+    "save_as.png", "print.png", "export_csv.png", "pdf.png", "export_json.png", "undo.png", "redo.png",
+    "refresh.png", "delete.png", "settings.png", "help.png", "about.png",
+] + ["colorpicker.png"] * 11
+
+
+def timed(function, repeat=20):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    from PyQt5.QtCore import QSize, Qt
+    from PyQt5.QtGui import QIcon, QPixmap, QPixmapCache
+    from PyQt5.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    os.chdir(REPO_ROOT)
+    from assets import AssetCache
+
+    resolver = AssetCache()
+    paths = [resolver.path(name) for name in ICON_REFERENCES]
+    large = "pbenterprisenew.png.png"
+
+    def direct_icons():
+        QPixmapCache.clear()
+        for path in paths:
+            QIcon(path).pixmap(24, 24)
+
+    def direct_about(name):
+        QPixmapCache.clear()
+        QPixmap(resolver.path(name)).scaled(100, 100, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+    thumbnails = tempfile.mkdtemp(prefix="iddb-thumbnails-")
+    try:
+        def cached_icons():
+            QPixmapCache.clear()
+            cache = AssetCache(thumbnail_dir=thumbnails)
+            for name in ICON_REFERENCES:
+                cache.icon(name).pixmap(24, 24)
+
+        def cold(name):
+            shutil.rmtree(thumbnails, ignore_errors=True)
+            QPixmapCache.clear()
+            AssetCache(thumbnail_dir=thumbnails).pixmap(name, QSize(100, 100))
+
+        def warm(name):
+            QPixmapCache.clear()
+            AssetCache(thumbnail_dir=thumbnails).pixmap(name, QSize(100, 100))
+
+        shared = AssetCache(thumbnail_dir=thumbnails)
+        rows = [
+            ("start-up icons, direct", timed(direct_icons)),
+            ("start-up icons, asset cache", timed(cached_icons)),
+            ("About image, direct", timed(lambda: direct_about("starfield.png"))),
+            ("About image, new process", timed(lambda: warm("starfield.png"))),
+            ("About image, in-process cache", timed(lambda: shared.pixmap("starfield.png", QSize(100, 100)))),
+            ("large image, direct", timed(lambda: direct_about(large), repeat=5)),
+            ("large image, cold thumbnail", timed(lambda: cold(large), repeat=5)),
+            ("large image, warm thumbnail", timed(lambda: warm(large))),
+            ("large image, in-process cache", timed(lambda: shared.pixmap(large, QSize(100, 100)))),
+        ]
+    finally:
+        shutil.rmtree(thumbnails, ignore_errors=True)
+
+    missing = sorted({name for name in ICON_REFERENCES if not os.path.exists(os.path.join("images", name))})
+    for label, milliseconds in rows:
+        print(f"{label:<34}{milliseconds:>9.2f} ms")
+    print(f"\nsaved at start-up: {rows[0][1] - rows[1][1]:.2f} ms; per About dialog: {rows[2][1] - rows[4][1]:.2f} ms; "
+          f"per large image view: {rows[5][1] - rows[7][1]:.2f} ms")
+    if missing:
+        print(f"only found case-insensitively: {', '.join(missing)}")
+    app.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""Import-time profile for StarfieldDB.
+
+Runs ``python -X importtime -c "import StarfieldDB"`` in a fresh interpreter
+and reports the cost of each top-level module plus the modules that are meant
+to be loaded on demand (they should not show up at all).
+
+    python benchmarks/import_profile.py --runs 5 --top 15
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFERRED_MODULES = [
+    "requests",
+    "update_service",
+    "plyer",
+    "PyQt5.QtPrintSupport",
+    "help",
+    "about",
+]
+
+
+def profile_once(module):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+
+    # -X importtime prints children before their parent, so the subtree of
+    # the profiled module is the run of deeper rows right above its own row.
+    end = next(i for i, row in enumerate(rows) if row[0] == module)
+    start = end
+    while start > 0 and rows[start - 1][3] > rows[end][3]:
+        start -= 1
+    subtree = rows[start:end + 1]
+    return {name: (self_us, cumulative_us, depth - rows[end][3]) for name, self_us, cumulative_us, depth in subtree}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="StarfieldDB")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    runs = [profile_once(args.module) for _ in range(args.runs)]
+    names = set().union(*runs)
+
+    def median(name, field):
+        return statistics.median(run[name][field] for run in runs if name in run)
+
+    total = median(args.module, 1)
+    print(f"{args.module}: {total / 1000:.1f} ms cumulative (median of {args.runs} runs)\n")
+
+    top_level = [name for name in names if any(run.get(name, (0, 0, 0))[2] == 1 for run in runs)]
+    top_level.sort(key=lambda name: median(name, 1), reverse=True)
+
+    print(f"{'module':<40}{'self ms':>10}{'cumul ms':>10}{'share':>8}")
+    for name in top_level[:args.top]:
+        cumulative = median(name, 1)
+        print(f"{name:<40}{median(name, 0) / 1000:>10.1f}{cumulative / 1000:>10.1f}{cumulative / total:>8.0%}")
+
+    print("\nDeferred modules:")
+    for name in DEFERRED_MODULES:
+        state = f"loaded ({median(name, 1) / 1000:.1f} ms)" if name in names else "not loaded"
+        print(f"  {name:<38}{state}")
+
+
+if __name__ == "__main__":
+    main()
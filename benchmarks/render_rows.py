@@ -0,0 +1,112 @@
+"""Rows-per-second benchmark for JSONViewerApp.populate_listbox.
+
+Compares the current delegate-based rendering path with the previous one,
+which created a QWidget/QLabel/QPushButton and three stylesheets per row.
+Runs headless with the offscreen Qt platform.
+
+    python benchmarks/render_rows.py --rows 1000 5000
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+os.chdir(REPO_ROOT)
+
+from PyQt5.QtWidgets import QApplication, QWidget, QHBoxLayout, QLabel, QPushButton, QTableWidgetItem
+from PyQt5.QtGui import QBrush, QColor
+from PyQt5.QtCore import Qt
+
+
+def make_items(count):
+    return [
+        {
+            "Item Code": f"{0x00100000 + i:08X}",
+            "Item Name": f"Synthetic Item {i}",
+            "Console Command": f"player.additem {0x00100000 + i:08X} 1",
+        }
+        for i in range(count)
+    ]
+
+
+def legacy_populate_listbox(viewer, data):
+    # The per-row widget path populate_listbox used before the delegate.
+    table = viewer.table
+    settings = viewer.settings
+    table.setRowCount(0)
+    for index, item in enumerate(data):
+        table.insertRow(table.rowCount())
+        table.setItem(table.rowCount() - 1, 0, QTableWidgetItem(item.get("Item Code", "")))
+        table.setItem(table.rowCount() - 1, 1, QTableWidgetItem(item.get("Item Name", "")))
+
+        cell_widget = QWidget()
+        cell_layout = QHBoxLayout()
+        cell_layout.setContentsMargins(0, 0, 0, 0)
+        cell_layout.setSpacing(10)
+
+        console_command_label = QLabel(item.get("Console Command", ""))
+        console_command_label.setStyleSheet(f"color: {settings.get('font_color', 'white')}; background: transparent; font-size: {settings.get('font_size', 14)}pt;")
+        cell_layout.addWidget(console_command_label, stretch=1)
+
+        copy_button = QPushButton('Copy')
+        copy_button.setStyleSheet(f"background: transparent; color: {settings.get('font_color', 'white')}; font-size: {settings.get('font_size', 12)}pt; border: none;")
+        copy_button.setFixedSize(50, 28)
+        copy_button.clicked.connect(lambda ch, cmd=item.get("Console Command", ""): viewer.copy_command(cmd))
+        cell_layout.addWidget(copy_button, stretch=0)
+
+        cell_widget.setLayout(cell_layout)
+        cell_widget.setStyleSheet("background: transparent;")
+        table.setCellWidget(table.rowCount() - 1, 2, cell_widget)
+
+        fav_item = QTableWidgetItem()
+        fav_item.setFlags(Qt.ItemIsEnabled | Qt.ItemIsSelectable)
+        table.setItem(table.rowCount() - 1, 3, fav_item)
+
+        table.setRowHeight(table.rowCount() - 1, settings["row_height"])
+
+        background_color = QBrush(QColor(settings.get('alternate_background_color', '#2e2e2e'))) if index % 2 == 0 else QBrush(QColor(settings.get('background_color', '#1e1e1e')))
+        for col in range(3):
+            cell = table.item(index, col)
+            if cell:
+                cell.setBackground(background_color)
+
+
+def measure(app, viewer, populate, data, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        viewer.table.setRowCount(0)
+        app.processEvents()
+        start = time.perf_counter()
+        populate(data)
+        # Include the deferred polish/layout/paint work Qt does after the call.
+        app.processEvents()
+        viewer.table.viewport().repaint()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    from StarfieldDB import JSONViewerApp
+    viewer = JSONViewerApp([])
+    app.processEvents()
+
+    print(f"{'rows':>8}{'legacy rows/s':>16}{'delegate rows/s':>18}{'speedup':>10}")
+    for count in args.rows:
+        data = make_items(count)
+        legacy = measure(app, viewer, lambda d: legacy_populate_listbox(viewer, d), data, args.repeat)
+        current = measure(app, viewer, viewer.populate_listbox, data, args.repeat)
+        print(f"{count:>8}{count / legacy:>16,.0f}{count / current:>18,.0f}{legacy / current:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
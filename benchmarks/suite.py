@@ -0,0 +1,222 @@
+"""Benchmark suite for the load, search, render, save and export paths.
+
+Runs JSONViewerApp headless (offscreen Qt platform) in a scratch directory
+against synthetic catalogues, so the shipped catalogues and settings are
+never touched. Every case is timed --repeat times and the median is kept.
+
+    python benchmarks/suite.py                         # 1k, 10k, 100k items
+    python benchmarks/suite.py --sizes 1000 1000000
+    python benchmarks/suite.py --save-baseline main    # benchmarks/baselines/main.json
+    python benchmarks/suite.py --compare main          # exit status 1 on regressions
+
+Baselines are machine-specific: compare against one recorded on the same
+machine. baselines/reference.json is the one the current numbers were
+discussed against.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+BASELINE_DIR = os.path.join(BENCH_DIR, "baselines")
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, BENCH_DIR)
+
+from synthetic import make_items, write_catalogue
+
+SEARCH_TERMS = ["pistol", "mk 1", "0001", "no such item"]
+
+
+def settle(app, viewer):
+    # Include the deferred polish/layout/paint work Qt does after a call.
+    app.processEvents()
+    viewer.table.viewport().repaint()
+
+
+def case_parse(ctx):
+    start = time.perf_counter()
+    ctx.viewer.index.load(ctx.path, reload=True)
+    return time.perf_counter() - start
+
+
+def case_load_json(ctx):
+    start = time.perf_counter()
+    ctx.viewer.load_json(ctx.path, reload=True)
+    settle(ctx.app, ctx.viewer)
+    return time.perf_counter() - start
+
+
+def case_populate_listbox(ctx):
+    ctx.viewer.table.setRowCount(0)
+    ctx.app.processEvents()
+    start = time.perf_counter()
+    ctx.viewer.populate_listbox(ctx.viewer.data)
+    settle(ctx.app, ctx.viewer)
+    return time.perf_counter() - start
+
+
+def case_perform_search(ctx):
+    # Cold: the catalogue's search text is rebuilt for the first term.
+    ctx.viewer.index.invalidate(ctx.path)
+    start = time.perf_counter()
+    for term in SEARCH_TERMS:
+        ctx.viewer.search_entry.blockSignals(True)
+        ctx.viewer.search_entry.setText(term)
+        ctx.viewer.search_entry.blockSignals(False)
+        ctx.viewer.perform_search()
+        settle(ctx.app, ctx.viewer)
+    elapsed = time.perf_counter() - start
+    ctx.viewer.search_entry.setText("")
+    ctx.viewer.search_timer.stop()
+    ctx.viewer.populate_listbox(ctx.viewer.data)
+    return elapsed
+
+
+def case_save_file(ctx):
+    start = time.perf_counter()
+    ctx.viewer.save_file()
+    return time.perf_counter() - start
+
+
+def case_export_to_csv(ctx):
+    start = time.perf_counter()
+    ctx.viewer.write_csv(os.path.join(ctx.workdir, "export.csv"))
+    return time.perf_counter() - start
+
+
+CASES = {
+    "parse": case_parse,
+    "load_json": case_load_json,
+    "populate_listbox": case_populate_listbox,
+    "perform_search": case_perform_search,
+    "save_file": case_save_file,
+    "export_to_csv": case_export_to_csv,
+}
+
+
+class Context:
+    def __init__(self, app, viewer, workdir, path):
+        self.app = app
+        self.viewer = viewer
+        self.workdir = workdir
+        self.path = path
+
+
+def run_suite(sizes, cases, repeat):
+    from PyQt5.QtWidgets import QApplication
+
+    workdir = tempfile.mkdtemp(prefix="iddb-bench-")
+    os.chdir(workdir)
+    # No update checks or startup catalogue in the scratch directory.
+    with open("settings.json", "w") as f:
+        json.dump({"check_for_updates": False, "startup_json": "Favourites"}, f)
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    from StarfieldDB import JSONViewerApp
+    viewer = JSONViewerApp([])
+    app.processEvents()
+
+    results = {}
+    for size in sizes:
+        path = os.path.join(workdir, f"synthetic_{size}.json")
+        write_catalogue(path, make_items(size))
+        ctx = Context(app, viewer, workdir, path)
+        viewer.load_json(path)
+        for name in cases:
+            # Large catalogues get fewer repeats; one 1M-row render is slow.
+            runs = max(1, repeat if size <= 100000 else min(repeat, 2))
+            if size <= 100000:
+                CASES[name](ctx)  # warm-up, not timed
+            timings = []
+            for _ in range(runs):
+                # Garbage left by the previous case would otherwise be
+                # collected inside this one.
+                gc.collect()
+                timings.append(CASES[name](ctx))
+            results[f"{name}/{size}"] = statistics.median(timings)
+            print(f"  {name:<18}{size:>9,} items {results[f'{name}/{size}'] * 1000:>11.1f} ms", flush=True)
+    viewer.close()
+    return results
+
+
+def environment():
+    from PyQt5.QtCore import QT_VERSION_STR
+
+    return {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "qt": QT_VERSION_STR,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def baseline_path(name):
+    return os.path.join(BASELINE_DIR, f"{name}.json")
+
+
+def compare(baseline, results, threshold, min_delta):
+    # Returns the number of cases slower than the baseline by more than
+    # threshold (a fraction) and by at least min_delta seconds, so timer
+    # noise on sub-millisecond cases isn't reported.
+    print(f"\n{'case':<30}{'baseline ms':>14}{'current ms':>14}{'change':>10}")
+    regressions = 0
+    for key, current in results.items():
+        before = baseline["results"].get(key)
+        if before is None:
+            print(f"{key:<30}{'-':>14}{current * 1000:>14.1f}{'new':>10}")
+            continue
+        change = (current - before) / before if before else 0.0
+        flag = ""
+        if change > threshold and current - before >= min_delta:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{key:<30}{before * 1000:>14.1f}{current * 1000:>14.1f}{change:>+10.0%}{flag}")
+    print(f"\nBaseline recorded {baseline['environment']['date']} on {baseline['environment']['platform']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save-baseline", metavar="NAME")
+    parser.add_argument("--compare", metavar="NAME")
+    parser.add_argument("--threshold", type=float, default=0.25, help="slowdown that counts as a regression (default 0.25 = 25%%)")
+    parser.add_argument("--min-delta", type=float, default=5.0, help="smallest slowdown in ms that counts as a regression (default 5)")
+    parser.add_argument("--json", metavar="FILE", help="also write the results to FILE")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(baseline_path(args.compare)) as f:
+            baseline = json.load(f)
+
+    results = run_suite(args.sizes, args.cases, args.repeat)
+    report = {"environment": environment(), "results": results}
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=4)
+    if args.save_baseline:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        with open(baseline_path(args.save_baseline), "w") as f:
+            json.dump(report, f, indent=4)
+        print(f"\nSaved baseline {baseline_path(args.save_baseline)}")
+    if baseline is not None and compare(baseline, results, args.threshold, args.min_delta / 1000):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
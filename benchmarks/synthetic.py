@@ -0,0 +1,71 @@
+"""Synthetic Starfield-style catalogues for the benchmarks.
+
+Records look like the shipped catalogues: 8-digit hex form IDs (with some
+6-digit ones, as in skills.json), manufacturer/model names with quality
+prefixes and "Mk" numbers, and player.additem console commands. Output is
+deterministic for a given count and seed.
+
+    python benchmarks/synthetic.py 100000 -o synthetic.json
+"""
+import argparse
+import json
+import random
+import sys
+
+MANUFACTURERS = [
+    "Allied Armaments", "Ballistic Solutions", "Deimos", "Ecliptic", "Hope Town", "Kore Kinetics",
+    "Laredo Firearms", "Shinigami", "Stroud-Eklund", "Taiyo", "Trident", "Va'ruun", "Xenofresh",
+]
+
+ITEM_KINDS = [
+    "Pistol", "Rifle", "Shotgun", "Carbine", "Cutter", "Magshot", "Grendel", "Breach", "Coachman",
+    "Drum Beat", "Space Suit", "Helmet", "Boost Pack", "Med Pack", "Trauma Pack", "Ration", "Aurora",
+    "Iron", "Aluminum", "Tungsten", "Helium-3", "Skill Magazine",
+]
+
+QUALITIES = ["", "", "", "Calibrated ", "Refined ", "Advanced ", "Superior ", "Rare ", "Epic ", "Legendary "]
+
+CATEGORIES = ["Physical", "Social", "Combat", "Science", "Tech"]
+
+
+def make_items(count, seed=0, categories=False):
+    rng = random.Random(seed)
+    # Unique codes drawn from the form ID range the game uses; roughly one
+    # in ten is written without leading zeros, like the skills catalogue.
+    codes = rng.sample(range(0x00010000, 0x00FFFFFF), count)
+    items = []
+    for code in codes:
+        item_code = f"{code:06X}" if rng.random() < 0.1 else f"{code:08X}"
+        name = f"{rng.choice(QUALITIES)}{rng.choice(MANUFACTURERS)} {rng.choice(ITEM_KINDS)}"
+        if rng.random() < 0.3:
+            name += f" Mk {rng.randint(1, 12)}"
+        item = {"Item Code": item_code, "Item Name": name}
+        if categories:
+            item["Category"] = rng.choice(CATEGORIES)
+        item["Console Command"] = f"player.additem {item_code} 1"
+        items.append(item)
+    return items
+
+
+def write_catalogue(path, items):
+    # Same layout as the shipped catalogue files.
+    with open(path, "w") as f:
+        json.dump(items, f, indent=4)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("count", type=int)
+    parser.add_argument("-o", "--output", help="file to write (default: standard output)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--categories", action="store_true", help="add a Category field, like skills.json")
+    args = parser.parse_args()
+    items = make_items(args.count, args.seed, args.categories)
+    if args.output:
+        write_catalogue(args.output, items)
+    else:
+        json.dump(items, sys.stdout, indent=4)
+
+
+if __name__ == "__main__":
+    main()
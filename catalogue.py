@@ -0,0 +1,335 @@
+import json
+import locale
+import os
+import re
+import threading
+from functools import lru_cache
+from instrumentation import metrics
+
+# Catalogue data helpers shared by the GUI and anything else that reads the
+# item JSON files. Nothing in here may import Qt.
+
+FAVOURITES = "Favourites"
+
+FILE_MAP = {
+    "Favourites": "Favourites.json",
+    "Popular Items": "PopularItems.json",
+    "Weapons": "weapons.json",
+    "Ammo": "ammo.json",
+    "Space Suits": "spacesuits.json",
+    "Helmets": "helmets.json",
+    "Boost Packs": "Boostpacks.json",
+    "Aid": "aid.json",
+    "Food": "food.json",
+    "Skill Books": "book.json",
+    "Skills": "skills.json",
+    "Traits": "traits.json",
+    "Materials/Resources": "materials.json",
+    "Clothing": "clothing.json"
+}
+
+SORT_COLUMNS = ["Item Code", "Item Name", "Category"]
+
+SEARCH_FIELDS = ("Item Code", "Item Name", "Console Command")
+
+REQUIRED_FIELDS = ("Item Code", "Item Name", "Console Command")
+
+_DIGITS = re.compile(r"(\d+)")
+
+
+# Sort keys are cached per field value, so re-sorting or re-filtering the
+# same catalogue never recomputes them and edited items simply get new keys.
+# The caches are bounded, so sorting large files over a long session
+# doesn't keep a key for every value ever seen.
+SORT_KEY_CACHE_SIZE = 1 << 16
+
+
+@lru_cache(maxsize=SORT_KEY_CACHE_SIZE)
+def hex_key(code):
+    # Item Codes are hex form IDs of varying width ("2C59DF", "002BF65B"),
+    # so they are ordered numerically; malformed codes sort after valid ones.
+    try:
+        return (0, int(code, 16), "")
+    except ValueError:
+        return (1, 0, locale.strxfrm(code.casefold()))
+
+
+@lru_cache(maxsize=SORT_KEY_CACHE_SIZE)
+def natural_key(text):
+    # "Mark 2" < "Mark 10", compared case-insensitively in locale order.
+    parts = _DIGITS.split(text.casefold())
+    return tuple((0, int(part), "") if part.isdecimal() else (1, 0, locale.strxfrm(part)) for part in parts if part)
+
+
+def sort_key(column, category_of=None):
+    if column == "Item Code":
+        return lambda item: hex_key(item.get("Item Code", ""))
+    if column == "Item Name":
+        return lambda item: natural_key(item.get("Item Name", ""))
+    if column == "Category":
+        # Some catalogues (skills) carry their own Category field; everything
+        # else belongs to the catalogue it was loaded from.
+        category_of = category_of or (lambda item: "")
+        return lambda item: natural_key(item.get("Category") or category_of(item))
+    raise ValueError(f"Cannot sort by {column!r}")
+
+
+def sort_records(records, order, category_of=None):
+    # order is a list of (column, descending) pairs, most significant first.
+    # Python's sort is stable (also with reverse=True), so sorting by each
+    # column from least to most significant gives a stable multi-column sort.
+    result = list(records)
+    for column, descending in reversed(order):
+        result.sort(key=sort_key(column, category_of), reverse=descending)
+    return result
+
+
+def search_text(record, fields=SEARCH_FIELDS):
+    # Fields are joined with a character that can't appear in a search box
+    # entry, so a term never matches across two fields.
+    return "\0".join(str(record.get(field, "")) for field in fields).lower()
+
+
+def search_records(records, term, fields=SEARCH_FIELDS):
+    term = term.lower()
+    if not term:
+        return list(records)
+    return [record for record in records if term in search_text(record, fields)]
+
+
+def validate_records(records):
+    # Yields (position, Item Code, problem) for every malformed record.
+    seen = {}
+    for position, record in enumerate(records):
+        if not isinstance(record, dict):
+            yield position, None, "not an object"
+            continue
+        code = record.get("Item Code")
+        for field in REQUIRED_FIELDS:
+            if not isinstance(record.get(field), str) or not record.get(field).strip():
+                yield position, code, f"missing {field}"
+        if isinstance(code, str) and code:
+            try:
+                int(code, 16)
+            except ValueError:
+                yield position, code, "Item Code is not hexadecimal"
+            if code in seen:
+                yield position, code, f"duplicate of record {seen[code]}"
+            else:
+                seen[code] = position
+
+
+def read_json_list(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError:
+            return []
+    return data if isinstance(data, list) else []
+
+
+def read_records(path):
+    # The item records of a catalogue file; anything in the list that is
+    # not an object (see validate_records) is skipped.
+    return [record for record in read_json_list(path) if isinstance(record, dict)]
+
+
+class Catalogue:
+    def __init__(self, name, path, records):
+        self.name = name
+        self.path = path
+        self.records = records
+        self._by_code = None
+        self._search_texts = {}
+        # Goes up whenever the records change, so views can tell whether
+        # what they show is still current.
+        self.revision = 0
+
+    @property
+    def by_code(self):
+        if self._by_code is None:
+            with metrics.timer("index"):
+                self._by_code = {}
+                for record in self.records:
+                    self._by_code.setdefault(record.get("Item Code", ""), record)
+        return self._by_code
+
+    def search(self, term, fields=SEARCH_FIELDS):
+        # The lower-cased text of every record is built once per field set
+        # and kept until the catalogue changes, so each keystroke is one
+        # substring test per record.
+        term = term.lower()
+        if not term:
+            return list(self.records)
+        texts = self.search_texts(fields)
+        return [record for record, text in zip(self.records, texts) if term in text]
+
+    def search_texts(self, fields=SEARCH_FIELDS):
+        texts = self._search_texts.get(fields)
+        if texts is None:
+            with metrics.timer("index.search"):
+                texts = self._search_texts[fields] = [search_text(record, fields) for record in self.records]
+        return texts
+
+    def prime(self):
+        # Builds the lazy lookups up front, e.g. on a preloading thread
+        # before the catalogue is handed to the GUI.
+        self.by_code
+        self.search_texts()
+        return self
+
+    def invalidate(self):
+        self._by_code = None
+        self._search_texts = {}
+        self.revision += 1
+
+
+class CatalogueIndex:
+    # Parses each catalogue file once and keeps its records in memory, so
+    # every view of a catalogue shares the same list, and maps Item Codes
+    # to (catalogue name, record) across all built-in catalogues.
+    # generation goes up whenever any catalogue changes, so results derived
+    # from the index can be cached against it. Every change is made holding
+    # lock, including the GUI's edits to the record lists it shares with the
+    # index, which call invalidate() before letting go of it; readers on
+    # other threads (api_server) take it too, so they never see a record
+    # half-way through a change or pair it with stale search text.
+    def __init__(self, file_map=FILE_MAP):
+        self.file_map = dict(file_map)
+        self.catalogues = {}
+        self.generation = 0
+        self._codes = None
+        self.lock = threading.RLock()
+
+    def name_for(self, path):
+        for name, mapped_path in self.file_map.items():
+            if mapped_path == path:
+                return name
+        return os.path.splitext(os.path.basename(path))[0]
+
+    def load(self, path, reload=False):
+        with self.lock:
+            if reload or path not in self.catalogues:
+                with metrics.timer("parse"):
+                    records = read_records(path)
+                self.catalogues[path] = Catalogue(self.name_for(path), path, records)
+                self.generation += 1
+                if self._codes is not None and self.catalogues[path].name in self.builtin_names():
+                    self._reindex(self.catalogues[path], set())
+            return self.catalogues[path]
+
+    def get(self, name, reload=False):
+        return self.load(self.file_map[name], reload)
+
+    def builtin_names(self):
+        return [name for name in self.file_map if name != FAVOURITES]
+
+    def load_all(self):
+        return [self.get(name) for name in self.builtin_names()]
+
+    def adopt(self, catalogue):
+        # Publishes a catalogue parsed elsewhere (see catalogue_preloader).
+        # If the path was loaded in the meantime, that catalogue is kept,
+        # since views may already share its records.
+        with self.lock:
+            if catalogue.path in self.catalogues:
+                return False
+            self.catalogues[catalogue.path] = catalogue
+            self.generation += 1
+            if self._codes is not None and catalogue.name in self.builtin_names():
+                self._reindex(catalogue, set())
+            return True
+
+    def invalidate(self, path=None):
+        with self.lock:
+            if path in self.catalogues:
+                self.catalogues[path].invalidate()
+            self.generation += 1
+            self._codes = None
+
+    def replace(self, path, records):
+        # Swaps in new records for one catalogue. The list is updated in
+        # place, so views sharing it see the change, and only this
+        # catalogue's codes are re-indexed.
+        with self.lock:
+            catalogue = self.load(path)
+            old_codes = set(catalogue.by_code)
+            catalogue.records[:] = records
+            catalogue.invalidate()
+            self.generation += 1
+            if self._codes is not None and catalogue.name in self.builtin_names():
+                self._reindex(catalogue, old_codes)
+            return catalogue
+
+    def merge(self, path, records):
+        # Applies a new version of a catalogue by Item Code. Unchanged records
+        # are kept and changed ones are updated in place, so rows and views
+        # holding them stay valid. Returns (inserted, updated, deleted).
+        with self.lock:
+            catalogue = self.load(path)
+            old_by_code = catalogue.by_code
+            merged, inserted, updated = [], [], []
+            kept = set()
+            for record in records:
+                old = old_by_code.get(record.get("Item Code", ""))
+                if old is None or id(old) in kept:
+                    old = record
+                    inserted.append(record)
+                elif old != record:
+                    old.clear()
+                    old.update(record)
+                    updated.append(old)
+                kept.add(id(old))
+                merged.append(old)
+            deleted = [record for record in catalogue.records if id(record) not in kept]
+            if updated:
+                catalogue.invalidate()
+                self.generation += 1
+            # Updated records changed in place; only a different set or order
+            # of records needs the list swapped and the codes re-indexed.
+            if inserted or deleted or any(new is not old for new, old in zip(merged, catalogue.records)):
+                old_codes = set(old_by_code)
+                catalogue.records[:] = merged
+                catalogue.invalidate()
+                self.generation += 1
+                if self._codes is not None and catalogue.name in self.builtin_names():
+                    self._reindex(catalogue, old_codes)
+            return inserted, updated, deleted
+
+    def _reindex(self, catalogue, old_codes):
+        order = self.builtin_names()
+        rank = order.index(catalogue.name)
+        for code in old_codes - set(catalogue.by_code):
+            if self._codes.get(code, (None,))[0] == catalogue.name:
+                del self._codes[code]
+                # Another catalogue may also list the code.
+                for name in order:
+                    other = self.catalogues.get(self.file_map[name])
+                    if other is not None and code in other.by_code:
+                        self._codes[code] = (name, other.by_code[code])
+                        break
+        for code, record in catalogue.by_code.items():
+            owner = self._codes.get(code)
+            if owner is None or order.index(owner[0]) >= rank:
+                self._codes[code] = (catalogue.name, record)
+
+    def lookup(self, code):
+        # Only searches the catalogues loaded so far; this runs on the GUI
+        # thread, where parsing the rest could take seconds. Catalogues
+        # loaded (or preloaded) later are added as they arrive. Callers that
+        # need every catalogue call load_all() first.
+        with self.lock:
+            if self._codes is None:
+                with metrics.timer("index.codes"):
+                    codes = {}
+                    # Reversed so the first catalogue in file_map wins for duplicates.
+                    for name in reversed(self.builtin_names()):
+                        catalogue = self.catalogues.get(self.file_map[name])
+                        if catalogue is None:
+                            continue
+                        for item_code, record in catalogue.by_code.items():
+                            codes[item_code] = (catalogue.name, record)
+                    self._codes = codes
+            return self._codes.get(code)
@@ -0,0 +1,218 @@
+import json
+import os
+import re
+from instrumentation import metrics
+
+# Compares two versions of a catalogue by Item Code and merges chosen
+# differences. Both files are parsed as a stream of records, so neither is
+# held as raw text, and the comparison is a hash join: the base is keyed by
+# Item Code once, then every record of the other file is one dict probe.
+# Nothing in here may import Qt.
+
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
+KINDS = (ADDED, REMOVED, CHANGED)
+
+CHUNK_SIZE = 1024 * 1024
+_WHITESPACE = re.compile(r"[ \t\r\n]*")
+_NUMBER = re.compile(r"[-+0-9.eE]*")
+
+
+def iter_json_array(f, chunk_size=CHUNK_SIZE):
+    # Yields the elements of a top-level JSON array read from a text file
+    # in chunks; only the element being decoded is kept as text. Accepts
+    # exactly what json.load would: one comma between elements and nothing
+    # but whitespace after the closing bracket.
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+    # "open": before "["; "first": after "["; "value": after ",";
+    # "separator": after an element; "closed": after "]".
+    expect = "open"
+    while True:
+        position = _WHITESPACE.match(buffer, position).end()
+        if position == len(buffer):
+            if eof:
+                break
+            buffer = f.read(chunk_size)
+            position = 0
+            eof = not buffer
+            continue
+        char = buffer[position]
+        if expect == "open":
+            if char != "[":
+                raise ValueError("not a JSON list")
+            position += 1
+            expect = "first"
+        elif expect == "closed":
+            raise ValueError("extra data after the list")
+        elif char == "]" and expect in ("first", "separator"):
+            position += 1
+            expect = "closed"
+        elif expect == "separator":
+            if char != ",":
+                raise ValueError(f"expected ',' or ']' at {char!r}")
+            position += 1
+            expect = "value"
+        else:
+            try:
+                if not eof and _NUMBER.match(buffer, position).end() == len(buffer):
+                    # A number cut off by the chunk boundary ("-1." of
+                    # "-1.5") would still decode, as the wrong value.
+                    raise json.JSONDecodeError("truncated", buffer, position)
+                value, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # The element runs past the buffer; read more and retry.
+                chunk = f.read(chunk_size)
+                buffer = buffer[position:] + chunk
+                position = 0
+                eof = not chunk
+                continue
+            yield value
+            position = end
+            expect = "separator"
+    if expect != "closed":
+        raise ValueError("unexpected end of file")
+
+
+def iter_records(path):
+    with open(path, "r", encoding="utf-8") as f:
+        for record in iter_json_array(f):
+            if isinstance(record, dict):
+                yield record
+
+
+class DiffEntry:
+    __slots__ = ("kind", "code", "old", "new", "fields")
+
+    def __init__(self, kind, code, old=None, new=None, fields=()):
+        self.kind = kind
+        self.code = code
+        self.old = old
+        self.new = new
+        self.fields = fields
+
+    @property
+    def record(self):
+        return self.new if self.new is not None else self.old
+
+    def as_dict(self):
+        entry = {"change": self.kind, "Item Code": self.code}
+        if self.old is not None:
+            entry["old"] = self.old
+        if self.new is not None:
+            entry["new"] = self.new
+        if self.fields:
+            entry["fields"] = list(self.fields)
+        return entry
+
+
+class CatalogueDiff:
+    def __init__(self, base_path, other_path):
+        self.base_path = base_path
+        self.other_path = other_path
+        self.entries = []
+        self.unchanged = 0
+        # Codes listed more than once in a file; the last record wins.
+        self.duplicates = {base_path: [], other_path: []}
+
+    def counts(self):
+        counts = dict.fromkeys(KINDS, 0)
+        for entry in self.entries:
+            counts[entry.kind] += 1
+        counts["unchanged"] = self.unchanged
+        return counts
+
+    def filtered(self, kinds=KINDS, text=""):
+        text = text.lower()
+        for entry in self.entries:
+            if entry.kind not in kinds:
+                continue
+            if text and text not in entry.code.lower() and text not in str(entry.record.get("Item Name", "")).lower():
+                continue
+            yield entry
+
+
+def changed_fields(old, new):
+    return tuple(field for field in dict.fromkeys([*old, *new]) if old.get(field) != new.get(field))
+
+
+def keyed(records, duplicates):
+    by_code = {}
+    for record in records:
+        code = record.get("Item Code", "")
+        if code in by_code:
+            duplicates.append(code)
+        by_code[code] = record
+    return by_code
+
+
+def diff_records(base_records, other_records, base_path="base", other_path="other"):
+    # base_records and other_records may be any iterables; the base is
+    # consumed into a dict, the other is streamed. Entries come out in
+    # other's order, then the removed ones in base order.
+    diff = CatalogueDiff(base_path, other_path)
+    base = keyed(base_records, diff.duplicates[base_path])
+    # Code -> its DiffEntry, or None while it is unchanged.
+    seen = {}
+    for record in other_records:
+        code = record.get("Item Code", "")
+        if code in seen:
+            diff.duplicates[other_path].append(code)
+            if seen[code] is None:
+                diff.unchanged -= 1
+        old = base.get(code)
+        if old is None:
+            seen[code] = DiffEntry(ADDED, code, new=record)
+        elif old != record:
+            seen[code] = DiffEntry(CHANGED, code, old=old, new=record, fields=changed_fields(old, record))
+        else:
+            seen[code] = None
+            diff.unchanged += 1
+    diff.entries = [entry for entry in seen.values() if entry is not None]
+    diff.entries.extend(DiffEntry(REMOVED, code, old=record) for code, record in base.items() if code not in seen)
+    return diff
+
+
+def diff_catalogues(base_path, other_path, base_records=None):
+    # base_records, when given, are the base's records as already held in
+    # memory (the GUI's view of base_path), used instead of re-reading it.
+    with metrics.timer("diff"):
+        base = iter_records(base_path) if base_records is None else base_records
+        return diff_records(base, iter_records(other_path), base_path, other_path)
+
+
+def merge_records(base_records, entries):
+    # Applies the chosen entries to the base records in one pass: changed
+    # records are replaced where they stand, removed ones dropped and added
+    # ones appended in the order given.
+    replacements = {entry.code: entry.new for entry in entries if entry.kind == CHANGED}
+    removed = {entry.code for entry in entries if entry.kind == REMOVED}
+    merged = []
+    for record in base_records:
+        code = record.get("Item Code", "")
+        if code in removed:
+            continue
+        merged.append(replacements.get(code, record))
+    merged.extend(entry.new for entry in entries if entry.kind == ADDED)
+    return merged
+
+
+def write_catalogue(path, records):
+    # One write of the whole file, via a temporary file, so readers (and
+    # the catalogue watcher) never see it half-written.
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(records, f, indent=4, ensure_ascii=False)
+    os.replace(temp_path, path)
+
+
+def merge_catalogue(diff, entries, output=None):
+    with metrics.timer("diff.merge"):
+        merged = merge_records(iter_records(diff.base_path), entries)
+        write_catalogue(output or diff.base_path, merged)
+    return merged
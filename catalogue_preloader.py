@@ -0,0 +1,120 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from PyQt5.QtCore import QObject, pyqtSignal
+from catalogue import Catalogue, read_records
+from instrumentation import metrics
+
+# Parsed catalogues take several times their file size in memory (dicts and
+# str objects per field), which is what the memory budget is checked against.
+MEMORY_FACTOR = 8
+
+# Files above this size are parsed in a worker process so a huge catalogue
+# doesn't hold the GIL the GUI thread needs. Below it, process start-up and
+# pickling the records back cost more than parsing on a thread.
+PROCESS_THRESHOLD = 16 * 1024 * 1024
+
+
+def estimate_memory(size):
+    return size * MEMORY_FACTOR
+
+
+class CataloguePreloader(QObject):
+    # Parses and indexes the built-in catalogues that aren't loaded yet on a
+    # thread pool, largest files on a process pool, and hands each one to
+    # the CatalogueIndex on the GUI thread as soon as it is ready. Catalogues
+    # that don't fit in memory_budget (bytes) or fail to parse stay lazily
+    # loaded, and are counted as skipped.
+    loaded = pyqtSignal(str, object)
+    finished = pyqtSignal(int, int)
+
+    def __init__(self, index, memory_budget, max_workers=4, parent=None):
+        super().__init__(parent)
+        self.index = index
+        self.memory_budget = memory_budget
+        self.max_workers = max_workers
+        self.threads = None
+        self.processes = None
+        self.pending = 0
+        self.published = 0
+        self.skipped = 0
+        self._cancelled = threading.Event()
+        self._process_lock = threading.Lock()
+        self.loaded.connect(self.publish)
+
+    def plan(self):
+        # Smallest first, so the budget covers as many catalogues as it can.
+        candidates = []
+        for name in self.index.builtin_names():
+            path = self.index.file_map[name]
+            if path in self.index.catalogues:
+                continue
+            try:
+                candidates.append((os.path.getsize(path), path))
+            except OSError:
+                continue
+        planned, used = [], 0
+        for size, path in sorted(candidates):
+            if used + estimate_memory(size) > self.memory_budget:
+                self.skipped += 1
+                continue
+            used += estimate_memory(size)
+            planned.append((path, size))
+        return planned
+
+    def start(self):
+        planned = self.plan()
+        self.pending = len(planned)
+        if not planned:
+            self.finished.emit(0, self.skipped)
+            return
+        self.threads = ThreadPoolExecutor(self.max_workers, thread_name_prefix="CataloguePreloader")
+        for path, size in planned:
+            self.threads.submit(self.preload, path, size)
+
+    def stop(self):
+        self._cancelled.set()
+        for executor in (self.threads, self.processes):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def preload(self, path, size):
+        # Runs on a pool thread; the index itself is only touched in publish().
+        # Whatever happens, publish() hears about the path (None if it could
+        # not be parsed), or finished would never be emitted.
+        catalogue = None
+        try:
+            if not self._cancelled.is_set():
+                with metrics.timer("preload"):
+                    records = self.parse(path, size)
+                    catalogue = Catalogue(self.index.name_for(path), path, records).prime()
+        except (OSError, ValueError):
+            catalogue = None
+        finally:
+            if not self._cancelled.is_set():
+                self.loaded.emit(path, catalogue)
+
+    def parse(self, path, size):
+        if size > PROCESS_THRESHOLD:
+            with self._process_lock:
+                if self.processes is None:
+                    self.processes = ProcessPoolExecutor(max_workers=min(self.max_workers, os.cpu_count() or 1))
+            try:
+                return self.processes.submit(read_records, path).result()
+            except BrokenProcessPool:
+                pass
+        return read_records(path)
+
+    def publish(self, path, catalogue):
+        try:
+            if catalogue is None:
+                # Not parsed; it is loaded on demand instead.
+                self.skipped += 1
+            elif self.index.adopt(catalogue):
+                self.published += 1
+        finally:
+            self.pending -= 1
+            if self.pending == 0:
+                self.stop()
+                self.finished.emit(self.published, self.skipped)
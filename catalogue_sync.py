@@ -0,0 +1,227 @@
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from catalogue import FAVOURITES, FILE_MAP, CatalogueIndex, read_records
+
+# Delta catalogue updates. The release host publishes catalogue_manifest.json
+# next to the catalogue files:
+#
+#   {"generated": "...",
+#    "catalogues": {"weapons.json": {"sha256": "...", "count": 79,
+#                                    "url": "weapons.json",
+#                                    "deltas": {"<old sha256>": "deltas/weapons.json/<old>.json"}}}}
+#
+# Hashes are taken over canonical JSON (sorted keys, no whitespace), so
+# re-indenting a file does not count as a change. A delta holds the rows
+# to upsert and the Item Codes to delete to get from an old hash to the
+# current one; when there is no delta for the local hash (or applying it
+# does not reproduce the published hash) the whole catalogue is downloaded.
+# Favourites are user data and are never synced.
+
+CATALOGUE_BASE_URL = "https://raw.githubusercontent.com/skillerious/Starfield-IDDB/main/"
+MANIFEST_NAME = "catalogue_manifest.json"
+DELTA_DIR = "deltas"
+
+
+class SyncError(Exception):
+    pass
+
+
+def canonical_json(records):
+    return json.dumps(records, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def content_hash(records):
+    return hashlib.sha256(canonical_json(records)).hexdigest()
+
+
+def make_delta(old_records, new_records):
+    # Returns None when the new catalogue can't be reached by upserting and
+    # deleting rows by Item Code (duplicate codes, reordered rows).
+    old_by_code = {record.get("Item Code"): record for record in old_records}
+    new_by_code = {record.get("Item Code"): record for record in new_records}
+    if len(old_by_code) != len(old_records) or len(new_by_code) != len(new_records):
+        return None
+    delta = {
+        "from": content_hash(old_records),
+        "to": content_hash(new_records),
+        "upsert": [record for code, record in new_by_code.items() if old_by_code.get(code) != record],
+        "delete": [code for code in old_by_code if code not in new_by_code],
+    }
+    if apply_delta(old_records, delta) != new_records:
+        return None
+    return delta
+
+
+def apply_delta(records, delta):
+    # Updated rows keep their position, new rows are appended.
+    upserts = {record.get("Item Code"): record for record in delta["upsert"]}
+    deleted = set(delta["delete"])
+    result = []
+    for record in records:
+        code = record.get("Item Code")
+        if code in deleted:
+            continue
+        result.append(upserts.pop(code, record))
+    result.extend(upserts.values())
+    return result
+
+
+class CatalogueUpdate:
+    def __init__(self, name, path, records, sha256, via_delta, data=None):
+        self.name = name
+        self.path = path
+        self.records = records
+        self.sha256 = sha256
+        self.via_delta = via_delta
+        # Raw bytes of a full download, written as-is to keep the upstream
+        # formatting; delta results are re-serialised.
+        self.data = data
+
+
+class CatalogueSync:
+    # fetch() runs on a worker thread and only downloads; apply() writes the
+    # fetched catalogues atomically and swaps them into the index, so only
+    # the catalogues that changed are re-indexed.
+    def __init__(self, index, base_url=CATALOGUE_BASE_URL, session=None, max_workers=4, timeout=(10, 30)):
+        self.index = index
+        self.base_url = base_url if base_url.endswith("/") else base_url + "/"
+        self.session = session
+        self.max_workers = max_workers
+        self.timeout = timeout
+
+    def get(self, relative_url):
+        if self.session is None:
+            from update_service import get_session
+            self.session = get_session()
+        response = self.session.get(self.base_url + relative_url, timeout=self.timeout)
+        response.raise_for_status()
+        return response
+
+    def fetch_manifest(self):
+        try:
+            manifest = self.get(MANIFEST_NAME).json()
+            return manifest["catalogues"]
+        except (ValueError, KeyError, TypeError) as e:
+            raise SyncError(f"Invalid catalogue manifest: {e}")
+
+    def fetch(self):
+        # Returns a CatalogueUpdate for every catalogue whose content hash
+        # differs from the published one.
+        published = self.fetch_manifest()
+        pending = []
+        for name in self.index.builtin_names():
+            path = self.index.file_map[name]
+            entry = published.get(os.path.basename(path))
+            if not entry:
+                continue
+            records = self.index.load(path).records
+            local_hash = content_hash(records)
+            if local_hash != entry["sha256"]:
+                pending.append((name, path, list(records), local_hash, entry))
+        if not pending:
+            return []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(lambda args: self.fetch_catalogue(*args), pending))
+
+    def fetch_catalogue(self, name, path, records, local_hash, entry):
+        delta_url = entry.get("deltas", {}).get(local_hash)
+        if delta_url:
+            try:
+                updated = apply_delta(records, self.get(delta_url).json())
+                if content_hash(updated) == entry["sha256"]:
+                    return CatalogueUpdate(name, path, updated, entry["sha256"], True)
+            except (ValueError, KeyError, TypeError):
+                pass
+        data = self.get(entry.get("url", os.path.basename(path))).content
+        try:
+            updated = json.loads(data)
+        except ValueError as e:
+            raise SyncError(f"{name}: invalid JSON ({e})")
+        if content_hash(updated) != entry["sha256"]:
+            raise SyncError(f"{name}: checksum mismatch")
+        return CatalogueUpdate(name, path, updated, entry["sha256"], False, data)
+
+    def apply(self, updates):
+        # Every file is written to a temporary first, so a failed write
+        # leaves all catalogues untouched; the renames happen last.
+        temp_paths = []
+        try:
+            for update in updates:
+                temp_path = f"{update.path}.sync"
+                with open(temp_path, "wb") as f:
+                    if update.data is not None:
+                        f.write(update.data)
+                    else:
+                        f.write(json.dumps(update.records, indent=4, ensure_ascii=False).encode("utf-8"))
+                temp_paths.append(temp_path)
+        except OSError:
+            for temp_path in temp_paths:
+                os.remove(temp_path)
+            raise
+        for update, temp_path in zip(updates, temp_paths):
+            os.replace(temp_path, update.path)
+            self.index.replace(update.path, update.records)
+
+
+def build_manifest(file_map=FILE_MAP, previous_dir=None, output=MANIFEST_NAME):
+    # Release step: hashes the local catalogues and, given the catalogue
+    # folder of an earlier release, writes deltas from it.
+    catalogues = {}
+    for name, path in file_map.items():
+        if name == FAVOURITES or not os.path.exists(path):
+            continue
+        records = read_records(path)
+        file_name = os.path.basename(path)
+        entry = {"sha256": content_hash(records), "count": len(records), "url": file_name, "deltas": {}}
+        old_path = os.path.join(previous_dir, file_name) if previous_dir else None
+        if old_path and os.path.exists(old_path):
+            delta = make_delta(read_records(old_path), records)
+            if delta and delta["from"] != delta["to"]:
+                delta_path = f"{DELTA_DIR}/{file_name}/{delta['from']}.json"
+                os.makedirs(os.path.dirname(delta_path), exist_ok=True)
+                with open(delta_path, "w", encoding="utf-8") as f:
+                    json.dump(delta, f, indent=4, ensure_ascii=False)
+                entry["deltas"][delta["from"]] = delta_path
+        catalogues[file_name] = entry
+    manifest = {"generated": datetime.now().isoformat(timespec="seconds"), "catalogues": catalogues}
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=4)
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or apply catalogue delta updates.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help=f"write {MANIFEST_NAME} for the local catalogues")
+    build.add_argument("--previous", help="catalogue folder of the previous release, to generate deltas from")
+    build.add_argument("--output", default=MANIFEST_NAME)
+    sync = commands.add_parser("sync", help="download and apply changed catalogues")
+    sync.add_argument("--base-url", default=CATALOGUE_BASE_URL)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        manifest = build_manifest(previous_dir=args.previous, output=args.output)
+        print(f"Wrote {args.output} ({len(manifest['catalogues'])} catalogues)")
+        return 0
+    import requests
+
+    catalogue_sync = CatalogueSync(CatalogueIndex(FILE_MAP), args.base_url)
+    try:
+        updates = catalogue_sync.fetch()
+        catalogue_sync.apply(updates)
+    except (requests.RequestException, SyncError, OSError) as e:
+        print(f"Catalogue sync failed: {e}")
+        return 1
+    for update in updates:
+        print(f"{update.name}: {len(update.records)} items ({'delta' if update.via_delta else 'full download'})")
+    if not updates:
+        print("All catalogues are up to date.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,96 @@
+import json
+import os
+from PyQt5.QtCore import QFileSystemWatcher, QObject, QTimer, pyqtSignal
+
+
+def file_signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class CatalogueWatcher(QObject):
+    # Notices catalogue files edited outside the app (another tool, a second
+    # instance) and merges the new content into the CatalogueIndex by Item
+    # Code. Bursts of writes are handled once they have settled for delay
+    # ms. The app records its own writes with remember(), so they are not
+    # read back.
+    changed = pyqtSignal(str, object, object, object)
+
+    def __init__(self, index, delay=300, retries=5, parent=None):
+        super().__init__(parent)
+        self.index = index
+        self.retries = retries
+        self.paths = {}
+        self.signatures = {}
+        self.attempts = {}
+        self.pending = set()
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self.on_file_changed)
+        # Editors and CatalogueSync save by replacing the file, which drops
+        # it from the file watch; the directory watch catches those.
+        self.watcher.directoryChanged.connect(self.on_directory_changed)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay)
+        self.timer.timeout.connect(self.process)
+
+    def watch(self, path):
+        full_path = os.path.abspath(path)
+        if full_path in self.paths or not os.path.exists(full_path):
+            return
+        self.paths[full_path] = path
+        self.signatures[full_path] = file_signature(full_path)
+        self.watcher.addPath(full_path)
+        directory = os.path.dirname(full_path)
+        if directory not in self.watcher.directories():
+            self.watcher.addPath(directory)
+
+    def remember(self, path):
+        full_path = os.path.abspath(path)
+        if full_path in self.paths:
+            self.signatures[full_path] = file_signature(full_path)
+
+    def on_file_changed(self, full_path):
+        self.pending.add(full_path)
+        self.timer.start()
+
+    def on_directory_changed(self, directory):
+        for full_path in self.paths:
+            if os.path.dirname(full_path) == directory and file_signature(full_path) != self.signatures[full_path]:
+                self.pending.add(full_path)
+        if self.pending:
+            self.timer.start()
+
+    def process(self):
+        pending, self.pending = self.pending, set()
+        for full_path in pending:
+            signature = file_signature(full_path)
+            if signature is None:
+                # Deleted, or half-way through being replaced.
+                continue
+            if full_path not in self.watcher.files():
+                self.watcher.addPath(full_path)
+            if signature == self.signatures[full_path]:
+                continue
+            try:
+                with open(full_path, "r", encoding="utf-8") as f:
+                    records = json.load(f)
+            except (OSError, ValueError):
+                # Most likely caught mid-write; try again shortly.
+                self.attempts[full_path] = self.attempts.get(full_path, 0) + 1
+                if self.attempts[full_path] <= self.retries:
+                    self.pending.add(full_path)
+                    self.timer.start()
+                continue
+            self.attempts.pop(full_path, None)
+            self.signatures[full_path] = signature
+            path = self.paths[full_path]
+            if not isinstance(records, list) or path not in self.index.catalogues:
+                continue
+            records = [record for record in records if isinstance(record, dict)]
+            inserted, updated, deleted = self.index.merge(path, records)
+            if inserted or updated or deleted:
+                self.changed.emit(path, inserted, updated, deleted)
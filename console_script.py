@@ -0,0 +1,42 @@
+ADD_ITEM = "player.additem"
+
+
+def command_for(record, quantity=1):
+    # Sets the count of "player.additem <code> <n>" commands, and adds one
+    # to "player.additem <code>"; anything else (perks, spells, malformed
+    # entries) is passed through.
+    command = (record.get("Console Command") or "").strip()
+    if not command:
+        code = record.get("Item Code", "")
+        return f"{ADD_ITEM} {code} {quantity}" if code else ""
+    parts = command.split()
+    if parts[0].lower() != ADD_ITEM:
+        return command
+    if len(parts) == 2 or (len(parts) == 3 and parts[2].isdigit()):
+        return f"{parts[0]} {parts[1]} {quantity}"
+    return command
+
+
+def iter_commands(records, quantity=1, quantities=None):
+    # Streams one command per record; quantities maps Item Code -> count and
+    # overrides the default quantity for those items.
+    for record in records:
+        if quantities:
+            command = command_for(record, quantities.get(record.get("Item Code", ""), quantity))
+        else:
+            command = command_for(record, quantity)
+        if command:
+            yield command
+
+
+def build_script(records, quantity=1, quantities=None):
+    return "\n".join(iter_commands(records, quantity, quantities))
+
+
+def write_script(path, records, quantity=1, quantities=None):
+    # Starfield runs these with "bat <name>" from the game folder. The whole
+    # script is built in memory and written with a single write call.
+    script = build_script(records, quantity, quantities)
+    with open(path, "w") as f:
+        f.write(script + "\n" if script else "")
+    return script.count("\n") + 1 if script else 0
@@ -0,0 +1,106 @@
+import time
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QFontDatabase
+from PyQt5.QtWidgets import (
+    QApplication, QCheckBox, QComboBox, QDockWidget, QFileDialog, QHBoxLayout, QLabel, QPushButton, QVBoxLayout, QWidget
+)
+from assets import assets
+from instrumentation import metrics
+from profiling import MODES, profiler
+
+
+def format_bytes(value):
+    if value is None:
+        return "n/a"
+    for unit in ("B", "KB", "MB", "GB"):
+        if value < 1024 or unit == "GB":
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+
+
+class DebugPanel(QDockWidget):
+    # Shows the instrumentation timers, counters and gauges while debug mode
+    # is on. The text is only rebuilt while the panel is visible.
+    def __init__(self, viewer, interval=1000):
+        super().__init__("Debug", viewer)
+        self.setObjectName("debugPanel")
+        self.viewer = viewer
+        metrics.gauge("widgets_alive", lambda: len(QApplication.allWidgets()))
+        metrics.gauge("table_rows", lambda: viewer.table.rowCount())
+        metrics.gauge("catalogues_loaded", lambda: len(viewer.index.catalogues))
+        metrics.gauge("index_generation", lambda: viewer.index.generation)
+
+        contents = QWidget()
+        layout = QVBoxLayout(contents)
+        self.stats_label = QLabel()
+        self.stats_label.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        self.stats_label.setAlignment(Qt.AlignTop | Qt.AlignLeft)
+        self.stats_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        layout.addWidget(self.stats_label, stretch=1)
+        buttons = QHBoxLayout()
+        save_button = QPushButton("Save Trace...")
+        save_button.clicked.connect(self.save_trace)
+        buttons.addWidget(save_button)
+        reset_button = QPushButton("Reset")
+        reset_button.clicked.connect(self.reset)
+        buttons.addWidget(reset_button)
+        layout.addLayout(buttons)
+        profiling = QHBoxLayout()
+        self.profile_checkbox = QCheckBox("Profile operations")
+        self.profile_checkbox.setChecked(profiler.enabled)
+        self.profile_checkbox.toggled.connect(self.apply_profiling)
+        profiling.addWidget(self.profile_checkbox)
+        self.profile_mode_combo = QComboBox()
+        self.profile_mode_combo.addItems(MODES)
+        self.profile_mode_combo.setCurrentText(profiler.mode or MODES[0])
+        self.profile_mode_combo.currentTextChanged.connect(self.apply_profiling)
+        profiling.addWidget(self.profile_mode_combo)
+        layout.addLayout(profiling)
+        self.setWidget(contents)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        self.refresh()
+        self.timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        snapshot = metrics.snapshot()
+        lines = [f"{'timer':<16}{'n':>6}{'last ms':>10}{'mean ms':>10}{'max ms':>10}"]
+        for name, stats in sorted(snapshot["timers"].items()):
+            lines.append(f"{name:<16}{stats['count']:>6}{stats['last_ms']:>10.1f}{stats['mean_ms']:>10.1f}{stats['max_ms']:>10.1f}")
+        lines.append("")
+        for name, value in sorted(snapshot["counters"].items()):
+            lines.append(f"{name:<26}{value:>16,}")
+        for name, value in sorted(snapshot["gauges"].items()):
+            shown = format_bytes(value) if name.endswith("_bytes") else ("n/a" if value is None else f"{value:,}")
+            lines.append(f"{name:<26}{shown:>16}")
+        lines += ["", f"assets: {assets.report()}"]
+        if profiler.last_written:
+            lines += ["", "last profile:"] + profiler.last_written
+        self.stats_label.setText("\n".join(lines))
+
+    def apply_profiling(self):
+        # Profiles go to the directory the app was started in unless
+        # IDDB_PROFILE_DIR says otherwise.
+        profiler.configure(self.profile_mode_combo.currentText() if self.profile_checkbox.isChecked() else None)
+        if profiler.enabled:
+            self.viewer.status_bar.showMessage(f"Profiling operations ({profiler.mode}) into {profiler.output_dir}")
+
+    def reset(self):
+        metrics.reset()
+        self.refresh()
+
+    def save_trace(self):
+        default_name = time.strftime("iddb-trace-%Y%m%d-%H%M%S.json")
+        file_path, _ = QFileDialog.getSaveFileName(self, "Save Trace", default_name, "Trace Files (*.json);;All Files (*)")
+        if file_path:
+            count = metrics.dump(file_path)
+            self.viewer.status_bar.showMessage(f"Saved {count} trace events to {file_path} - open it in chrome://tracing or ui.perfetto.dev")
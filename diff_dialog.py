@@ -0,0 +1,217 @@
+import json
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt, QThread, QTimer, pyqtSignal
+from PyQt5.QtWidgets import (
+    QAbstractItemView, QCheckBox, QDialog, QHBoxLayout, QHeaderView, QLabel, QLineEdit, QPushButton, QSplitter,
+    QTableView, QTextEdit, QVBoxLayout
+)
+from catalogue_diff import ADDED, CHANGED, KINDS, diff_catalogues
+
+# Compare Catalogues: lists what another version of the current catalogue
+# adds, removes or changes, and lets the user pick which of those to merge.
+# The comparison runs on a worker thread; the table is a model over the
+# diff entries, so only the rows on screen are ever turned into text.
+
+# Taken by default: merging them never loses a local record.
+DEFAULT_ACCEPTED = (ADDED, CHANGED)
+
+
+class CatalogueDiffThread(QThread):
+    compared = pyqtSignal(object, str)
+
+    def __init__(self, base_path, other_path, base_records=None, parent=None):
+        super().__init__(parent)
+        self.base_path = base_path
+        self.other_path = other_path
+        self.base_records = base_records
+
+    def run(self):
+        try:
+            diff = diff_catalogues(self.base_path, self.other_path, self.base_records)
+        except (OSError, ValueError) as e:
+            self.compared.emit(None, str(e))
+            return
+        self.compared.emit(diff, "")
+
+
+class DiffModel(QAbstractTableModel):
+    HEADERS = ["Merge", "Change", "Item Code", "Item Name", "Changed Fields"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.entries = []
+        # Item Codes to merge; kept across filtering.
+        self.accepted = set()
+
+    def set_entries(self, entries):
+        self.beginResetModel()
+        self.entries = entries
+        self.endResetModel()
+
+    def set_accepted(self, codes, accepted):
+        if accepted:
+            self.accepted.update(codes)
+        else:
+            self.accepted.difference_update(codes)
+        if self.entries:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.entries) - 1, 0), [Qt.CheckStateRole])
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.entries)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def flags(self, index):
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() == 0:
+            flags |= Qt.ItemIsUserCheckable
+        return flags
+
+    def data(self, index, role=Qt.DisplayRole):
+        entry = self.entries[index.row()]
+        column = index.column()
+        if role == Qt.CheckStateRole and column == 0:
+            return Qt.Checked if entry.code in self.accepted else Qt.Unchecked
+        if role != Qt.DisplayRole:
+            return None
+        if column == 1:
+            return entry.kind.capitalize()
+        if column == 2:
+            return entry.code
+        if column == 3:
+            return str(entry.record.get("Item Name", ""))
+        if column == 4:
+            return ", ".join(entry.fields)
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.CheckStateRole or index.column() != 0:
+            return False
+        self.set_accepted([self.entries[index.row()].code], value == Qt.Checked)
+        return True
+
+
+class CatalogueDiffDialog(QDialog):
+    # base_records are the records the merge will be applied to; they are
+    # what is compared, rather than base_path as it is on disk.
+    def __init__(self, base_path, other_path, base_records=None, parent=None):
+        super().__init__(parent)
+        self.base_path = base_path
+        self.other_path = other_path
+        self.base_records = base_records
+        self.diff = None
+        self.setWindowTitle("Compare Catalogues")
+        self.resize(900, 600)
+
+        layout = QVBoxLayout(self)
+        self.summary_label = QLabel(f"Comparing {base_path} with {other_path}...")
+        self.summary_label.setWordWrap(True)
+        layout.addWidget(self.summary_label)
+
+        filters = QHBoxLayout()
+        self.kind_checkboxes = {}
+        for kind in KINDS:
+            checkbox = QCheckBox(kind.capitalize())
+            checkbox.setChecked(True)
+            checkbox.toggled.connect(self.apply_filter)
+            filters.addWidget(checkbox)
+            self.kind_checkboxes[kind] = checkbox
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter by Item Code or Item Name")
+        filters.addWidget(self.filter_edit, stretch=1)
+        layout.addLayout(filters)
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.timeout.connect(self.apply_filter)
+        self.filter_edit.textChanged.connect(lambda text: self.filter_timer.start(300))
+
+        splitter = QSplitter(Qt.Vertical)
+        self.model = DiffModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.verticalHeader().setVisible(False)
+        self.table.verticalHeader().setDefaultSectionSize(22)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.Interactive)
+        header.setStretchLastSection(True)
+        header.resizeSection(0, 60)
+        header.resizeSection(3, 300)
+        self.table.selectionModel().currentRowChanged.connect(self.show_entry)
+        splitter.addWidget(self.table)
+        self.detail_view = QTextEdit()
+        self.detail_view.setReadOnly(True)
+        splitter.addWidget(self.detail_view)
+        splitter.setSizes([420, 140])
+        layout.addWidget(splitter, stretch=1)
+
+        buttons = QHBoxLayout()
+        select_all_button = QPushButton("Select All Visible")
+        select_all_button.clicked.connect(lambda: self.model.set_accepted([entry.code for entry in self.model.entries], True))
+        buttons.addWidget(select_all_button)
+        select_none_button = QPushButton("Select None")
+        select_none_button.clicked.connect(lambda: self.model.set_accepted(list(self.model.accepted), False))
+        buttons.addWidget(select_none_button)
+        buttons.addStretch(1)
+        self.apply_button = QPushButton("Apply Merge")
+        self.apply_button.setEnabled(False)
+        self.apply_button.clicked.connect(self.accept)
+        buttons.addWidget(self.apply_button)
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.reject)
+        buttons.addWidget(close_button)
+        layout.addLayout(buttons)
+
+        # Parented to the main window so a comparison still running when
+        # the dialog closes is not destroyed under the thread.
+        self.diff_thread = CatalogueDiffThread(base_path, other_path, base_records, parent or self)
+        self.diff_thread.compared.connect(self.on_compared)
+        self.diff_thread.finished.connect(self.diff_thread.deleteLater)
+        self.diff_thread.start()
+
+    def on_compared(self, diff, error):
+        if error:
+            self.summary_label.setText(f"Failed to compare {self.base_path} with {self.other_path}: {error}")
+            return
+        self.diff = diff
+        counts = diff.counts()
+        summary = ", ".join(f"{count} {kind}" for kind, count in counts.items())
+        duplicates = sum(len(codes) for codes in diff.duplicates.values())
+        if duplicates:
+            summary += f" ({duplicates} duplicate Item Codes; the last of each was used)"
+        self.summary_label.setText(f"{self.other_path} against {self.base_path}: {summary}")
+        self.model.accepted = {entry.code for entry in diff.entries if entry.kind in DEFAULT_ACCEPTED}
+        self.apply_button.setEnabled(bool(diff.entries))
+        self.apply_filter()
+
+    def apply_filter(self):
+        if self.diff is None:
+            return
+        kinds = {kind for kind, checkbox in self.kind_checkboxes.items() if checkbox.isChecked()}
+        self.model.set_entries(list(self.diff.filtered(kinds, self.filter_edit.text().strip())))
+        self.detail_view.clear()
+
+    def show_entry(self, current, previous):
+        if not current.isValid():
+            self.detail_view.clear()
+            return
+        entry = self.model.entries[current.row()]
+        if entry.kind == CHANGED:
+            lines = [f"{field}: {json.dumps(entry.old.get(field), ensure_ascii=False)} -> "
+                     f"{json.dumps(entry.new.get(field), ensure_ascii=False)}" for field in entry.fields]
+        else:
+            side = "Only in " + (self.other_path if entry.kind == ADDED else self.base_path)
+            lines = [side] + [f"{field}: {json.dumps(value, ensure_ascii=False)}" for field, value in entry.record.items()]
+        self.detail_view.setPlainText("\n".join(lines))
+
+    def accepted_entries(self):
+        # In diff order, across all filters.
+        if self.diff is None:
+            return []
+        return [entry for entry in self.diff.entries if entry.code in self.model.accepted]
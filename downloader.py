@@ -0,0 +1,123 @@
+import hashlib
+import os
+import time
+import requests
+
+
+class DownloadError(Exception):
+    pass
+
+
+def content_range_total(header):
+    # "bytes 0-99/1234" -> 1234; None when the total is "*" (unknown) or
+    # the header is missing or malformed.
+    total = (header or "").rpartition("/")[2].strip()
+    return int(total) if total.isdigit() else None
+
+
+class Downloader:
+    # Streams url into "<output>.part" in large chunks, resuming an earlier
+    # partial download with an HTTP Range request, verifies the SHA-256 of
+    # the complete file and only then renames it to output. progress is
+    # called at most every progress_interval seconds (and once at the end)
+    # with (downloaded_bytes, total_bytes, eta_seconds).
+    def __init__(self, url, output, sha256=None, chunk_size=256 * 1024, timeout=(10, 30), progress_interval=0.25, session=None):
+        self.url = url
+        self.output = output
+        self.part = f"{output}.part"
+        self.sha256 = sha256.lower() if sha256 else None
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.progress_interval = progress_interval
+        self.session = session or requests.Session()
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self, progress=None):
+        try:
+            self._download(progress)
+        except DownloadError:
+            # A corrupt .part can't be repaired by resuming it, so start over
+            # once from scratch before giving up.
+            if not os.path.exists(self.part) and not self.cancelled:
+                self._download(progress)
+            else:
+                raise
+        return self.output
+
+    def _download(self, progress):
+        offset = os.path.getsize(self.part) if os.path.exists(self.part) else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        with self.session.get(self.url, stream=True, headers=headers, timeout=self.timeout) as response:
+            if response.status_code == 416 and offset:
+                # The .part file already holds the whole file.
+                total = offset
+                hasher = self._hash_existing()
+            else:
+                response.raise_for_status()
+                if response.status_code == 206:
+                    total = content_range_total(response.headers.get("Content-Range"))
+                    if total is None:
+                        # Total unknown: what is left, if the server says.
+                        length = int(response.headers.get("content-length", 0))
+                        total = offset + length if length else 0
+                    hasher = self._hash_existing()
+                else:
+                    # The server ignored the Range header; start again.
+                    offset = 0
+                    total = int(response.headers.get("content-length", 0))
+                    hasher = hashlib.sha256()
+                self._stream(response, offset, total, hasher, progress)
+
+        if self.sha256 and hasher.hexdigest() != self.sha256:
+            os.remove(self.part)
+            raise DownloadError("Checksum mismatch: the downloaded file is corrupt.")
+        os.replace(self.part, self.output)
+
+    def _hash_existing(self):
+        hasher = hashlib.sha256()
+        with open(self.part, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                hasher.update(block)
+        return hasher
+
+    def _stream(self, response, offset, total, hasher, progress):
+        downloaded = offset
+        start_time = time.monotonic()
+        last_report = 0.0
+        with open(self.part, "ab" if offset else "wb") as f:
+            for data in response.iter_content(self.chunk_size):
+                if self.cancelled:
+                    raise DownloadError("Download cancelled.")
+                f.write(data)
+                hasher.update(data)
+                downloaded += len(data)
+                now = time.monotonic()
+                if progress and now - last_report >= self.progress_interval:
+                    last_report = now
+                    progress(downloaded, total, self._eta(downloaded - offset, max(total - downloaded, 0), now - start_time))
+        if total and downloaded < total:
+            raise requests.ConnectionError(f"Connection closed after {downloaded} of {total} bytes.")
+        if progress:
+            progress(downloaded, total or downloaded, 0)
+
+    @staticmethod
+    def _eta(transferred, remaining, elapsed):
+        speed = transferred / elapsed if elapsed > 0 else 0
+        return remaining / speed if speed > 0 else 0
+
+
+def fetch_checksum(url, session=None, timeout=(10, 30)):
+    # Release assets publish "<sha256>  <filename>" next to the executable;
+    # returns None when there is no checksum file.
+    session = session or requests.Session()
+    try:
+        response = session.get(url, timeout=timeout)
+    except requests.RequestException:
+        return None
+    if response.status_code != 200:
+        return None
+    digest = response.text.split()[0] if response.text.split() else ""
+    return digest if len(digest) == 64 else None
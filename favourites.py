@@ -0,0 +1,82 @@
+import json
+import os
+from catalogue import read_json_list
+
+
+class Favourites:
+    # Favourites are a set of Item Codes, held in insertion order for O(1)
+    # membership checks. Favourites.json is still listed as a catalogue
+    # (FILE_MAP), so it stays a list of item records: each code keeps the
+    # record it was last seen with in a catalogue, and that is what is
+    # written back. Codes no catalogue knows about keep the record the file
+    # had for them, so nothing is lost.
+    def __init__(self, path="Favourites.json"):
+        self.path = path
+        self.entries = {}
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        self.entries = {}
+        for entry in read_json_list(self.path):
+            if isinstance(entry, dict) and entry.get("Item Code"):
+                self.entries[entry["Item Code"]] = entry
+            elif isinstance(entry, str):
+                # Written by versions that stored bare codes; the next save
+                # turns them back into records.
+                self.entries[entry] = None
+                self.dirty = True
+
+    def __contains__(self, code):
+        return code in self.entries
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, code, record=None):
+        if code and code not in self.entries:
+            self.entries[code] = record
+            self.dirty = True
+
+    def remove(self, code):
+        if code in self.entries:
+            del self.entries[code]
+            self.dirty = True
+
+    def toggle(self, code, record=None):
+        if code in self.entries:
+            self.remove(code)
+            return False
+        self.add(code, record)
+        return True
+
+    def update_records(self, records):
+        # Called with the catalogue records found for favourite codes. They
+        # are shared rather than copied, so later edits to them are saved
+        # too; the file only needs writing if one differs from what it has.
+        for record in records:
+            code = record.get("Item Code", "")
+            old = self.entries.get(code)
+            if code in self.entries and old is not record:
+                if old != record:
+                    self.dirty = True
+                self.entries[code] = record
+
+    def records(self):
+        return [record if record is not None else {
+            "Item Code": code,
+            "Item Name": "",
+            "Console Command": f"player.additem {code} 1"
+        } for code, record in self.entries.items()]
+
+    def save(self):
+        if not self.dirty:
+            return
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.records(), f)
+        os.replace(temp_path, self.path)
+        self.dirty = False
@@ -1,32 +1,112 @@
+import html
+import re
 import sys
-from PyQt5.QtWidgets import QApplication, QDialog, QVBoxLayout, QTabWidget, QTextEdit
-from PyQt5.QtGui import QIcon
-import qdarkstyle
+from bisect import bisect_left
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QTextCursor
+from PyQt5.QtWidgets import QApplication, QDialog, QLineEdit, QListWidget, QListWidgetItem, QTabWidget, QTextEdit, QVBoxLayout, QWidget
+from assets import icon
+
+_TAGS = re.compile(r"<[^>]+>")
+_WORDS = re.compile(r"[a-z0-9]+")
+
+
+def plain_text(markup):
+    return " ".join(html.unescape(_TAGS.sub(" ", markup)).split())
+
+
+class HelpIndex:
+    # Inverted index over the help pages: word -> pages containing it. A
+    # query matches pages containing every word, the last word as a prefix
+    # so results update while typing.
+    def __init__(self, pages):
+        self.pages = pages
+        self.texts = [plain_text(markup) for _title, markup in pages]
+        self.postings = {}
+        for number, text in enumerate(self.texts):
+            for word in _WORDS.findall(text.lower()):
+                self.postings.setdefault(word, set()).add(number)
+        self.vocabulary = sorted(self.postings)
+
+    def prefixed(self, prefix):
+        pages = set()
+        position = bisect_left(self.vocabulary, prefix)
+        while position < len(self.vocabulary) and self.vocabulary[position].startswith(prefix):
+            pages |= self.postings[self.vocabulary[position]]
+            position += 1
+        return pages
+
+    def search(self, query):
+        # Returns (page number, snippet) pairs in page order.
+        words = _WORDS.findall(query.lower())
+        if not words:
+            return []
+        pages = self.prefixed(words[-1])
+        for word in words[:-1]:
+            pages &= self.postings.get(word, set())
+        return [(number, self.snippet(number, words[0])) for number in sorted(pages)]
+
+    def snippet(self, number, word, width=60):
+        text = self.texts[number]
+        position = max(text.lower().find(word), 0)
+        start = max(position - width // 2, 0)
+        return ("..." if start else "") + text[start:start + width] + "..."
 
 
 class HelpWindow(QDialog):
+    # show_help_dialog keeps one HelpWindow and re-shows it. Pages are
+    # rendered the first time their tab is shown and the search index is
+    # built on the first search, so opening help only builds the frame.
+    PAGES = [
+        ("Overview", "get_overview_text"),
+        ("Features", "get_features_text"),
+        ("Usage", "get_usage_text"),
+        ("Shortcuts", "get_shortcuts_text"),
+        ("Settings", "get_settings_text"),
+        ("Favorites", "get_favorites_text"),
+        ("Advanced Features", "get_advanced_features_text"),
+    ]
+
+    _index = None
+
     def __init__(self, parent=None):  # Accept parent as an optional argument
         super().__init__(parent)  # Pass the parent to the superclass constructor
+        self.text_edits = {}
         self.init_ui()
 
     def init_ui(self):
         self.setWindowTitle("Help")
         self.setGeometry(100, 100, 800, 600)
-        self.setWindowIcon(QIcon('images/help.png'))
-        self.setStyleSheet(qdarkstyle.load_stylesheet_pyqt5())
+        self.setWindowIcon(icon('help.png'))
 
         layout = QVBoxLayout(self)
-        tabs = QTabWidget()
+        self.search_entry = QLineEdit()
+        self.search_entry.setPlaceholderText("Search help...")
+        self.search_entry.textChanged.connect(self.search)
+        layout.addWidget(self.search_entry)
 
-        tabs.addTab(self.create_tab(self.get_overview_text()), "Overview")
-        tabs.addTab(self.create_tab(self.get_features_text()), "Features")
-        tabs.addTab(self.create_tab(self.get_usage_text()), "Usage")
-        tabs.addTab(self.create_tab(self.get_shortcuts_text()), "Shortcuts")
-        tabs.addTab(self.create_tab(self.get_settings_text()), "Settings")
-        tabs.addTab(self.create_tab(self.get_favorites_text()), "Favorites")
-        tabs.addTab(self.create_tab(self.get_advanced_features_text()), "Advanced Features")
+        self.results_list = QListWidget()
+        self.results_list.setMaximumHeight(140)
+        self.results_list.itemActivated.connect(self.open_result)
+        self.results_list.itemClicked.connect(self.open_result)
+        self.results_list.hide()
+        layout.addWidget(self.results_list)
 
-        layout.addWidget(tabs)
+        self.tabs = QTabWidget()
+        for title, _method in self.PAGES:
+            page = QWidget()
+            QVBoxLayout(page).setContentsMargins(0, 0, 0, 0)
+            self.tabs.addTab(page, title)
+        self.tabs.currentChanged.connect(self.render_page)
+        layout.addWidget(self.tabs)
+        self.render_page(self.tabs.currentIndex())
+
+    def render_page(self, number):
+        text_edit = self.text_edits.get(number)
+        if text_edit is None and number >= 0:
+            text_edit = self.text_edits[number] = self.create_tab(getattr(self, self.PAGES[number][1])())
+            self.tabs.widget(number).layout().addWidget(text_edit)
+        return text_edit
 
     def create_tab(self, text):
         text_edit = QTextEdit()
@@ -34,6 +114,35 @@ class HelpWindow(QDialog):
         text_edit.setHtml(text)
         return text_edit
 
+    def index(self):
+        # Shared by every HelpWindow; the page text never changes at runtime.
+        if HelpWindow._index is None:
+            HelpWindow._index = HelpIndex([(title, getattr(self, method)()) for title, method in self.PAGES])
+        return HelpWindow._index
+
+    def search(self, query):
+        self.results_list.clear()
+        results = self.index().search(query) if query.strip() else []
+        for number, snippet in results:
+            item = QListWidgetItem(f"{self.PAGES[number][0]}: {snippet}")
+            item.setData(Qt.UserRole, number)
+            self.results_list.addItem(item)
+        if query.strip() and not results:
+            self.results_list.addItem("No matches")
+        self.results_list.setVisible(bool(query.strip()))
+
+    def open_result(self, item):
+        number = item.data(Qt.UserRole)
+        if number is None:
+            return
+        self.tabs.setCurrentIndex(number)
+        text_edit = self.render_page(number)
+        words = _WORDS.findall(self.search_entry.text().lower())
+        if words:
+            # Select the first occurrence of the first search word.
+            text_edit.moveCursor(QTextCursor.Start)
+            text_edit.find(words[0])
+
     def get_overview_text(self):
         return """
         <h1 style="font-size:18px;">Overview</h1>
@@ -213,7 +322,11 @@ class HelpWindow(QDialog):
 
 
 if __name__ == "__main__":
+    from settings import load_settings
+    from themes import theme_manager
+
     app = QApplication(sys.argv)
+    theme_manager.apply(load_settings())
     help_window = HelpWindow()
     help_window.show()
     sys.exit(app.exec_())
@@ -0,0 +1,216 @@
+import argparse
+import json
+import os
+import sys
+from catalogue import FAVOURITES, FILE_MAP, SEARCH_FIELDS, CatalogueIndex, read_records, validate_records
+
+# Command-line access to the catalogues without starting the GUI:
+#
+#   python iddb_cli.py search "pistol" --catalogue Weapons
+#   python iddb_cli.py get 002BF65B
+#   python iddb_cli.py export --catalogue Food --format script -o food.txt
+#   python iddb_cli.py validate
+#   python iddb_cli.py merge extra.json weapons.json
+#   python iddb_cli.py diff weapons.json "json backup/weapons.json" --kind changed
+#
+# Records are written as JSON Lines (one object per line, with the
+# catalogue name added) so results can be piped into other tools. Only the
+# Qt-free modules are imported; csv, console_script and catalogue_diff are
+# imported by the commands that need them.
+
+EXPORT_FORMATS = ["jsonl", "json", "csv", "script"]
+
+
+def catalogue_index(directory):
+    return CatalogueIndex({name: os.path.join(directory, path) for name, path in FILE_MAP.items()})
+
+
+def selected_catalogues(index, names):
+    # Favourites is in file_map but is not a catalogue of its own.
+    unknown = [name for name in names or [] if name not in index.builtin_names()]
+    if unknown:
+        raise SystemExit(f"Unknown catalogue: {', '.join(unknown)} (choose from {', '.join(index.builtin_names())})")
+    return [index.get(name) for name in names] if names else index.load_all()
+
+
+def write_records(out, rows):
+    for catalogue_name, record in rows:
+        out.write(json.dumps(dict(record, Catalogue=catalogue_name), ensure_ascii=False) + "\n")
+
+
+def run_search(args, index, out):
+    fields = tuple(args.field) if args.field else SEARCH_FIELDS
+    rows = ((catalogue.name, record) for catalogue in selected_catalogues(index, args.catalogue) for record in catalogue.search(args.term, fields))
+    if args.limit:
+        rows = (row for count, row in zip(range(args.limit), rows))
+    write_records(out, rows)
+    return 0
+
+
+def run_get(args, index, out):
+    status = 0
+    index.load_all()
+    for code in args.code:
+        entry = index.lookup(code) or index.lookup(code.upper())
+        if entry is None:
+            sys.stderr.write(f"{code}: not found\n")
+            status = 1
+            continue
+        write_records(out, [entry])
+    return status
+
+
+def run_export(args, index, out):
+    rows = [(catalogue.name, record) for catalogue in selected_catalogues(index, args.catalogue) for record in catalogue.records]
+    if args.format == "jsonl":
+        write_records(out, rows)
+    elif args.format == "json":
+        json.dump([dict(record, Catalogue=name) for name, record in rows], out, indent=4, ensure_ascii=False)
+        out.write("\n")
+    elif args.format == "csv":
+        import csv
+
+        writer = csv.writer(out)
+        writer.writerow(["Catalogue", "Item Code", "Item Name", "Console Command"])
+        for name, record in rows:
+            writer.writerow([name, record.get("Item Code", ""), record.get("Item Name", ""), record.get("Console Command", "")])
+    else:
+        from console_script import build_script
+
+        script = build_script((record for name, record in rows), args.quantity)
+        out.write(script + "\n" if script else "")
+    return 0
+
+
+def run_validate(args, index, out):
+    paths = args.file or [index.file_map[name] for name in index.builtin_names()]
+    problems = 0
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                records = json.load(f)
+        except (OSError, ValueError) as e:
+            out.write(json.dumps({"file": path, "problem": str(e)}) + "\n")
+            problems += 1
+            continue
+        if not isinstance(records, list):
+            out.write(json.dumps({"file": path, "problem": "not a JSON list"}) + "\n")
+            problems += 1
+            continue
+        for position, code, problem in validate_records(records):
+            out.write(json.dumps({"file": path, "record": position, "Item Code": code, "problem": problem}) + "\n")
+            problems += 1
+    sys.stderr.write(f"{len(paths)} file(s) checked, {problems} problem(s)\n")
+    return 1 if problems else 0
+
+
+def run_merge(args, index, out):
+    # Records from source replace target records with the same Item Code;
+    # new codes are appended. This is a diff of source against target with
+    # every addition and change accepted, written atomically.
+    from catalogue_diff import ADDED, REMOVED, diff_records, merge_records, write_catalogue
+
+    source = read_records(args.source)
+    target = read_records(args.target)
+    entries = [entry for entry in diff_records(target, source).entries if entry.kind != REMOVED]
+    target = merge_records(target, entries)
+    output = args.output or args.target
+    if not args.dry_run:
+        write_catalogue(output, target)
+    added = sum(entry.kind == ADDED for entry in entries)
+    out.write(json.dumps({"output": output, "added": added, "updated": len(entries) - added, "total": len(target), "written": not args.dry_run}) + "\n")
+    return 0
+
+
+def run_diff(args, index, out):
+    # Compares other against base by Item Code and writes one line per
+    # difference. With --accept, the accepted kinds of change are merged
+    # into base (or --write's file) in a single write.
+    from catalogue_diff import KINDS, diff_catalogues, merge_catalogue
+
+    for path in (args.base, args.other):
+        if not os.path.exists(path):
+            raise SystemExit(f"{path}: no such file")
+    try:
+        diff = diff_catalogues(args.base, args.other)
+    except ValueError as e:
+        raise SystemExit(f"Cannot compare: {e}")
+    kinds = args.kind or KINDS
+    for entry in diff.filtered(kinds):
+        out.write(json.dumps(entry.as_dict(), ensure_ascii=False) + "\n")
+    counts = diff.counts()
+    sys.stderr.write(", ".join(f"{count} {kind}" for kind, count in counts.items()) + "\n")
+    for path, codes in diff.duplicates.items():
+        if codes:
+            sys.stderr.write(f"{path}: {len(codes)} duplicate Item Code(s), last one used\n")
+    if args.accept:
+        accepted = list(diff.filtered(args.accept))
+        output = args.write or args.base
+        merged = merge_catalogue(diff, accepted, output)
+        sys.stderr.write(f"{len(accepted)} change(s) merged into {output} ({len(merged)} records)\n")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="iddb_cli", description="Query and maintain the Starfield IDDB catalogues.")
+    parser.add_argument("--dir", default=os.path.dirname(os.path.abspath(__file__)), help="folder holding the catalogue files")
+    commands = parser.add_subparsers(dest="command", required=True)
+    catalogue_names = [name for name in FILE_MAP if name != FAVOURITES]
+
+    search = commands.add_parser("search", help="find records containing a term")
+    search.add_argument("term")
+    search.add_argument("-c", "--catalogue", action="append", metavar="NAME", help=f"limit to a catalogue ({', '.join(catalogue_names)}); repeatable")
+    search.add_argument("-f", "--field", action="append", choices=SEARCH_FIELDS, help="fields to search; repeatable (default: all)")
+    search.add_argument("-n", "--limit", type=int, default=0)
+    search.set_defaults(run=run_search)
+
+    get = commands.add_parser("get", help="look up records by Item Code")
+    get.add_argument("code", nargs="+")
+    get.set_defaults(run=run_get)
+
+    export = commands.add_parser("export", help="write catalogues as JSON Lines, JSON, CSV or a console script")
+    export.add_argument("-c", "--catalogue", action="append", metavar="NAME")
+    export.add_argument("--format", choices=EXPORT_FORMATS, default="jsonl")
+    export.add_argument("-q", "--quantity", type=int, default=1, help="item count for --format script")
+    export.add_argument("-o", "--output", help="file to write (default: standard output)")
+    export.set_defaults(run=run_export)
+
+    validate = commands.add_parser("validate", help="check catalogue files for malformed records")
+    validate.add_argument("file", nargs="*", help="files to check (default: all catalogues)")
+    validate.set_defaults(run=run_validate)
+
+    merge = commands.add_parser("merge", help="merge records from one catalogue file into another by Item Code")
+    merge.add_argument("source")
+    merge.add_argument("target")
+    merge.add_argument("-o", "--output", help="write the result here instead of over target")
+    merge.add_argument("--dry-run", action="store_true")
+    merge.set_defaults(run=run_merge)
+
+    diff = commands.add_parser("diff", help="compare two versions of a catalogue by Item Code, optionally merging the changes")
+    diff.add_argument("base")
+    diff.add_argument("other")
+    diff.add_argument("-k", "--kind", action="append", choices=["added", "removed", "changed"], help="only list these changes; repeatable")
+    diff.add_argument("-a", "--accept", action="append", choices=["added", "removed", "changed"], help="merge these changes into base; repeatable")
+    diff.add_argument("-w", "--write", metavar="FILE", help="with --accept, write the merged catalogue here instead of over base")
+    diff.set_defaults(run=run_diff)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    index = catalogue_index(args.dir)
+    output = getattr(args, "output", None) if args.command == "export" else None
+    out = open(output, "w", encoding="utf-8", newline="" if args.format == "csv" else None) if output else sys.stdout
+    try:
+        return args.run(args, index, out)
+    except BrokenPipeError:
+        # The reading end (e.g. "| head") closed early.
+        sys.stderr.close()
+        return 0
+    finally:
+        if output:
+            out.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
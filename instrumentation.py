@@ -0,0 +1,177 @@
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+
+# Hot-path timers, counters and gauges for debug mode. Nothing is recorded
+# while metrics.enabled is False: timer() hands back a shared no-op context
+# and count() returns straight away, so the instrumented code pays one
+# attribute check. Qt-free, so the catalogue modules can use it too.
+
+_NO_OP = nullcontext()
+
+
+def process_memory():
+    # Resident set size in bytes, or None where it can't be read cheaply.
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, IndexError):
+            return None
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        handle = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize
+        return None
+    try:
+        import resource
+        # ru_maxrss is the peak, in bytes on macOS.
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except ImportError:
+        return None
+
+
+class TimerStats:
+    __slots__ = ("count", "total", "max", "last")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def add(self, elapsed):
+        self.count += 1
+        self.total += elapsed
+        self.last = elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "total_ms": self.total * 1000,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "max_ms": self.max * 1000,
+            "last_ms": self.last * 1000,
+        }
+
+
+class _Timer:
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.record(self.name, self.start, time.perf_counter())
+        return False
+
+
+class Metrics:
+    def __init__(self, max_events=20000):
+        self.enabled = False
+        self.timers = {}
+        self.counters = {}
+        self.gauges = {"memory_rss_bytes": process_memory}
+        # Completed timer spans, kept for dump() in Chrome trace format.
+        self.events = deque(maxlen=max_events)
+        self.origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def timer(self, name):
+        return _Timer(self, name) if self.enabled else _NO_OP
+
+    def timed(self, name):
+        # Decorator form of timer(); the check happens per call, so toggling
+        # debug mode takes effect immediately.
+        def decorator(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                with _Timer(self, name):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def record(self, name, start, end):
+        with self._lock:
+            stats = self.timers.get(name)
+            if stats is None:
+                stats = self.timers[name] = TimerStats()
+            stats.add(end - start)
+            self.events.append((name, start, end, threading.get_ident()))
+
+    def count(self, name, amount=1):
+        if self.enabled:
+            with self._lock:
+                self.counters[name] = self.counters.get(name, 0) + amount
+
+    def gauge(self, name, read):
+        # read() is only called when a snapshot is taken.
+        self.gauges[name] = read
+
+    def reset(self):
+        with self._lock:
+            self.timers.clear()
+            self.counters.clear()
+            self.events.clear()
+
+    def snapshot(self):
+        gauges = {}
+        for name, read in list(self.gauges.items()):
+            try:
+                gauges[name] = read()
+            except Exception:
+                gauges[name] = None
+        with self._lock:
+            return {
+                "timers": {name: stats.as_dict() for name, stats in self.timers.items()},
+                "counters": dict(self.counters),
+                "gauges": gauges,
+            }
+
+    def dump(self, path):
+        # Chrome trace event format, readable by chrome://tracing and
+        # Perfetto; the current snapshot goes into the metadata.
+        pid = os.getpid()
+        with self._lock:
+            events = [
+                {"name": name, "cat": "iddb", "ph": "X", "pid": pid, "tid": tid,
+                 "ts": (start - self.origin) * 1e6, "dur": (end - start) * 1e6}
+                for name, start, end, tid in self.events
+            ]
+        trace = {"traceEvents": events, "displayTimeUnit": "ms", "metadata": self.snapshot()}
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(trace, f)
+        os.replace(temp_path, path)
+        return len(events)
+
+
+metrics = Metrics()
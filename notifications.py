@@ -0,0 +1,53 @@
+import os
+import threading
+import time
+from PyQt5.QtCore import QObject, QTimer
+from assets import assets
+
+
+def send_notification(title, message, icon_path):
+    # plyer is slow to import and its backends shell out or talk to D-Bus,
+    # so this only ever runs on a worker thread.
+    try:
+        from plyer import notification
+        notification.notify(title=title, message=message, app_name='Starfield IDDB', app_icon=icon_path)
+    except Exception:
+        pass
+
+
+class CopyNotifier(QObject):
+    # Coalesces "copied to clipboard" notifications: copies made in quick
+    # succession produce a single notification, and notifications are never
+    # shown more often than once per min_interval seconds.
+    def __init__(self, settings, delay=750, min_interval=3.0, parent=None):
+        super().__init__(parent)
+        self.settings = settings
+        self.min_interval = min_interval
+        self.pending = 0
+        self.last_sent = 0.0
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay)
+        self.timer.timeout.connect(self.flush)
+        self.icon_path = os.path.abspath(assets.path('starfield.png'))
+
+    def copied(self, count=1):
+        if not self.settings.get("enable_notifications", True):
+            return
+        self.pending += count
+        self.timer.start()
+
+    def flush(self):
+        if not self.pending:
+            return
+        wait = self.min_interval - (time.monotonic() - self.last_sent)
+        if wait > 0:
+            self.timer.start(int(wait * 1000))
+            return
+        if self.pending == 1:
+            message = 'Console command copied to clipboard'
+        else:
+            message = f'{self.pending} console commands copied to clipboard'
+        self.pending = 0
+        self.last_sent = time.monotonic()
+        threading.Thread(target=send_notification, args=('Starfield IDDB', message, self.icon_path), daemon=True).start()
@@ -0,0 +1,193 @@
+import functools
+import io
+import json
+import os
+import sys
+import threading
+import time
+
+# Per-operation profiling for slow-path reports ("switching to Food is
+# slow"). Off by default; enable at runtime from the Debug panel or at
+# start-up with
+#
+#   IDDB_PROFILE=cprofile|sampling  [IDDB_PROFILE_DIR=profiles]
+#
+# Each profiled call writes its own files to the output directory:
+#   cprofile  <stamp>-<operation>.prof (pstats/snakeviz) and a .txt summary
+#   sampling  <stamp>-<operation>.collapsed.txt (flamegraph.pl, inferno)
+#             and <stamp>-<operation>.speedscope.json (speedscope.app)
+# Nested profiled operations are folded into the outermost one. While
+# profiling is off, a profiled call costs one attribute check.
+
+MODES = ("cprofile", "sampling")
+DEFAULT_DIR = "profiles"
+
+
+class StackSampler:
+    # Samples the stack of one thread from a background thread. Samples can
+    # only be taken when the profiled thread releases the GIL, so the switch
+    # interval is lowered to the sampling interval while the sampler runs.
+    def __init__(self, thread_id, interval=0.001):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = []
+        self.started = 0.0
+        self.stopped = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+        self._switch_interval = None
+
+    def start(self):
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, self.interval))
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="StackSampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.stopped = time.perf_counter()
+        sys.setswitchinterval(self._switch_interval)
+
+    def _run(self):
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            now = time.perf_counter()
+            if frame is not None:
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    if code is StackSampler.stop.__code__:
+                        # Caught the profiled thread shutting us down.
+                        stack = None
+                        break
+                    # The profiler's own wrapper frames are left out.
+                    if code.co_filename != __file__:
+                        stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                    frame = frame.f_back
+                if stack is not None:
+                    stack.reverse()
+                    self.samples.append((tuple(stack), now - last))
+            last = now
+
+    def collapsed(self):
+        # Brendan Gregg's folded format: "root;child;leaf count".
+        counts = {}
+        for stack, _weight in self.samples:
+            key = ";".join(f"{name} ({os.path.basename(filename)}:{line})" for name, filename, line in stack)
+            counts[key] = counts.get(key, 0) + 1
+        return "".join(f"{key} {count}\n" for key, count in sorted(counts.items()))
+
+    def speedscope(self, name):
+        frames, frame_ids, samples, weights = [], {}, [], []
+        for stack, weight in self.samples:
+            ids = []
+            for frame in stack:
+                if frame not in frame_ids:
+                    frame_ids[frame] = len(frames)
+                    frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+                ids.append(frame_ids[frame])
+            samples.append(ids)
+            weights.append(weight)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": self.stopped - self.started,
+                "samples": samples,
+                "weights": weights,
+            }],
+            "name": name,
+            "exporter": "Starfield IDDB",
+        }
+
+
+class Profiler:
+    def __init__(self, mode=None, output_dir=DEFAULT_DIR, interval=0.001):
+        self.mode = mode
+        self.output_dir = output_dir
+        self.interval = interval
+        self.last_written = []
+        self._active = False
+
+    @property
+    def enabled(self):
+        return self.mode is not None
+
+    def configure(self, mode, output_dir=None):
+        if mode is not None and mode not in MODES:
+            raise ValueError(f"profiling mode must be one of {', '.join(MODES)}")
+        self.mode = mode
+        if output_dir:
+            self.output_dir = output_dir
+
+    def configure_from_environment(self, environ=os.environ):
+        mode = environ.get("IDDB_PROFILE", "").strip().lower()
+        if mode in ("1", "true", "yes"):
+            mode = "cprofile"
+        self.configure(mode if mode in MODES else None, environ.get("IDDB_PROFILE_DIR"))
+
+    def profiled(self, operation):
+        def decorator(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if self.mode is None or self._active or threading.current_thread() is not threading.main_thread():
+                    return function(*args, **kwargs)
+                return self.run(operation, function, *args, **kwargs)
+            return wrapper
+        return decorator
+
+    def run(self, operation, function, *args, **kwargs):
+        mode = self.mode
+        self._active = True
+        if mode == "cprofile":
+            # Imported here so start-up doesn't pay for cProfile and pstats.
+            import cProfile
+
+            collector = cProfile.Profile()
+            collector.enable()
+        else:
+            collector = StackSampler(threading.get_ident(), self.interval)
+            collector.start()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            if mode == "cprofile":
+                collector.disable()
+            else:
+                collector.stop()
+            self._active = False
+            try:
+                self.write(operation, mode, collector)
+            except OSError:
+                # A profile that can't be written must not break the operation.
+                pass
+
+    def write(self, operation, mode, collector):
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{int(time.time() * 1000) % 1000:03d}-{operation}")
+        if mode == "cprofile":
+            import pstats
+
+            collector.dump_stats(f"{base}.prof")
+            summary = io.StringIO()
+            pstats.Stats(collector, stream=summary).sort_stats("cumulative").print_stats(40)
+            with open(f"{base}.txt", "w") as f:
+                f.write(summary.getvalue())
+            self.last_written = [f"{base}.prof", f"{base}.txt"]
+        else:
+            with open(f"{base}.collapsed.txt", "w") as f:
+                f.write(collector.collapsed())
+            with open(f"{base}.speedscope.json", "w") as f:
+                json.dump(collector.speedscope(operation), f)
+            self.last_written = [f"{base}.collapsed.txt", f"{base}.speedscope.json"]
+
+
+profiler = Profiler()
+profiler.configure_from_environment()
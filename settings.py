@@ -1,5 +1,8 @@
+import atexit
+import copy
 import json
 import os
+import threading
 
 DEFAULT_SETTINGS = {
     "theme": "dark",
@@ -16,6 +19,7 @@ DEFAULT_SETTINGS = {
     "label_color": "white",
     "font_size": 12,
     "row_height": 50,
+    "row_padding": 10,
     "show_grid": True,
     "alternate_row_colors": True,
     "shortcut_new_file": "Ctrl+N",
@@ -36,27 +40,158 @@ DEFAULT_SETTINGS = {
     "backup_on_exit": False,
     "backup_path": "",
     "backup_interval": 60,
+    "backup_frequency": 30,
+    "backup_location": "",
+    "default_export_format": "JSON",
     "check_for_updates": True,
+    "update_schedule": "Weekly",
+    "last_update_check": "",
+    "catalogue_update_url": "",
     "show_notifications": True,
+    "enable_notifications": True,
     "enable_error_logging": True,
     "debug_mode": False,
     "cache_timeout": 60,
+    "enable_api_server": False,
+    "api_server_port": 8765,
+    "preload_catalogues": True,
+    "preload_memory_mb": 256,
+    "tab_idle_minutes": 10,
     "enable_scheduled_updates": False,
     "update_interval_days": 7
 }
 
+# Constraints on top of the type of each default value. Values that are
+# out of range are clamped; anything else invalid falls back to the default.
+SETTINGS_RANGES = {
+    "font_size": (8, 24),
+    "row_height": (20, 100),
+    "row_padding": (0, 50),
+    "auto_save_interval": (1, 60),
+    "backup_interval": (1, 1440),
+    "backup_frequency": (1, 60),
+    "cache_timeout": (1, 300),
+    "update_interval_days": (1, 365),
+    "api_server_port": (1024, 65535),
+    "preload_memory_mb": (16, 4096),
+    "tab_idle_minutes": (1, 240),
+}
+
+SETTINGS_CHOICES = {
+    "theme": ("dark", "light"),
+    "default_export_format": ("CSV", "JSON", "PDF"),
+    "update_schedule": ("Daily", "Weekly", "Monthly"),
+}
+
 SETTINGS_FILE = "settings.json"
 
-def load_settings():
-    if not os.path.exists(SETTINGS_FILE):
-        return DEFAULT_SETTINGS
-    with open(SETTINGS_FILE, "r") as f:
-        try:
-            settings = json.load(f)
-        except json.JSONDecodeError:
-            settings = DEFAULT_SETTINGS
+
+def validate_setting(key, value):
+    # Returns the value to store for key: value itself when valid, clamped
+    # or replaced by the default otherwise. Unknown keys are kept as-is so
+    # settings written by newer versions survive a round trip.
+    if key not in DEFAULT_SETTINGS:
+        return value
+    default = DEFAULT_SETTINGS[key]
+    if isinstance(default, bool):
+        valid = isinstance(value, bool)
+    elif isinstance(default, int):
+        valid = isinstance(value, int) and not isinstance(value, bool)
+    else:
+        valid = isinstance(value, type(default))
+    if not valid:
+        return default
+    if key in SETTINGS_RANGES:
+        low, high = SETTINGS_RANGES[key]
+        return min(max(value, low), high)
+    if key in SETTINGS_CHOICES and value not in SETTINGS_CHOICES[key]:
+        return default
+    return value
+
+
+def merge_settings(stored):
+    # A fresh dict: defaults for missing keys, validated stored values on
+    # top. DEFAULT_SETTINGS itself is never handed out.
+    settings = copy.deepcopy(DEFAULT_SETTINGS)
+    for key, value in stored.items():
+        settings[key] = validate_setting(key, value)
     return settings
 
+
+class SettingsStore:
+    # Loads settings.json once and hands out one shared, cached dict.
+    # save() notifies subscribers with only the keys that changed and
+    # writes the file save_delay seconds after the last change (atomically,
+    # via a temporary file), so a burst of saves costs one write.
+    def __init__(self, path=SETTINGS_FILE, save_delay=0.5):
+        self.path = path
+        self.save_delay = save_delay
+        self.settings = None
+        self.saved = None
+        self.subscribers = []
+        self._lock = threading.Lock()
+        self._timer = None
+        atexit.register(self.flush)
+
+    def load(self):
+        if self.settings is None:
+            stored = {}
+            if os.path.exists(self.path):
+                with open(self.path, "r") as f:
+                    try:
+                        stored = json.load(f)
+                    except json.JSONDecodeError:
+                        stored = {}
+            self.settings = merge_settings(stored if isinstance(stored, dict) else {})
+            self.saved = copy.deepcopy(self.settings)
+        return self.settings
+
+    def subscribe(self, callback):
+        # callback(changes) receives a {key: new value} dict.
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+
+    def save(self, settings=None):
+        current = self.load()
+        if settings is not None and settings is not current:
+            current.update(settings)
+        for key, value in current.items():
+            current[key] = validate_setting(key, value)
+        with self._lock:
+            changes = {key: value for key, value in current.items() if self.saved.get(key, object()) != value}
+            if not changes:
+                return changes
+            self.saved = copy.deepcopy(current)
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.save_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+        for callback in list(self.subscribers):
+            callback(changes)
+        return changes
+
+    def flush(self):
+        with self._lock:
+            timer, self._timer = self._timer, None
+            if timer is None:
+                return
+            timer.cancel()
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump(self.saved, f)
+            os.replace(temp_path, self.path)
+
+
+settings_store = SettingsStore()
+
+
+def load_settings():
+    return settings_store.load()
+
+
 def save_settings(settings):
-    with open(SETTINGS_FILE, "w") as f:
-        json.dump(settings, f)
+    return settings_store.save(settings)
@@ -0,0 +1,106 @@
+import http.client
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_server import ApiServer
+from catalogue import FAVOURITES, CatalogueIndex
+
+
+def item(code, name=""):
+    return {"Item Code": code, "Item Name": name, "Console Command": f"player.additem {code} 1"}
+
+
+class ApiServerTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        file_map = {FAVOURITES: os.path.join(directory, "favourites.json")}
+        for name, records in (("Weapons", [item("0001000A", "Laser Pistol"), item("0001000B", "Rifle")]),
+                              ("Food", [item("0002000A", "Pistol Pepper"), item("0002000B", "Café Soup")])):
+            file_map[name] = os.path.join(directory, f"{name.lower()}.json")
+            with open(file_map[name], "w", encoding="utf-8") as f:
+                json.dump(records, f, ensure_ascii=False)
+        self.file_map = file_map
+        self.index = CatalogueIndex(file_map)
+        self.server = ApiServer(self.index, port=0)
+        self.port = self.server.start()
+        self.addCleanup(self.server.stop)
+        self.connection = http.client.HTTPConnection("127.0.0.1", self.port, timeout=5)
+        self.addCleanup(self.connection.close)
+
+    def request(self, method, target, payload=None):
+        body = json.dumps(payload) if payload is not None else None
+        self.connection.request(method, target, body=body)
+        response = self.connection.getresponse()
+        return response.status, json.loads(response.read().decode("utf-8"))
+
+    def test_item(self):
+        self.assertEqual(self.request("GET", "/items/0001000a"), (200, dict(item("0001000A", "Laser Pistol"), Catalogue="Weapons")))
+        status, payload = self.request("GET", "/items/FFFFFFFF")
+        self.assertEqual(status, 404)
+
+    def test_batch_lookup(self):
+        status, payload = self.request("GET", "/items?codes=0001000B,FFFFFFFF")
+        self.assertEqual(status, 200)
+        self.assertEqual(payload["items"]["0001000B"]["Catalogue"], "Weapons")
+        self.assertIsNone(payload["items"]["FFFFFFFF"])
+        status, payload = self.request("POST", "/items", {"codes": ["0002000b"]})
+        self.assertEqual(payload["items"]["0002000b"]["Item Name"], "Café Soup")
+
+    def test_batch_lookup_rejects_non_string_codes(self):
+        # An object as a code used to raise TypeError and drop the connection.
+        for codes in ([{"a": 1}], [["0001000A"]], [5], "0001000A"):
+            with self.subTest(codes=codes):
+                status, payload = self.request("POST", "/items", {"codes": codes})
+                self.assertEqual(status, 400)
+        # The connection is still usable.
+        self.assertEqual(self.request("GET", "/health")[0], 200)
+
+    def test_bad_requests(self):
+        self.assertEqual(self.request("POST", "/items", {"other": []})[0], 400)
+        self.assertEqual(self.request("PUT", "/items")[0], 405)
+        self.assertEqual(self.request("GET", "/nowhere")[0], 404)
+        self.assertEqual(self.request("GET", "/catalogues/Favourites")[0], 404)
+        self.assertEqual(self.request("GET", "/search?q=a&limit=x")[0], 400)
+        self.assertEqual(self.request("GET", "/search?q=a&field=Other")[0], 400)
+
+    def test_unexpected_error_answered(self):
+        def broken_route(method, target, body):
+            raise RuntimeError("broken")
+        self.server.route = broken_route
+        logging.disable(logging.CRITICAL)
+        self.addCleanup(logging.disable, logging.NOTSET)
+        self.assertEqual(self.request("GET", "/health"), (500, {"error": "internal server error"}))
+
+    def test_search(self):
+        status, payload = self.request("GET", "/search?q=pistol")
+        self.assertEqual([result["Item Code"] for result in payload["results"]], ["0001000A", "0002000A"])
+        status, payload = self.request("GET", "/search?q=pistol&catalogue=Food")
+        self.assertEqual([result["Catalogue"] for result in payload["results"]], ["Food"])
+        status, payload = self.request("GET", "/search?q=pistol&limit=1")
+        self.assertEqual(payload["count"], 1)
+        status, payload = self.request("GET", "/search?q=0001&field=Item%20Name")
+        self.assertEqual(payload["count"], 0)
+
+    def test_catalogues(self):
+        status, payload = self.request("GET", "/catalogues")
+        self.assertEqual(payload["catalogues"], [{"name": "Weapons", "count": 2}, {"name": "Food", "count": 2}])
+        status, payload = self.request("GET", "/catalogues/Weapons?offset=1&limit=5")
+        self.assertEqual(payload["items"], [item("0001000B", "Rifle")])
+
+    def test_cache_follows_index_changes(self):
+        self.assertEqual(self.request("GET", "/search?q=rifle")[1]["count"], 1)
+        self.index.merge(self.file_map["Weapons"], [item("0001000A", "Laser Pistol"), item("0001000B", "Shotgun")])
+        self.assertEqual(self.request("GET", "/search?q=rifle")[1]["count"], 0)
+        self.assertEqual(self.request("GET", "/items/0001000B")[1]["Item Name"], "Shotgun")
+
+
+if __name__ == "__main__":
+    unittest.main()
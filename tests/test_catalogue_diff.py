@@ -0,0 +1,94 @@
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalogue_diff import (
+    ADDED, CHANGED, REMOVED, diff_catalogues, diff_records, iter_json_array, merge_records, write_catalogue
+)
+
+
+def item(code, name="", command=None):
+    return {"Item Code": code, "Item Name": name, "Console Command": command or f"player.additem {code} 1"}
+
+
+class IterJsonArrayTest(unittest.TestCase):
+    def parse(self, text, chunk_size):
+        return list(iter_json_array(io.StringIO(text), chunk_size))
+
+    def test_matches_json_loads_at_any_chunk_size(self):
+        texts = [
+            "[]",
+            " [ ] ",
+            '[{"Item Code": "0001", "Item Name": "Café \\u2615"}, {"a": [1, 2, {"b": null}]}]',
+            "[-1.5, 1e10, 0, -0.25e-3, true, false, null]",
+            '["a,b", "]", "\\"[", 12345678901234567890]',
+            "\n[\n  1,\n  2\n]\n",
+        ]
+        for text in texts:
+            for chunk_size in (1, 2, 3, 7, 1024):
+                with self.subTest(text=text, chunk_size=chunk_size):
+                    self.assertEqual(self.parse(text, chunk_size), json.loads(text))
+
+    def test_rejects_what_json_loads_rejects(self):
+        for text in ("", "{}", "[1,]", "[,1]", "[1 2]", "[1,,2]", "[1] x", "[1][2]", "[1", '["a'):
+            for chunk_size in (1, 4, 1024):
+                with self.subTest(text=text, chunk_size=chunk_size):
+                    with self.assertRaises(ValueError):
+                        self.parse(text, chunk_size)
+
+
+class DiffRecordsTest(unittest.TestCase):
+    def test_kinds_and_order(self):
+        base = [item("01", "Kept"), item("02", "Old"), item("03", "Gone")]
+        other = [item("04", "New"), item("02", "Renamed"), item("01", "Kept")]
+        diff = diff_records(base, other)
+        self.assertEqual([(entry.kind, entry.code) for entry in diff.entries], [(ADDED, "04"), (CHANGED, "02"), (REMOVED, "03")])
+        self.assertEqual(diff.entries[1].fields, ("Item Name",))
+        self.assertEqual(diff.counts(), {ADDED: 1, REMOVED: 1, CHANGED: 1, "unchanged": 1})
+
+    def test_duplicates_last_record_wins(self):
+        base = [item("01", "A"), item("01", "B")]
+        other = [item("01", "B"), item("01", "C")]
+        diff = diff_records(base, other, "base", "other")
+        self.assertEqual(diff.duplicates, {"base": ["01"], "other": ["01"]})
+        self.assertEqual([(entry.kind, entry.new["Item Name"]) for entry in diff.entries], [(CHANGED, "C")])
+        self.assertEqual(diff.unchanged, 0)
+
+    def test_filtered(self):
+        diff = diff_records([item("01", "Pistol")], [item("01", "Laser Pistol"), item("0A", "Rifle")])
+        self.assertEqual([entry.code for entry in diff.filtered(text="pistol")], ["01"])
+        self.assertEqual([entry.code for entry in diff.filtered(kinds=(ADDED,))], ["0A"])
+
+
+class MergeRecordsTest(unittest.TestCase):
+    def test_applies_chosen_entries_only(self):
+        base = [item("01", "Kept"), item("02", "Old"), item("03", "Gone"), item("05", "Also gone")]
+        other = [item("01", "Kept"), item("02", "Renamed"), item("04", "New")]
+        diff = diff_records(base, other)
+        # Leave the removal of 05 out.
+        entries = [entry for entry in diff.entries if entry.code != "05"]
+        merged = merge_records(base, entries)
+        self.assertEqual([(record["Item Code"], record["Item Name"]) for record in merged],
+                         [("01", "Kept"), ("02", "Renamed"), ("05", "Also gone"), ("04", "New")])
+        self.assertIs(merged[0], base[0])
+
+    def test_catalogue_files_round_trip(self):
+        directory = tempfile.mkdtemp()
+        base_path = os.path.join(directory, "base.json")
+        other_path = os.path.join(directory, "other.json")
+        write_catalogue(base_path, [item("01", "Café")])
+        write_catalogue(other_path, [item("01", "Café"), item("02", "☕")])
+        diff = diff_catalogues(base_path, other_path)
+        self.assertEqual([(entry.kind, entry.code) for entry in diff.entries], [(ADDED, "02")])
+        with open(base_path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f), [item("01", "Café")])
+        self.assertFalse(os.path.exists(f"{base_path}.tmp"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalogue import FAVOURITES, Catalogue, CatalogueIndex, read_records
+
+
+def item(code, name=""):
+    return {"Item Code": code, "Item Name": name, "Console Command": f"player.additem {code} 1"}
+
+
+class CatalogueIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.file_map = {FAVOURITES: self.write("favourites.json", [])}
+        self.file_map["First"] = self.write("first.json", [item("01", "One"), item("02", "Two"), item("0C", "Shared")])
+        self.file_map["Second"] = self.write("second.json", [item("0C", "Also shared"), item("0D", "Four")])
+        self.index = CatalogueIndex(self.file_map)
+
+    def write(self, name, records):
+        path = os.path.join(self.directory, name)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(records, f)
+        return path
+
+    def test_lookup_covers_loaded_catalogues_only(self):
+        self.assertIsNone(self.index.lookup("01"))
+        self.assertEqual(self.index.catalogues, {})
+        self.index.get("Second")
+        self.assertEqual(self.index.lookup("0C")[0], "Second")
+        # The first catalogue in file_map wins, whenever it is loaded.
+        self.index.get("First")
+        self.assertEqual(self.index.lookup("0C"), ("First", item("0C", "Shared")))
+        self.assertEqual(self.index.lookup("0D")[0], "Second")
+
+    def test_adopt_indexes_catalogue(self):
+        self.index.get("Second")
+        self.assertIsNone(self.index.lookup("01"))
+        path = self.file_map["First"]
+        self.assertTrue(self.index.adopt(Catalogue("First", path, read_records(path)).prime()))
+        self.assertEqual(self.index.lookup("01")[0], "First")
+        self.assertEqual(self.index.lookup("0C")[0], "First")
+        # A catalogue loaded meanwhile is kept.
+        self.assertFalse(self.index.adopt(Catalogue("First", path, [])))
+        self.assertEqual(len(self.index.get("First").records), 3)
+
+    def test_merge_keeps_unchanged_and_updates_in_place(self):
+        records = self.index.get("First").records
+        one, two = records[0], records[1]
+        generation = self.index.generation
+        inserted, updated, deleted = self.index.merge(self.file_map["First"], [item("01", "One"), item("02", "Renamed"), item("03", "New")])
+        self.assertEqual(inserted, [item("03", "New")])
+        self.assertEqual(updated, [item("02", "Renamed")])
+        self.assertEqual(deleted, [item("0C", "Shared")])
+        self.assertIs(self.index.get("First").records, records)
+        self.assertIs(records[0], one)
+        self.assertIs(records[1], two)
+        self.assertEqual(two["Item Name"], "Renamed")
+        self.assertGreater(self.index.generation, generation)
+
+    def test_merge_reindexes_codes(self):
+        self.index.load_all()
+        self.index.lookup("")
+        self.index.merge(self.file_map["First"], [item("01", "One"), item("0E", "New")])
+        self.assertIsNone(self.index.lookup("02"))
+        self.assertEqual(self.index.lookup("0E")[0], "First")
+        # A code dropped from the first catalogue falls back to the next.
+        self.assertEqual(self.index.lookup("0C"), ("Second", item("0C", "Also shared")))
+        self.assertEqual(self.index.get("First").search("new"), [item("0E", "New")])
+
+    def test_merge_without_changes(self):
+        records = list(self.index.get("First").records)
+        generation = self.index.generation
+        self.assertEqual(self.index.merge(self.file_map["First"], [dict(record) for record in records]), ([], [], []))
+        self.assertEqual(self.index.generation, generation)
+
+    def test_duplicate_codes_in_new_version(self):
+        inserted, updated, deleted = self.index.merge(self.file_map["First"], [item("01", "One"), item("01", "Again")])
+        records = self.index.get("First").records
+        self.assertEqual([record["Item Name"] for record in records], ["One", "Again"])
+        self.assertIsNot(records[0], records[1])
+        self.assertEqual(inserted, [item("01", "Again")])
+        self.assertEqual(len(deleted), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalogue import FAVOURITES, CatalogueIndex, read_records
+from catalogue_sync import CatalogueSync, SyncError, apply_delta, build_manifest, content_hash, make_delta
+
+
+def item(code, name=""):
+    return {"Item Code": code, "Item Name": name, "Console Command": f"player.additem {code} 1"}
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class FakeSession:
+    # Serves files from a release folder by their path under base_url.
+    def __init__(self, directory, base_url):
+        self.directory = directory
+        self.base_url = base_url
+        self.requested = []
+
+    def get(self, url, timeout=None):
+        relative = url[len(self.base_url):]
+        self.requested.append(relative)
+        with open(os.path.join(self.directory, relative), "rb") as f:
+            return FakeResponse(f.read())
+
+
+class DeltaTest(unittest.TestCase):
+    def test_round_trip(self):
+        old = [item("01", "One"), item("02", "Two"), item("03", "Three")]
+        new = [item("01", "One"), item("02", "Zwei"), item("04", "Vier")]
+        delta = make_delta(old, new)
+        self.assertEqual(delta["from"], content_hash(old))
+        self.assertEqual(delta["to"], content_hash(new))
+        self.assertEqual(delta["upsert"], [item("02", "Zwei"), item("04", "Vier")])
+        self.assertEqual(delta["delete"], ["03"])
+        self.assertEqual(apply_delta(old, delta), new)
+
+    def test_unreachable_by_code(self):
+        # Reordered rows and duplicate codes can't be expressed as a delta.
+        self.assertIsNone(make_delta([item("01"), item("02")], [item("02"), item("01")]))
+        self.assertIsNone(make_delta([item("01")], [item("01"), item("01", "Again")]))
+
+    def test_hash_ignores_formatting(self):
+        records = [{"Item Name": "Café", "Item Code": "01"}]
+        self.assertEqual(content_hash(records), content_hash(json.loads(json.dumps(records, indent=4))))
+
+
+class CatalogueSyncTest(unittest.TestCase):
+    base_url = "https://example.invalid/catalogues/"
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        cwd = os.getcwd()
+        self.addCleanup(os.chdir, cwd)
+        # The release folder, as the host publishes it.
+        self.release = os.path.join(self.directory, "release")
+        self.previous = os.path.join(self.directory, "previous")
+        self.local = os.path.join(self.directory, "local")
+        for folder in (self.release, self.previous, self.local):
+            os.mkdir(folder)
+        self.old = [item("01", "One"), item("02", "Two")]
+        self.new = [item("01", "One"), item("02", "Zwei ☕"), item("03", "Drei")]
+        self.write(self.previous, "weapons.json", self.old)
+        self.write(self.release, "weapons.json", self.new)
+        self.write(self.local, "weapons.json", self.old)
+        os.chdir(self.release)
+        build_manifest({FAVOURITES: "favourites.json", "Weapons": "weapons.json"}, previous_dir=self.previous)
+        self.index = CatalogueIndex({"Weapons": os.path.join(self.local, "weapons.json")})
+        self.session = FakeSession(self.release, self.base_url)
+        self.sync = CatalogueSync(self.index, self.base_url, session=self.session, max_workers=1)
+
+    def write(self, folder, name, records):
+        with open(os.path.join(folder, name), "w", encoding="utf-8") as f:
+            json.dump(records, f, ensure_ascii=False)
+
+    def test_manifest(self):
+        with open("catalogue_manifest.json", encoding="utf-8") as f:
+            entry = json.load(f)["catalogues"]["weapons.json"]
+        self.assertEqual(entry["sha256"], content_hash(self.new))
+        self.assertEqual(entry["count"], 3)
+        with open(entry["deltas"][content_hash(self.old)], encoding="utf-8") as f:
+            self.assertEqual(apply_delta(self.old, json.load(f)), self.new)
+
+    def test_fetch_and_apply_delta(self):
+        records = self.index.get("Weapons").records
+        updates = self.sync.fetch()
+        self.assertEqual([(update.name, update.via_delta) for update in updates], [("Weapons", True)])
+        self.assertNotIn("weapons.json", self.session.requested)
+        self.sync.apply(updates)
+        self.assertEqual(read_records(os.path.join(self.local, "weapons.json")), self.new)
+        # Views sharing the list see the update.
+        self.assertEqual(records, self.new)
+        self.assertEqual(self.index.lookup("03")[0], "Weapons")
+        self.assertEqual(self.sync.fetch(), [])
+
+    def test_full_download_without_delta(self):
+        self.write(self.local, "weapons.json", [item("09", "Unknown version")])
+        updates = self.sync.fetch()
+        self.assertEqual([update.via_delta for update in updates], [False])
+        self.sync.apply(updates)
+        self.assertEqual(read_records(os.path.join(self.local, "weapons.json")), self.new)
+
+    def test_checksum_mismatch(self):
+        self.write(self.local, "weapons.json", [])
+        self.write(self.release, "weapons.json", [item("01", "Tampered")])
+        with self.assertRaises(SyncError):
+            self.sync.fetch()
+
+
+if __name__ == "__main__":
+    unittest.main()
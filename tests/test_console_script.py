@@ -0,0 +1,29 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from console_script import command_for
+
+
+class CommandForTest(unittest.TestCase):
+    def test_replaces_count(self):
+        record = {"Console Command": "player.additem 00123456 1"}
+        self.assertEqual(command_for(record, 5), "player.additem 00123456 5")
+        self.assertEqual(command_for(record), "player.additem 00123456 1")
+
+    def test_appends_missing_count(self):
+        # The item code is all digits, but it is not a count.
+        for code in ("002", "00123456"):
+            record = {"Console Command": f"player.additem {code}"}
+            self.assertEqual(command_for(record, 5), f"player.additem {code} 5")
+            self.assertEqual(command_for(record), f"player.additem {code} 1")
+
+    def test_other_commands_unchanged(self):
+        record = {"Console Command": "player.addperk 002C2C5A"}
+        self.assertEqual(command_for(record, 5), "player.addperk 002C2C5A")
+
+
+if __name__ == "__main__":
+    unittest.main()
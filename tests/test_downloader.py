@@ -0,0 +1,149 @@
+import hashlib
+import http.server
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from downloader import Downloader, DownloadError, content_range_total, fetch_checksum
+
+PAYLOAD = bytes(range(256)) * 400
+DIGEST = hashlib.sha256(PAYLOAD).hexdigest()
+
+
+class RangeHandler(http.server.BaseHTTPRequestHandler):
+    # Serves PAYLOAD at /file, honouring "bytes=N-" ranges unless the test
+    # says otherwise, and its checksum at /file.sha256.
+    honour_range = True
+    range_total = str(len(PAYLOAD))
+    ranges = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path == "/file.sha256":
+            body = f"{DIGEST}  file\n".encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if self.path != "/file":
+            self.send_error(404)
+            return
+        requested = self.headers.get("Range")
+        self.ranges.append(requested)
+        if requested and self.honour_range:
+            start = int(requested[len("bytes="):-1])
+            if start >= len(PAYLOAD):
+                self.send_response(416)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = PAYLOAD[start:]
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(PAYLOAD) - 1}/{self.range_total}")
+        else:
+            body = PAYLOAD
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class DownloaderTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), RangeHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_port}/file"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.output = os.path.join(directory, "update.exe")
+        RangeHandler.honour_range = True
+        RangeHandler.range_total = str(len(PAYLOAD))
+        RangeHandler.ranges = []
+
+    def write_part(self, data):
+        with open(f"{self.output}.part", "wb") as f:
+            f.write(data)
+
+    def download(self, sha256=DIGEST):
+        reports = []
+        Downloader(self.url, self.output, sha256=sha256, chunk_size=4096).run(lambda *report: reports.append(report))
+        with open(self.output, "rb") as f:
+            self.assertEqual(f.read(), PAYLOAD)
+        self.assertFalse(os.path.exists(f"{self.output}.part"))
+        return reports
+
+    def test_full_download(self):
+        reports = self.download()
+        self.assertEqual(RangeHandler.ranges, [None])
+        self.assertEqual(reports[-1], (len(PAYLOAD), len(PAYLOAD), 0))
+
+    def test_resumes_partial_download(self):
+        self.write_part(PAYLOAD[:1000])
+        self.download()
+        self.assertEqual(RangeHandler.ranges, ["bytes=1000-"])
+
+    def test_resume_with_unknown_total(self):
+        RangeHandler.range_total = "*"
+        self.write_part(PAYLOAD[:1000])
+        reports = self.download()
+        self.assertEqual(reports[-1][1], len(PAYLOAD))
+
+    def test_server_ignoring_range_starts_over(self):
+        RangeHandler.honour_range = False
+        self.write_part(b"garbage")
+        self.download()
+
+    def test_part_already_complete(self):
+        self.write_part(PAYLOAD)
+        self.download()
+        self.assertEqual(RangeHandler.ranges, [f"bytes={len(PAYLOAD)}-"])
+
+    def test_corrupt_part_retried_from_scratch(self):
+        self.write_part(b"x" * 1000)
+        self.download()
+        self.assertEqual(RangeHandler.ranges, ["bytes=1000-", None])
+
+    def test_checksum_mismatch(self):
+        with self.assertRaises(DownloadError):
+            Downloader(self.url, self.output, sha256="0" * 64).run()
+        self.assertFalse(os.path.exists(self.output))
+        self.assertFalse(os.path.exists(f"{self.output}.part"))
+
+    def test_cancel(self):
+        downloader = Downloader(self.url, self.output, chunk_size=4096)
+        downloader.cancel()
+        with self.assertRaises(DownloadError):
+            downloader.run()
+        self.assertFalse(os.path.exists(self.output))
+
+    def test_fetch_checksum(self):
+        self.assertEqual(fetch_checksum(f"{self.url}.sha256"), DIGEST)
+        self.assertIsNone(fetch_checksum(f"{self.url}.missing"))
+
+
+class ContentRangeTotalTest(unittest.TestCase):
+    def test_parse(self):
+        self.assertEqual(content_range_total("bytes 0-99/1234"), 1234)
+        self.assertIsNone(content_range_total("bytes 0-99/*"))
+        self.assertIsNone(content_range_total(None))
+        self.assertIsNone(content_range_total("garbage"))
+
+
+if __name__ == "__main__":
+    unittest.main()
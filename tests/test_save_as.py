@@ -0,0 +1,76 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+try:
+    from PyQt5.QtWidgets import QApplication, QFileDialog
+except ImportError:
+    QApplication = None
+
+
+def item(code, name=""):
+    return {"Item Code": code, "Item Name": name, "Console Command": f"player.additem {code} 1"}
+
+
+@unittest.skipIf(QApplication is None, "PyQt5 is not installed")
+class SaveAsTest(unittest.TestCase):
+    # Runs the main window offscreen in a scratch folder, since it reads
+    # and writes its settings, favourites and audit log in the working
+    # directory.
+    @classmethod
+    def setUpClass(cls):
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        cls.app = QApplication.instance() or QApplication([])
+        cls.cwd = os.getcwd()
+        cls.directory = tempfile.mkdtemp()
+        os.chdir(cls.directory)
+        with open("settings.json", "w", encoding="utf-8") as f:
+            json.dump({"check_for_updates": False, "preload_catalogues": False, "startup_json": "Weapons"}, f)
+        with open("weapons.json", "w", encoding="utf-8") as f:
+            json.dump([item("0001000A", "Laser Pistol"), item("0001000B", "Rifle")], f)
+        import StarfieldDB
+        cls.window = StarfieldDB.JSONViewerApp([])
+
+    @classmethod
+    def tearDownClass(cls):
+        from audit import audit_log
+        from settings import settings_store
+        cls.window.favourites_timer.stop()
+        audit_log.close()
+        settings_store.flush()
+        cls.window.deleteLater()
+        os.chdir(cls.cwd)
+        shutil.rmtree(cls.directory, ignore_errors=True)
+
+    def test_saved_copy_owns_its_records(self):
+        # The view used to keep sharing its list with the Weapons catalogue
+        # after Save As, so items added to the copy showed up in Weapons.
+        window = self.window
+        window.load_json_with_indicator("Weapons")
+        weapons = window.index.load("weapons.json")
+        output = os.path.join(self.directory, "copy.json")
+        with mock.patch.object(QFileDialog, "getSaveFileName", return_value=(output, "")):
+            window.save_file_as()
+        self.assertEqual(window.current_file, output)
+        self.assertIsNot(window.data, weapons.records)
+        self.assertFalse(any(record is original for record in window.data for original in weapons.records))
+        window.data[0]["Item Name"] = "Renamed"
+        window.data.append(item("DEADBEEF", "Added"))
+        window.save_file()
+        self.assertEqual(weapons.records, [item("0001000A", "Laser Pistol"), item("0001000B", "Rifle")])
+        self.assertIsNone(window.index.lookup("DEADBEEF"))
+        with open("weapons.json", encoding="utf-8") as f:
+            self.assertEqual(len(json.load(f)), 2)
+        with open(output, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)[-1], item("DEADBEEF", "Added"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+from PyQt5.QtWidgets import QApplication
+from settings import DEFAULT_SETTINGS
+
+COLOR_KEYS = [
+    "highlight_color",
+    "font_color",
+    "background_color",
+    "alternate_background_color",
+    "border_color",
+    "button_hover_color",
+    "button_press_color",
+    "toolbar_bg_start",
+    "toolbar_bg_end",
+    "dialog_bg_color",
+    "label_color",
+]
+
+PALETTES = {
+    "Default": {key: DEFAULT_SETTINGS[key] for key in COLOR_KEYS},
+    "Cool Blues": {
+        "highlight_color": "#3399ff",
+        "font_color": "#e6f2ff",
+        "background_color": "#00264d",
+        "alternate_background_color": "#001a33",
+        "border_color": "#3399ff",
+        "button_hover_color": "#3399ff",
+        "button_press_color": "#2673cc",
+        "toolbar_bg_start": "#003366",
+        "toolbar_bg_end": "#00264d",
+        "dialog_bg_color": "#00264d",
+        "label_color": "#e6f2ff"
+    },
+    "Warm Sunset": {
+        "highlight_color": "#ff9966",
+        "font_color": "#fff2e6",
+        "background_color": "#4d2600",
+        "alternate_background_color": "#331a00",
+        "border_color": "#ff9966",
+        "button_hover_color": "#ff9966",
+        "button_press_color": "#cc8052",
+        "toolbar_bg_start": "#663300",
+        "toolbar_bg_end": "#4d2600",
+        "dialog_bg_color": "#4d2600",
+        "label_color": "#fff2e6"
+    },
+    "Forest Greens": {
+        "highlight_color": "#66cc66",
+        "font_color": "#e6ffe6",
+        "background_color": "#003300",
+        "alternate_background_color": "#002600",
+        "border_color": "#66cc66",
+        "button_hover_color": "#66cc66",
+        "button_press_color": "#52a652",
+        "toolbar_bg_start": "#004d00",
+        "toolbar_bg_end": "#003300",
+        "dialog_bg_color": "#003300",
+        "label_color": "#e6ffe6"
+    },
+    "Desert Sands": {
+        "highlight_color": "#cc9933",
+        "font_color": "#fffbf2",
+        "background_color": "#4d3b00",
+        "alternate_background_color": "#332800",
+        "border_color": "#cc9933",
+        "button_hover_color": "#cc9933",
+        "button_press_color": "#a67c29",
+        "toolbar_bg_start": "#665000",
+        "toolbar_bg_end": "#4d3b00",
+        "dialog_bg_color": "#4d3b00",
+        "label_color": "#fffbf2"
+    }
+}
+
+APP_STYLESHEET = """
+QToolBar#mainToolbar {{
+    background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                                stop:0 {toolbar_bg_start}, stop:1 {toolbar_bg_end});
+    border-bottom: 1px solid {highlight_color};
+    spacing: 10px;
+    padding: 5px;
+}}
+QToolBar#mainToolbar QToolButton {{
+    color: {font_color};
+    font-size: 12pt;
+    padding: 5px;
+    background: transparent;
+    border: none;
+}}
+QToolBar#mainToolbar QToolButton:hover {{
+    background: {button_hover_color};
+    border-radius: 5px;
+}}
+QToolBar#mainToolbar QToolButton:pressed {{
+    background: {button_press_color};
+    border-radius: 5px;
+}}
+QPushButton#categoryButton {{
+    padding: 10px;
+    font-size: 12pt;
+    border: 2px solid {highlight_color};
+    color: {font_color};
+    background-color: transparent;
+}}
+QPushButton#categoryButton:checked {{
+    background-color: {highlight_color};
+}}
+QTableWidget#catalogueTable {{
+    gridline-color: {highlight_color};
+    alternate-background-color: {alternate_background_color};
+    background-color: {background_color};
+    color: {font_color};
+}}
+QTableWidget#catalogueTable::item {{
+    border-bottom: 1px solid {highlight_color};
+    padding: 10px;
+}}
+QTableWidget#catalogueTable::item:selected {{
+    background-color: {highlight_color};
+    color: white;
+}}
+QTableWidget#catalogueTable QHeaderView::section {{
+    background-color: {highlight_color};
+    color: {font_color};
+    font-weight: bold;
+    padding: 5px;
+    border: 1px solid {highlight_color};
+}}
+QLabel#detailView {{
+    color: {font_color};
+    padding: 10px;
+}}
+"""
+
+
+def theme_key(settings):
+    # font_size is not part of the stylesheet: the window applies it as a
+    # widget font, so changing it never recompiles or re-applies the theme.
+    colors = tuple(settings.get(key, DEFAULT_SETTINGS[key]) for key in COLOR_KEYS)
+    return settings.get("theme", "dark"), colors
+
+
+class ThemeManager:
+    def __init__(self):
+        self._base_stylesheets = {}
+        self._compiled = {}
+        self._applied_key = None
+
+    def base_stylesheet(self, theme):
+        # qdarkstyle re-reads and re-processes ~50 KB of QSS on every call,
+        # so it is loaded at most once per process.
+        if theme not in self._base_stylesheets:
+            if theme == "dark":
+                import qdarkstyle
+                self._base_stylesheets[theme] = qdarkstyle.load_stylesheet_pyqt5()
+            else:
+                self._base_stylesheets[theme] = ""
+        return self._base_stylesheets[theme]
+
+    def stylesheet(self, settings):
+        key = theme_key(settings)
+        if key not in self._compiled:
+            theme, colors = key
+            values = dict(zip(COLOR_KEYS, colors))
+            self._compiled[key] = self.base_stylesheet(theme) + APP_STYLESHEET.format(**values)
+        return self._compiled[key]
+
+    def apply(self, settings, app=None):
+        app = app or QApplication.instance()
+        key = theme_key(settings)
+        if key == self._applied_key:
+            return False
+        app.setStyleSheet(self.stylesheet(settings))
+        self._applied_key = key
+        return True
+
+
+theme_manager = ThemeManager()
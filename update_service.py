@@ -0,0 +1,115 @@
+import json
+import os
+import re
+from datetime import date, timedelta
+import requests
+from requests.adapters import HTTPAdapter
+
+APP_VERSION = "1.0"  # Update this to reflect the current app version.
+VERSION_URL = "https://raw.githubusercontent.com/skillerious/Starfield-IDDB/main/version.txt"
+RELEASE_URL = "https://github.com/skillerious/Starfield-IDDB/releases/download/{version}/StarfieldIDDB-{version}.exe"
+CACHE_FILE = "update_cache.json"
+
+SCHEDULE_DAYS = {"Daily": 1, "Weekly": 7, "Monthly": 30}
+
+_session = None
+
+
+def get_session():
+    # One pooled session for update checks and downloads, so repeated
+    # requests to the release hosts reuse their connections.
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=2)
+        _session.mount("https://", adapter)
+        _session.mount("http://", adapter)
+        _session.headers["User-Agent"] = f"StarfieldIDDB/{APP_VERSION}"
+    return _session
+
+
+def parse_version(text):
+    # Semantic version key: "v1.10" > "1.9", "1.2.0-beta.2" < "1.2.0".
+    text = text.strip().lstrip("vV")
+    core, _, prerelease = text.partition("-")
+    numbers = [int(part) if part.isdigit() else 0 for part in re.split(r"[.+]", core)[:3] if part]
+    numbers += [0] * (3 - len(numbers))
+    if not prerelease:
+        return tuple(numbers), 1, ()
+    identifiers = tuple((0, int(part), "") if part.isdigit() else (1, 0, part) for part in prerelease.split("."))
+    return tuple(numbers), 0, identifiers
+
+
+def is_newer(latest, current):
+    return parse_version(latest) > parse_version(current)
+
+
+def update_interval(settings):
+    if settings.get("enable_scheduled_updates", False):
+        return max(int(settings.get("update_interval_days", 7)), 1)
+    return SCHEDULE_DAYS.get(settings.get("update_schedule", "Weekly"), 7)
+
+
+def is_check_due(settings, today=None):
+    if not (settings.get("check_for_updates", True) or settings.get("enable_scheduled_updates", False)):
+        return False
+    today = today or date.today()
+    try:
+        last_check = date.fromisoformat(settings.get("last_update_check", ""))
+    except (TypeError, ValueError):
+        return True
+    return today - last_check >= timedelta(days=update_interval(settings))
+
+
+class UpdateChecker:
+    # Fetches version.txt with a conditional request (ETag/Last-Modified
+    # cached on disk), so an unchanged file costs a 304 with no body.
+    def __init__(self, url=VERSION_URL, cache_path=CACHE_FILE, session=None, timeout=(5, 10)):
+        self.url = url
+        self.cache_path = cache_path
+        self.session = session or get_session()
+        self.timeout = timeout
+
+    def load_cache(self):
+        try:
+            with open(self.cache_path, "r") as f:
+                return json.load(f).get(self.url, {})
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    def save_cache(self, entry):
+        try:
+            with open(self.cache_path, "r") as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            cache = {}
+        cache[self.url] = entry
+        temp_path = f"{self.cache_path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(cache, f)
+        os.replace(temp_path, self.cache_path)
+
+    def fetch_latest(self):
+        cached = self.load_cache()
+        headers = {}
+        if cached.get("body") is not None:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+        response = self.session.get(self.url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304 and cached.get("body") is not None:
+            return cached["body"].strip()
+        response.raise_for_status()
+        self.save_cache({
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "body": response.text,
+        })
+        return response.text.strip()
+
+    def check(self, current_version=APP_VERSION):
+        latest_version = self.fetch_latest()
+        if is_newer(latest_version, current_version):
+            return True, latest_version, RELEASE_URL.format(version=latest_version)
+        return False, current_version, ""
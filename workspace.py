@@ -0,0 +1,53 @@
+import time
+
+# Per-tab view state for JSONViewerApp's tabbed workspace. The window keeps
+# working on its own attributes (data, current_file, table, ...), as it did
+# with a single view; switching tabs stores them into the tab being left and
+# restores those of the tab being shown. Records are never copied: tabs on
+# built-in catalogues share the CatalogueIndex record lists.
+
+VIEW_ATTRIBUTES = (
+    "current_file", "viewing_favourites", "data", "listed_items", "visible_items",
+    "sort_order", "undo_stack", "redo_stack", "table",
+)
+
+DETAIL_PLACEHOLDER = "Select an item to view details"
+
+
+class WorkspaceTab:
+    def __init__(self, key, table=None):
+        # key is the catalogue path, FAVOURITES, or None for an unsaved file.
+        self.key = key
+        self.current_file = None
+        self.viewing_favourites = False
+        self.data = []
+        self.listed_items = []
+        self.visible_items = []
+        self.sort_order = []
+        self.undo_stack = []
+        self.redo_stack = []
+        self.table = table
+        self.search_text = ""
+        self.detail_text = DETAIL_PLACEHOLDER
+        # Saved when the table is evicted, to rebuild it as it was.
+        self.scroll = 0
+        self.selected_codes = []
+        # What the table showed when the tab was left; see view_revision().
+        self.revision = None
+        self.last_used = time.monotonic()
+
+    def store(self, window):
+        for name in VIEW_ATTRIBUTES:
+            setattr(self, name, getattr(window, name))
+        self.last_used = time.monotonic()
+
+    def restore(self, window):
+        for name in VIEW_ATTRIBUTES:
+            setattr(window, name, getattr(self, name))
+        self.last_used = time.monotonic()
+
+    def is_blank(self):
+        return self.key is None and not self.data and not self.undo_stack
+
+    def idle_seconds(self):
+        return time.monotonic() - self.last_used